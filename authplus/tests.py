@@ -1,6 +1,6 @@
 from django.urls import reverse
-from rest_framework.test import APITestCase
 from customers.models import Customer
+from examscheduler.testing import APITestCase
 
 
 class AuthAPITestCase(APITestCase):
@@ -7,6 +7,7 @@ from .serializers import CustomTokenRefreshSerializer, CustomTokenObtainPairSeri
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_scope = 'login'
 
     @extend_schema(
         summary="로그인",
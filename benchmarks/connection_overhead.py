@@ -0,0 +1,182 @@
+"""
+요청당 DB 연결 비용을 측정하는 부하 스크립트
+
+WSGI/ASGI handler를 직접 호출하여 `/api/reservations/available-slots/`에 요청을 보내고,
+새로 열린 DB 연결 수와 지연 시간을 출력합니다. 설정은 환경 변수를 그대로 따르므로,
+아래처럼 풀 사용 전/후를 나눠 실행하여 비교합니다.
+
+    # 변경 전: 요청마다 새 연결
+    DB_POOL=False DB_CONN_MAX_AGE=0 python benchmarks/connection_overhead.py --server wsgi
+    DB_POOL=False DB_CONN_MAX_AGE=0 python benchmarks/connection_overhead.py --server asgi
+
+    # 변경 후: 커넥션 풀
+    DB_POOL=True python benchmarks/connection_overhead.py --server wsgi
+    DB_POOL=True python benchmarks/connection_overhead.py --server asgi
+"""
+
+import argparse
+import asyncio
+import datetime
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from wsgiref.util import setup_testing_defaults
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "examscheduler.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.asgi import get_asgi_application  # noqa: E402
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+from django.db import connections  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+
+from customers.models import Customer  # noqa: E402
+from reservations.views import ReservationAvailableSlotsView  # noqa: E402
+
+
+PATH = '/api/reservations/available-slots/'
+
+
+class ConnectionCounter:
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, sender, connection, **kwargs):
+        with self._lock:
+            self.count += 1
+
+
+def get_access_token() -> str:
+    customer, _ = Customer.objects.get_or_create(company_name='bench')
+    return str(RefreshToken.for_user(customer).access_token)
+
+
+def get_query_string() -> str:
+    return f"date={(datetime.date.today() + datetime.timedelta(days=5)).isoformat()}"
+
+
+def run_wsgi(num_requests: int, concurrency: int, token: str) -> list[float]:
+    application = get_wsgi_application()
+
+    def start_response(status, headers, exc_info=None):
+        if not status.startswith('200'):
+            raise RuntimeError(f"unexpected response: {status}")
+
+    def request(_):
+        environ = {
+            'PATH_INFO': PATH,
+            'QUERY_STRING': get_query_string(),
+            'HTTP_HOST': 'testserver',
+            'HTTP_AUTHORIZATION': f"Bearer {token}",
+        }
+        setup_testing_defaults(environ)
+        started = time.perf_counter()
+        response = application(environ, start_response)
+        b''.join(response)
+        # close()에서 request_finished가 발생하며, 이때 CONN_MAX_AGE에 따라 연결이 정리된다.
+        response.close()
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(request, range(num_requests)))
+
+
+def run_asgi(num_requests: int, concurrency: int, token: str) -> list[float]:
+    application = get_asgi_application()
+
+    async def request(semaphore: asyncio.Semaphore) -> float:
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': PATH,
+            'raw_path': PATH.encode(),
+            'query_string': get_query_string().encode(),
+            'headers': [(b'authorization', f"Bearer {token}".encode())],
+            'server': ('testserver', 80),
+            'client': ('127.0.0.1', 0),
+        }
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            # 연결 종료를 알리지 않고 handler가 응답을 마칠 때까지 대기한다.
+            await asyncio.Future()
+
+        async def send(message):
+            if message['type'] == 'http.response.start' and message['status'] != 200:
+                raise RuntimeError(
+                    f"unexpected response: {message['status']}")
+
+        async with semaphore:
+            started = time.perf_counter()
+            await application(scope, receive, send)
+            return time.perf_counter() - started
+
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*(request(semaphore) for _ in range(num_requests)))
+
+    return asyncio.run(main())
+
+
+def describe_connection_mode() -> str:
+    database = settings.DATABASES['default']
+    pool = database.get('OPTIONS', {}).get('pool')
+    if pool:
+        return f"pool(min={pool['min_size']}, max={pool['max_size']})"
+    return f"CONN_MAX_AGE={database.get('CONN_MAX_AGE', 0)}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--server', choices=['wsgi', 'asgi'], default='wsgi')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    # 실제 서버를 띄우지 않고 handler를 직접 호출하므로 테스트용 호스트를 허용한다.
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+    # 한 고객으로 연속 요청하므로 빈도 제한을 끈다.
+    ReservationAvailableSlotsView.throttle_classes = []
+    token = get_access_token()
+    connections.close_all()
+
+    counter = ConnectionCounter()
+    connection_created.connect(counter)
+
+    runner = run_wsgi if args.server == 'wsgi' else run_asgi
+    started = time.perf_counter()
+    latencies = runner(args.requests, args.concurrency, token)
+    elapsed = time.perf_counter() - started
+
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    print(f"server:              {args.server}")
+    print(f"connection mode:     {describe_connection_mode()}")
+    print(f"requests:            {args.requests} (concurrency {args.concurrency})")
+    print(f"connections opened:  {counter.count} "
+          f"({counter.count / args.requests:.2f} per request)")
+    print(f"throughput:          {args.requests / elapsed:.1f} req/s")
+    print(f"latency mean:        {statistics.mean(latencies_ms):.2f} ms")
+    print(f"latency p50:         {latencies_ms[len(latencies_ms) // 2]:.2f} ms")
+    print(f"latency p95:         {latencies_ms[int(len(latencies_ms) * 0.95)]:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+확정 대기중 예약 일괄 확정 계획의 계산 시간을 측정하는 스크립트
+
+DB 없이 임의로 만든 후보로 `reservations.planning.solve`만 실행하여, 목표별 계산 시간과
+확정되는 예약 수/참가자 수를 출력합니다.
+
+    python benchmarks/plan_confirmations.py --candidates 50000 --days 30
+"""
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "examscheduler.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from reservations.models import (  # noqa: E402
+    HOURS_PER_DAY, RESERVATION_CLOSING_HOUR, RESERVATION_NUM_OF_PARTICIPANTS_LIMIT, RESERVATION_OPENING_HOUR,
+)
+from reservations.planning import OBJECTIVES, Candidate, solve  # noqa: E402
+
+
+def make_candidates(count: int, days: int, seed: int) -> list[Candidate]:
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    candidates = []
+    for _ in range(count):
+        start_hour = rng.randrange(RESERVATION_OPENING_HOUR, RESERVATION_CLOSING_HOUR)
+        end_hour = rng.randrange(start_hour + 1, RESERVATION_CLOSING_HOUR + 1)
+        candidates.append(Candidate(
+            uuid.uuid4(), today + datetime.timedelta(days=rng.randrange(days)), start_hour, end_hour,
+            rng.randint(1, RESERVATION_NUM_OF_PARTICIPANTS_LIMIT // 10)))
+    return candidates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=50000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    candidates = make_candidates(args.candidates, args.days, args.seed)
+    occupancy = {candidate.date: [0] * HOURS_PER_DAY for candidate in candidates}
+    for objective in OBJECTIVES:
+        started = time.perf_counter()
+        plan = solve(candidates, occupancy, objective)
+        elapsed = time.perf_counter() - started
+        print(f"{objective:>12}: {elapsed * 1000:8.1f}ms "
+              f"confirm={len(plan.confirm)} skip={len(plan.skip)} participants={plan.participants}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,16 @@ from django.contrib import admin
 from django.contrib.auth.models import Group
 
 from customers.models import Customer
+from customers.offboarding import offboard_customer
 
 
 class CustomerAdmin(admin.ModelAdmin):
     list_display = ['company_name', 'is_active', 'is_admin']
     list_filter = ['is_active']
 
-    search_fields = ['company_name']
+    # 회사명 앞부분으로 검색하여 인덱스를 사용한다. (예약 어드민의 고객 자동 완성에도 사용)
+    search_fields = ['company_name__startswith']
+    show_full_result_count = False
 
     fieldsets = [
         ('Company', {'fields': ['company_name']}),
@@ -19,5 +22,12 @@ class CustomerAdmin(admin.ModelAdmin):
         ('Company', {'fields': ['company_name', 'is_active', 'is_admin']}),
     ]
 
+    def delete_model(self, request, obj):
+        offboard_customer(obj)
+
+    def delete_queryset(self, request, queryset):
+        for customer in queryset:
+            offboard_customer(customer)
+
 
 admin.site.register(Customer, CustomerAdmin)
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from customers.models import Customer
+from customers.offboarding import offboard_customer
+
+
+class Command(BaseCommand):
+    help = "고객을 비활성화하고 고객의 예약을 배치 단위로 삭제한 뒤 고객을 삭제합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('company_name', help="삭제할 고객의 회사명")
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="한 트랜잭션에서 삭제할 예약 수")
+
+    def handle(self, *args, **options):
+        try:
+            customer = Customer.objects.get(company_name=options['company_name'])
+        except Customer.DoesNotExist:
+            raise CommandError(f"고객을 찾을 수 없습니다: {options['company_name']}")
+
+        deleted = offboard_customer(customer, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{options['company_name']} 고객과 예약 {deleted}건을 삭제했습니다."))
@@ -46,3 +46,29 @@ class Customer(AbstractBaseUser):
     @property
     def is_staff(self):
         return self.is_admin
+
+
+class IdempotencyKey(models.Model):
+    """
+    고객이 보낸 Idempotency-Key와 첫 번째 응답
+
+    (고객, 키) unique 제약으로 같은 키의 요청 중 하나만 처리를 시작합니다. 응답을 저장하기 전까지는
+    처리 중인 요청입니다. (examscheduler.idempotency 참고)
+    """
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='+')
+    key_hash = models.CharField(max_length=64)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_data = models.JSONField(null=True, blank=True)
+    response_headers = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['customer', 'key_hash'], name='idempotency_customer_key_uniq'),
+        ]
+        indexes = [
+            # 만료된 키를 정리할 때 사용한다.
+            models.Index(fields=['expires_at'], name='idempotency_expires_idx'),
+        ]
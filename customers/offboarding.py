@@ -0,0 +1,92 @@
+import logging
+
+from django.db import transaction
+
+from customers.models import Customer
+from examscheduler import metrics
+from reservations.etags import touch_reservation_lists
+from reservations.models import (
+    OutboxEvent, OutboxEventType, Reservation, ReservationArchive, ReservationHold, ReservationStatus,
+    ReservationTombstone,
+)
+from reservations.outbox import build_event
+from reservations.services import clear_available_slots_cache
+
+
+logger = logging.getLogger(__name__)
+
+RESERVATION_FIELDS = (
+    'id', 'title', 'date', 'start_time', 'end_time', 'customer',
+    'num_of_participants', 'status', 'updated_at', 'version',
+)
+
+
+def _delete_reservations_in_batches(customer: Customer, batch_size: int) -> int:
+    deleted = 0
+    reservations = Reservation.objects.filter(customer=customer).order_by('id')
+    while True:
+        with transaction.atomic():
+            batch = list(reservations.only(*RESERVATION_FIELDS)[:batch_size])
+            if not batch:
+                break
+
+            # 개별 삭제와 같이 변경 피드와 outbox에 삭제를 남긴다.
+            ReservationTombstone.objects.bulk_create([
+                ReservationTombstone(reservation_id=reservation.id, customer_id=customer.pk, date=reservation.date)
+                for reservation in batch
+            ])
+            OutboxEvent.objects.bulk_create([
+                build_event(OutboxEventType.DELETED, reservation) for reservation in batch
+            ])
+            # 예약을 메모리에 모으는 collector와 삭제 signal을 거치지 않고 바로 삭제한다.
+            query = Reservation.objects.filter(id__in=[reservation.id for reservation in batch])
+            deleted += query._raw_delete(query.db)
+
+        logger.info("deleted %s reservations of customer %s", deleted, customer.pk)
+    return deleted
+
+
+def _delete_archived_reservations_in_batches(customer: Customer, batch_size: int) -> int:
+    deleted = 0
+    while True:
+        ids = list(ReservationArchive.objects.filter(customer=customer).values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        query = ReservationArchive.objects.filter(customer=customer, id__in=ids)
+        deleted += query._raw_delete(query.db)
+    return deleted
+
+
+def offboard_customer(customer: Customer, batch_size: int = 1000) -> int:
+    """고객과 고객의 예약을 메모리 사용량을 일정하게 유지하며 삭제합니다.
+
+    먼저 고객을 비활성화하여 새 요청을 막고, 예약을 배치 단위로 바로 삭제한 뒤 고객을 삭제합니다.
+    확정된 예약이나 만료되지 않은 hold가 있던 날짜의 예약 가능 시간 캐시는 날짜마다 한 번씩만 비웁니다.
+    hold는 고객을 삭제할 때 함께 삭제됩니다.
+    중간에 실패해도 고객은 비활성화된 상태로 남으므로 다시 실행하면 이어서 삭제합니다.
+
+    Args:
+        customer (Customer): 삭제할 고객
+        batch_size (int): 한 트랜잭션에서 삭제할 예약 수
+
+    Returns:
+        int: 삭제한 예약 수 (보관된 예약 제외)
+    """
+    with metrics.timed('customer_offboard', customer_id=customer.pk, rows=0) as values:
+        Customer.objects.filter(pk=customer.pk).update(is_active=False)
+
+        dates = sorted(
+            Reservation.objects
+            .filter(customer=customer, status=ReservationStatus.CONFIRMED)
+            .values_list('date', flat=True)
+            .union(ReservationHold.objects.active().filter(customer=customer).values_list('date', flat=True))
+        )
+
+        values['rows'] = _delete_reservations_in_batches(customer, batch_size)
+        values['archived_rows'] = _delete_archived_reservations_in_batches(customer, batch_size)
+
+        touch_reservation_lists(customer.pk)
+        customer.delete()
+        # hold는 고객과 함께 삭제되므로, 고객을 삭제한 뒤 비운다.
+        clear_available_slots_cache(*dates)
+    return values['rows']
@@ -1,8 +1,16 @@
+import datetime
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APITestCase
 
 from customers.models import Customer
+from customers.offboarding import offboard_customer
+from examscheduler.testing import APITestCase
+from reservations.models import OutboxEvent, OutboxEventType, Reservation, ReservationStatus, ReservationTombstone
 
 
 class CustomerAPITestCase(APITestCase):
@@ -108,3 +116,83 @@ class CustomerAPITestCase(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Customer.objects.count(), 1)
+
+
+class CustomerOffboardingTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin_customer = Customer.objects.create_superuser(
+            company_name="grepp",
+            password="grepp1234"
+        )
+        self.customer = Customer.objects.create(
+            company_name="programmers",
+            password="progremmers123"
+        )
+        self.other_customer = Customer.objects.create(
+            company_name="kakao",
+            password="kakao1234"
+        )
+        today = datetime.date.today()
+        self.confirmed_dates = [today + datetime.timedelta(days=days) for days in (4, 5)]
+        for date in self.confirmed_dates:
+            for hour in (9, 10):
+                Reservation.objects.create(
+                    title="테스트 시험", customer=self.customer, date=date,
+                    start_time=datetime.time(hour), end_time=datetime.time(hour + 1),
+                    num_of_participants=10, status=ReservationStatus.CONFIRMED)
+        self.pending_date = today + datetime.timedelta(days=6)
+        Reservation.objects.create(
+            title="테스트 시험", customer=self.customer, date=self.pending_date,
+            start_time=datetime.time(9), end_time=datetime.time(10), num_of_participants=10)
+        Reservation.objects.create(
+            title="다른 고객 시험", customer=self.other_customer, date=self.pending_date,
+            start_time=datetime.time(9), end_time=datetime.time(10), num_of_participants=10)
+
+    def test_offboarding_deletes_reservations_in_batches(self):
+        """
+        고객의 예약을 배치 단위로 삭제하고, 삭제 기록과 outbox 이벤트를 남기는지 확인
+        """
+        customer_id = self.customer.pk
+        with patch('django.core.cache.cache.delete') as mock_delete, self.captureOnCommitCallbacks(execute=True):
+            deleted = offboard_customer(self.customer, batch_size=2)
+
+        self.assertEqual(deleted, 5)
+        self.assertFalse(Customer.objects.filter(pk=customer_id).exists())
+        self.assertEqual(Reservation.objects.count(), 1)
+        self.assertEqual(ReservationTombstone.objects.filter(customer_id=customer_id).count(), 5)
+        self.assertEqual(OutboxEvent.objects.filter(event_type=OutboxEventType.DELETED).count(), 5)
+        self.assertCountEqual([call.args[0] for call in mock_delete.call_args_list],
+                              [f"available_slots:{date}" for date in self.confirmed_dates])
+
+    def test_offboarding_deactivates_customer_first(self):
+        """
+        예약 삭제 중 실패해도 고객은 비활성화된 상태로 남는지 확인
+        """
+        with patch('customers.offboarding._delete_reservations_in_batches', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                offboard_customer(self.customer)
+
+        self.customer.refresh_from_db()
+        self.assertFalse(self.customer.is_active)
+
+    def test_delete_customer_api_uses_offboarding(self):
+        """
+        고객 삭제 API가 고객의 예약도 함께 삭제하는지 확인
+        """
+        customer_id = self.customer.pk
+        self.client.force_login(self.admin_customer)
+        response = self.client.delete(reverse('customer-detail', args=[customer_id]))
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Reservation.objects.filter(customer_id=customer_id).exists())
+        self.assertTrue(Reservation.objects.filter(customer=self.other_customer).exists())
+
+    def test_offboard_command(self):
+        """
+        offboard_customer 명령으로 고객을 삭제할 수 있는지 확인
+        """
+        out = StringIO()
+        call_command('offboard_customer', 'programmers', '--batch-size', '3', stdout=out)
+        self.assertIn('예약 5건', out.getvalue())
+        self.assertFalse(Customer.objects.filter(company_name='programmers').exists())
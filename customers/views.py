@@ -6,7 +6,10 @@ from rest_framework.decorators import action
 from drf_spectacular.utils import extend_schema_view, extend_schema
 
 from customers.models import Customer
+from customers.offboarding import offboard_customer
+from examscheduler.routers import ReplicaReadMixin
 from customers.serializers import CustomerChangePasswordSerializer, CustomerSerializer
+from reservations.etags import touch_reservation_lists
 
 
 @extend_schema_view(
@@ -27,12 +30,14 @@ from customers.serializers import CustomerChangePasswordSerializer, CustomerSeri
         description="고객 정보를 일부 수정합니다. </br> 어드민 권한이 필요합니다."),
     destroy=extend_schema(
         summary="고객 삭제",
-        description="고객 정보를 삭제합니다. </br> 어드민 권한이 필요합니다."),
+        description="고객 정보를 삭제합니다. </br> 어드민 권한이 필요합니다. </br> \
+            고객을 먼저 비활성화한 뒤 고객의 예약을 모두 삭제합니다."),
 )
-class CustomerViewSet(viewsets.ModelViewSet):
+class CustomerViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = Customer.objects.order_by("id")
     serializer_class = CustomerSerializer
     permission_classes = [IsAdminUser]
+    replica_read_actions = ('list',)
 
     def get_serializer_class(self):
         if self.action == 'change_password':
@@ -44,6 +49,14 @@ class CustomerViewSet(viewsets.ModelViewSet):
         customer.set_password(customer.password)
         customer.save()
 
+    def perform_update(self, serializer):
+        customer = serializer.save()
+        # 예약 목록은 고객의 회사명을 함께 보여준다.
+        touch_reservation_lists(customer.pk)
+
+    def perform_destroy(self, instance):
+        offboard_customer(instance)
+
     @extend_schema(
         summary="고객 비밀번호 변경",
         description="고객의 비밀번호를 변경합니다. </br> 어드민 권한이 필요합니다.",
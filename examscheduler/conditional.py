@@ -0,0 +1,71 @@
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import status
+from rest_framework.response import Response
+
+
+IF_MATCH_PARAMETER = OpenApiParameter(
+    name='If-Match', type=str, location=OpenApiParameter.HEADER, required=False,
+    description='조회한 응답의 ETag. 그 뒤에 다른 요청이 먼저 변경했다면 변경하지 않고 412를 반환합니다.')
+
+IF_NONE_MATCH_PARAMETER = OpenApiParameter(
+    name='If-None-Match', type=str, location=OpenApiParameter.HEADER, required=False,
+    description='이전 응답의 ETag. 그 뒤로 바뀌지 않았다면 본문 없이 304를 반환합니다.')
+
+PRECONDITION_FAILED_MESSAGE = '다른 요청에 의해 먼저 변경되었습니다. 다시 조회한 뒤 시도해주세요.'
+
+
+def make_etag(version: int) -> str:
+    """리소스의 version으로 ETag를 만듭니다."""
+    return f'"{version}"'
+
+
+def if_match_failed(request, version: int) -> bool:
+    """If-Match 헤더가 있고 현재 version의 ETag와 일치하지 않으면 True를 반환합니다.
+
+    If-Match는 강한 비교를 사용하므로 약한 ETag(W/"...")는 일치하지 않습니다.
+
+    Args:
+        request (Request): 요청
+        version (int): 리소스의 현재 version
+    """
+    header = request.headers.get('If-Match')
+    if header is None:
+        return False
+    etags = parse_etags(header)
+    return '*' not in etags and make_etag(version) not in etags
+
+
+def _weak(etag: str) -> str:
+    return etag.removeprefix('W/')
+
+
+def if_none_match_hit(request, etag: str) -> bool:
+    """If-None-Match 헤더에 현재 ETag가 있으면 True를 반환합니다. (약한 비교)"""
+    header = request.headers.get('If-None-Match')
+    if header is None:
+        return False
+    etags = parse_etags(header)
+    return '*' in etags or _weak(etag) in {_weak(value) for value in etags}
+
+
+def cache_headers(response, etag: str | None = None, **cache_control):
+    """응답에 ETag와 Cache-Control 헤더를 붙입니다.
+
+    응답은 인증된 고객마다 다르므로 `Vary: Authorization`도 함께 붙입니다.
+    """
+    if etag is not None:
+        response['ETag'] = etag
+    patch_cache_control(response, **cache_control)
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def not_modified(etag: str, **cache_control) -> Response:
+    """본문 없이 304를 반환합니다. 200 응답과 같은 캐시 헤더를 붙여야 합니다."""
+    return cache_headers(Response(status=status.HTTP_304_NOT_MODIFIED), etag, **cache_control)
+
+
+def precondition_failed() -> Response:
+    return Response({'detail': PRECONDITION_FAILED_MESSAGE}, status=status.HTTP_412_PRECONDITION_FAILED)
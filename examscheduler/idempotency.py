@@ -0,0 +1,143 @@
+import datetime
+import functools
+import hashlib
+import json
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from customers.models import IdempotencyKey
+
+
+IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key'
+IDEMPOTENT_REPLAYED_HEADER = 'Idempotent-Replayed'
+
+# 재시도에도 첫 번째 응답과 같은 값으로 보내는 응답 헤더
+STORED_RESPONSE_HEADERS = ('ETag', 'Location')
+
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    name=IDEMPOTENCY_KEY_HEADER, type=str, location=OpenApiParameter.HEADER, required=False,
+    description='같은 키로 재시도하면 요청을 다시 처리하지 않고 첫 번째 응답을 그대로 반환합니다.')
+
+
+def _fingerprint(request) -> str:
+    body = json.dumps(request.data, cls=JSONEncoder, sort_keys=True)
+    return hashlib.sha256(f"{request.method}:{request.path}:{body}".encode()).hexdigest()
+
+
+def _replay(stored: IdempotencyKey, fingerprint: str) -> Response:
+    if stored.fingerprint != fingerprint:
+        return Response(
+            {'detail': '같은 Idempotency-Key로 다른 요청을 보낼 수 없습니다.'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    if stored.status_code is None:
+        return Response({'detail': '같은 Idempotency-Key의 요청이 처리 중입니다.'},
+                        status=status.HTTP_409_CONFLICT)
+    return Response(stored.response_data, status=stored.status_code,
+                    headers={**stored.response_headers, IDEMPOTENT_REPLAYED_HEADER: 'true'})
+
+
+def _is_stale(stored: IdempotencyKey, now: datetime.datetime) -> bool:
+    """저장된 응답이 만료되었거나, 처리 중에 중단되어 IDEMPOTENCY_LOCK_TIMEOUT이 지났는지 반환합니다."""
+    return stored.expires_at <= now or (
+        stored.status_code is None
+        and stored.created_at <= now - datetime.timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT))
+
+
+def _claim(customer, key_hash: str, fingerprint: str) -> IdempotencyKey | None:
+    """키를 처리할 요청으로 등록합니다. 같은 키가 이미 등록되어 있으면 None을 반환합니다."""
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(
+                customer=customer, key_hash=key_hash, fingerprint=fingerprint,
+                expires_at=timezone.now() + datetime.timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL))
+    except IntegrityError:
+        return None
+
+
+def idempotent(handler):
+    """`Idempotency-Key` 헤더를 지원하도록 view handler를 감쌉니다.
+
+    고객과 키 별로 첫 번째 응답을 IDEMPOTENCY_KEY_TTL 동안 DB에 저장하고, 재시도 요청에는
+    handler를 실행하지 않고 저장된 행을 한 번 읽어 저장된 응답과 헤더(ETag, Location)를 반환합니다. 처리를 시작할 때
+    (고객, 키) unique 제약이 있는 행을 먼저 저장하므로, 같은 키의 요청이 동시에 들어오면 저장에 성공한
+    요청만 처리하고 나머지는 409를 반환합니다. 처리 중에 중단되어 IDEMPOTENCY_LOCK_TIMEOUT이 지난 요청은
+    다시 처리할 수 있습니다.
+    인증과 권한 검사가 끝난 뒤 실행되는 handler(create, post 등)에 사용합니다.
+    """
+    @functools.wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+        if not key:
+            return handler(view, request, *args, **kwargs)
+        if len(key) > 255:
+            return Response({'detail': 'Idempotency-Key는 255자 이하여야 합니다.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        key_hash = hashlib.sha256(key.encode()).hexdigest()
+        fingerprint = _fingerprint(request)
+
+        # 재시도는 저장된 행을 한 번 읽고 바로 응답한다. 키가 없거나 만료/중단된 경우에만 등록한다.
+        stored = IdempotencyKey.objects.filter(customer=request.user, key_hash=key_hash).first()
+        if stored is not None:
+            now = timezone.now()
+            if not _is_stale(stored, now):
+                return _replay(stored, fingerprint)
+            # 만료된 응답과 중단된 요청의 행은 지우고 한 번만 다시 등록한다.
+            IdempotencyKey.objects.filter(
+                Q(expires_at__lte=now) |
+                Q(status_code__isnull=True,
+                  created_at__lte=now - datetime.timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT)),
+                pk=stored.pk,
+            ).delete()
+
+        claim = _claim(request.user, key_hash, fingerprint)
+        if claim is None:
+            # 같은 키의 다른 요청이 먼저 등록한 경우
+            stored = IdempotencyKey.objects.filter(customer=request.user, key_hash=key_hash).first()
+            if stored is None:
+                return Response({'detail': '같은 Idempotency-Key의 요청이 처리 중입니다.'},
+                                status=status.HTTP_409_CONFLICT)
+            return _replay(stored, fingerprint)
+
+        try:
+            response = handler(view, request, *args, **kwargs)
+        except BaseException:
+            claim.delete()
+            raise
+
+        if response.status_code < 500:
+            IdempotencyKey.objects.filter(pk=claim.pk).update(
+                status_code=response.status_code,
+                response_data=json.loads(json.dumps(response.data, cls=JSONEncoder)),
+                response_headers={
+                    name: response[name] for name in STORED_RESPONSE_HEADERS if response.has_header(name)},
+            )
+        else:
+            # 서버 오류는 저장하지 않고 같은 키로 다시 처리할 수 있게 한다.
+            claim.delete()
+        return response
+
+    return wrapper
+
+
+def prune_idempotency_keys(batch_size: int = 500) -> int:
+    """만료된 Idempotency-Key를 배치 단위로 정리합니다.
+
+    Returns:
+        int: 정리한 키 수
+    """
+    pruned = 0
+    while True:
+        ids = list(
+            IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return pruned
+        deleted, _ = IdempotencyKey.objects.filter(id__in=ids).delete()
+        pruned += deleted
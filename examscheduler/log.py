@@ -0,0 +1,113 @@
+import atexit
+import contextvars
+import copy
+import datetime
+import json
+import logging
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+
+
+request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar(
+    'request_id', default='-')
+
+# LogRecord이 기본으로 가지는 속성들입니다. 이외의 속성은 extra로 전달된 값으로 간주합니다.
+_RESERVED_RECORD_ATTRS = frozenset(vars(logging.LogRecord(
+    '', logging.INFO, '', 0, '', (), None)).keys()) | {'message', 'asctime', 'request_id'}
+
+
+class JsonFormatter(logging.Formatter):
+    """로그 레코드를 한 줄의 JSON 문자열로 직렬화하는 Formatter
+
+    `extra`로 전달된 값들은 최상위 키로 함께 기록됩니다.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'timestamp': datetime.datetime.fromtimestamp(
+                record.created, tz=datetime.timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_RECORD_ATTRS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload['exc_info'] = record.exc_text
+        if record.stack_info:
+            payload['stack_info'] = self.formatStack(record.stack_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class RequestIdFilter(logging.Filter):
+    """현재 요청의 correlation ID를 레코드에 추가하는 Filter"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # django.request 로그는 middleware를 벗어난 뒤 기록되므로 request 객체의 값을 사용한다.
+        record.request_id = getattr(
+            getattr(record, 'request', None), 'request_id', request_id_var.get())
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """`extra={'event': ...}`로 표시된 대량 이벤트를 설정된 비율만큼만 통과시키는 Filter
+
+    Args:
+        rates (dict[str, float]): 이벤트 이름별 샘플링 비율 (0.0 ~ 1.0).
+            등록되지 않은 이벤트는 항상 통과합니다.
+    """
+
+    def __init__(self, rates: dict[str, float] | None = None):
+        super().__init__()
+        self.rates = dict(rates or {})
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(getattr(record, 'event', None))
+        if rate is None or rate >= 1:
+            return True
+        return random.random() < rate
+
+
+_traceback_formatter = logging.Formatter()
+
+
+class QueueListenerHandler(QueueHandler):
+    """레코드를 큐에 넣기만 하고, 실제 I/O는 별도 스레드의 QueueListener가 처리하는 Handler
+
+    dictConfig에서 `'()'` 팩토리로 생성하며, `targets`에는 이미 설정된 handler를
+    `cfg://handlers.<name>` 형태로 지정합니다. (handler는 이름순으로 설정되므로,
+    대상 handler의 이름이 이 handler보다 앞서야 합니다.)
+    """
+
+    def __init__(self, targets=(), queue_size: int = -1, respect_handler_level: bool = True):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        # ConvertingList는 인덱스로 접근해야 cfg:// 참조가 handler로 변환됩니다.
+        handlers = [targets[i] for i in range(len(targets))]
+        self._listener = QueueListener(
+            self.queue, *handlers, respect_handler_level=respect_handler_level)
+        self._listener.start()
+        self._listener_running = True
+        atexit.register(self.close)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 메시지 인자만 병합하고, 최종 포맷팅은 listener 스레드의 formatter에 맡깁니다.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _traceback_formatter.formatException(
+                record.exc_info)
+            record.exc_info = None
+        return record
+
+    def close(self):
+        # 큐에 남은 레코드를 모두 내보낸 뒤 listener 스레드를 종료합니다.
+        if self._listener_running:
+            self._listener_running = False
+            self._listener.stop()
+        super().close()
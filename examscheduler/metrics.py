@@ -0,0 +1,36 @@
+import contextlib
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+def emit(metric: str, **fields):
+    """측정값을 구조화된 로그(`event=metric`)로 기록합니다.
+
+    Args:
+        metric (str): 측정 항목 이름 (예: 'pending_reservation_sweep')
+        **fields: 함께 기록할 값들
+    """
+    logger.info("%s %s", metric, fields,
+                extra={'event': 'metric', 'metric': metric, **fields})
+
+
+@contextlib.contextmanager
+def timed(metric: str, **fields):
+    """블록의 실행 시간을 `duration_seconds`로 함께 기록합니다.
+
+    yield된 dict에 값을 추가하면 함께 기록되며, `rows`가 있으면 초당 처리량(`rows_per_second`)도 계산합니다.
+    """
+    values = dict(fields)
+    started = time.perf_counter()
+    try:
+        yield values
+    finally:
+        duration = time.perf_counter() - started
+        values['duration_seconds'] = round(duration, 6)
+        if 'rows' in values:
+            values['rows_per_second'] = round(
+                values['rows'] / duration, 2) if duration else None
+        emit(metric, **values)
@@ -0,0 +1,60 @@
+import re
+import uuid
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from examscheduler.log import request_id_var
+
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+_VALID_REQUEST_ID = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+class RequestIdMiddleware:
+    """
+    요청마다 correlation ID를 부여하는 middleware
+
+    클라이언트가 보낸 `X-Request-ID`가 올바른 형식이면 그대로 사용하고, 아니면 새로 생성합니다.
+    ID는 로그 레코드와 응답 헤더에 함께 기록됩니다.
+    ASGI에서는 스레드로 옮기지 않고 이벤트 루프에서 바로 실행됩니다. (예약 가능 시간 변경 스트림 등)
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+
+        token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        return self.finish(request, response)
+
+    async def __acall__(self, request):
+        token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_id_var.reset(token)
+        return self.finish(request, response)
+
+    @staticmethod
+    def start(request):
+        request_id = request.headers.get(REQUEST_ID_HEADER, '')
+        if not _VALID_REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+        request.request_id = request_id
+        return request_id_var.set(request_id)
+
+    @staticmethod
+    def finish(request, response):
+        response[REQUEST_ID_HEADER] = request.request_id
+        return response
@@ -0,0 +1,101 @@
+import contextlib
+import contextvars
+import random
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+
+replica_reads: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    'replica_reads', default=False)
+
+
+@contextlib.contextmanager
+def read_from_replica():
+    """이 블록 안의 조회 쿼리를 replica로 보냅니다. replica가 없으면 primary에서 읽습니다."""
+    token = replica_reads.set(True)
+    try:
+        yield
+    finally:
+        replica_reads.reset(token)
+
+
+@contextlib.contextmanager
+def read_from_primary():
+    """`read_from_replica()` 안에서도 이 블록 안의 조회 쿼리는 primary로 보냅니다."""
+    token = replica_reads.set(False)
+    try:
+        yield
+    finally:
+        replica_reads.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    쓰기는 항상 primary로, 조회는 `read_from_replica()` 안에서만 replica로 보내는 router
+    """
+
+    def db_for_read(self, model, **hints):
+        if replica_reads.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replica는 primary의 복제본이므로 어느 DB에서 읽은 객체든 서로 연결할 수 있다.
+        return True
+
+
+def _primary_pin_key(user) -> str:
+    return f"primary_pin:{user.pk}"
+
+
+def pin_to_primary(user):
+    """쓰기 직후 REPLICA_PIN_SECONDS 동안 해당 고객의 조회를 primary로 고정합니다."""
+    cache.set(_primary_pin_key(user), True,
+              timeout=settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user) -> bool:
+    return bool(cache.get(_primary_pin_key(user)))
+
+
+class ReplicaReadMixin:
+    """
+    `replica_read_actions`에 해당하는 조회 요청을 replica에서 처리하는 view mixin
+
+    action이 없는 APIView는 소문자 HTTP 메서드 이름(예: 'get')으로 지정합니다.
+    성공한 쓰기 요청 이후에는 read-your-writes를 위해 고객을 잠시 primary에 고정합니다.
+    """
+    replica_read_actions: tuple[str, ...] = ()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        action = getattr(self, 'action', None) or request.method.lower()
+        if (
+            settings.DATABASE_REPLICAS and
+            request.method in SAFE_METHODS and
+            action in self.replica_read_actions and
+            not is_pinned_to_primary(request.user)
+        ):
+            self._replica_reads_token = replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_reads_token', None)
+        if token is not None:
+            replica_reads.reset(token)
+            self._replica_reads_token = None
+
+        if (
+            settings.DATABASE_REPLICAS and
+            request.method not in SAFE_METHODS and
+            response.status_code < 400 and
+            request.user.is_authenticated
+        ):
+            pin_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
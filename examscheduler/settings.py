@@ -14,6 +14,8 @@ import os
 import environ
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -58,6 +60,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "examscheduler.middleware.RequestIdMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -91,31 +94,53 @@ WSGI_APPLICATION = "examscheduler.wsgi.application"
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
+    "filters": {
+        "request_id": {
+            "()": "examscheduler.log.RequestIdFilter",
+        },
+        # 캐시 적중/무효화처럼 빈번한 debug 이벤트는 비율만큼만 기록한다.
+        "sampling": {
+            "()": "examscheduler.log.SamplingFilter",
+            "rates": {
+                "cache_hit": env.float("LOG_SAMPLE_CACHE_HIT", default=1.0),
+                "cache_invalidate": env.float("LOG_SAMPLE_CACHE_INVALIDATE", default=1.0),
+            },
+        },
+    },
     "handlers": {
         "console": {
             "class": "logging.StreamHandler",
-            "formatter": "verbose"
+            "formatter": env.str("LOG_FORMAT", default="json"),
+        },
+        # 요청 스레드에서는 큐에 넣기만 하고, 포맷팅과 I/O는 listener 스레드에서 처리한다.
+        "queue": {
+            "()": "examscheduler.log.QueueListenerHandler",
+            "targets": ["cfg://handlers.console"],
+            "filters": ["request_id", "sampling"],
         },
     },
     "loggers": {
         "": {
-            "handlers": ["console"],
+            "handlers": ["queue"],
             "level": os.environ.get("DJANGO_LOG_LEVEL", "INFO"),
         },
         "django": {
-            "handlers": ["console"],
+            "handlers": ["queue"],
             "level": "INFO",
             "propagate": False,
         },
         "django.server": {
-            "handlers": ["console"],
+            "handlers": ["queue"],
             "level": "INFO",
             "propagate": False,
         },
     },
     "formatters": {
+        "json": {
+            "()": "examscheduler.log.JsonFormatter",
+        },
         "verbose": {
-            "format": "{asctime} ({levelname}) - {name} - {message}",
+            "format": "{asctime} ({levelname}) - {name} - [{request_id}] {message}",
             "style": "{",
         }
     },
@@ -129,12 +154,62 @@ DATABASES = {
     "default": env.db()
 }
 
+# 조회 전용 replica. 설정되어 있으면 일부 조회 API가 replica에서 읽는다. (examscheduler.routers 참고)
+# 테스트에서는 별도 DB를 만들지 않고 default를 그대로 바라본다.
+if env.str("REPLICA_DATABASE_URL", default=""):
+    DATABASES["replica"] = env.db("REPLICA_DATABASE_URL")
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+
+DATABASE_ROUTERS = ["examscheduler.routers.PrimaryReplicaRouter"]
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+
+# 쓰기 직후에는 replica 지연으로 방금 쓴 내용이 보이지 않을 수 있으므로, 이 시간 동안은 primary에서 읽는다.
+REPLICA_PIN_SECONDS = env.int("REPLICA_PIN_SECONDS", default=5)
+
+# PostgreSQL에서는 psycopg 커넥션 풀을 사용한다. (ASGI에서는 요청마다 스레드가 달라 지속 연결이 재사용되지 않는다.)
+# 풀을 사용하지 않는 경우에는 스레드별 지속 연결(CONN_MAX_AGE)로 대신한다.
+# 두 경우 모두 연결을 꺼낼 때 상태를 확인한다. 풀을 사용하면 Django가 CONN_HEALTH_CHECKS로 확인하지 않으므로
+# 풀의 check로, 지속 연결은 CONN_HEALTH_CHECKS로 확인한다.
+DB_POOL = env.bool("DB_POOL", default=True)
+
+for database in DATABASES.values():
+    if DB_POOL and database["ENGINE"] == "django.db.backends.postgresql":
+        from psycopg_pool import ConnectionPool
+
+        database.setdefault("OPTIONS", {})["pool"] = {
+            "check": ConnectionPool.check_connection,
+            "min_size": env.int("DB_POOL_MIN_SIZE", default=2),
+            "max_size": env.int("DB_POOL_MAX_SIZE", default=10),
+            "max_idle": env.float("DB_POOL_MAX_IDLE", default=300.0),
+            "timeout": env.float("DB_POOL_TIMEOUT", default=10.0),
+        }
+        database["CONN_MAX_AGE"] = 0
+    else:
+        database["CONN_MAX_AGE"] = env.int("DB_CONN_MAX_AGE", default=60)
+
+    database["CONN_HEALTH_CHECKS"] = True
+
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
         'LOCATION': '/tmp/django_cache',
-    }
+    },
+    # 빈도 제한 카운터. 기본값인 프로세스 메모리 캐시는 프로세스마다 따로 세므로,
+    # 여러 프로세스/서버에서 운영한다면 Redis(redis://) 또는 Memcached(pymemcache://)를 지정한다.
+    'throttle': env.cache_url("THROTTLE_CACHE_URL", default="locmemcache://throttle"),
+}
+
+# 빈도 제한은 동시에 들어온 요청을 모두 세야 하므로 incr가 원자적인 backend만 허용한다.
+# (파일/DB 캐시의 incr는 읽은 뒤 쓰므로 동시에 증가시키면 한쪽이 사라진다.)
+ATOMIC_INCR_CACHE_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.redis.RedisCache',
+    'django.core.cache.backends.memcached.PyMemcacheCache',
+    'django.core.cache.backends.memcached.PyLibMCCache',
 }
+if CACHES['throttle']['BACKEND'] not in ATOMIC_INCR_CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f"THROTTLE_CACHE_URL의 backend({CACHES['throttle']['BACKEND']})는 incr가 원자적이지 않습니다.")
 
 AUTH_USER_MODEL = "customers.Customer"
 
@@ -187,9 +262,24 @@ REST_FRAMEWORK = {
         'rest_framework.authentication.SessionAuthentication',
     ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
-    "PAGE_SIZE": 10
+    "PAGE_SIZE": 10,
+    # 예약 가능 시간 조회(slots), 쓰기 요청(writes), 로그인(login)의 빈도 제한
+    # 고객별로, 로그인하지 않은 요청은 IP별로 적용한다. 형식: <요청 수>/<s|m|h|d>
+    'DEFAULT_THROTTLE_CLASSES': [
+        'examscheduler.throttling.ScopedBucketThrottle',
+        'examscheduler.throttling.WriteBucketThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'slots': env("THROTTLE_RATE_SLOTS", default="60/m"),
+        'writes': env("THROTTLE_RATE_WRITES", default="30/m"),
+        'login': env("THROTTLE_RATE_LOGIN", default="10/m"),
+    },
 }
 
+# Idempotency-Key로 저장한 첫 응답의 보관 시간과, 처리 중에 중단된 요청의 키를 다시 사용할 수 있게 되는 시간 (초)
+IDEMPOTENCY_KEY_TTL = env.int("IDEMPOTENCY_KEY_TTL", default=60 * 60 * 24)
+IDEMPOTENCY_LOCK_TIMEOUT = env.int("IDEMPOTENCY_LOCK_TIMEOUT", default=30)
+
 SIMPLE_JWT = {
     "UPDATE_LAST_LOGIN": True,
     "TOKEN_OBTAIN_SERIALIZER": "auth.serializers.CustomTokenObtainPairSerializer",
@@ -201,3 +291,47 @@ SPECTACULAR_SETTINGS = {
     'VERSION': '1.0.0',
     'SERVE_INCLUDE_SCHEMA': False,
 }
+
+
+# Reservations
+
+# 예약 테이블에는 오늘로부터 이 기간 이내의 예약만 남기고, 나머지는 보관 테이블로 옮긴다.
+# (manage.py archive_reservations)
+RESERVATION_ARCHIVE_RETENTION_DAYS = env.int(
+    "RESERVATION_ARCHIVE_RETENTION_DAYS", default=30)
+# 변경 피드(GET /api/reservations/changes/)가 삭제된 예약을 알려주기 위한 기록의 보관 기간 (일)
+# 이보다 오래된 cursor로 조회하면 목록을 처음부터 다시 받아야 한다.
+RESERVATION_TOMBSTONE_RETENTION_DAYS = env.int(
+    "RESERVATION_TOMBSTONE_RETENTION_DAYS", default=30)
+# 커밋되지 않은 트랜잭션의 변경을 건너뛰지 않도록, 이 시간(초)보다 최근의 변경은 다음 조회에서 반환한다.
+RESERVATION_CHANGES_LAG_SECONDS = env.int(
+    "RESERVATION_CHANGES_LAG_SECONDS", default=2)
+
+# 날짜가 지났거나 예약 가능 기간(3일 후부터)을 벗어난 확정 대기중 예약의 처리 방식 (cancel | delete)
+# (manage.py sweep_pending_reservations)
+PENDING_RESERVATION_SWEEP_POLICY = env.str(
+    "PENDING_RESERVATION_SWEEP_POLICY", default="cancel")
+PENDING_RESERVATION_SWEEP_CUTOFF_DAYS = env.int(
+    "PENDING_RESERVATION_SWEEP_CUTOFF_DAYS", default=3)
+
+# 예약을 만드는 동안 수용 인원을 잡아두는 hold의 유효 시간 (초)
+RESERVATION_HOLD_TTL_SECONDS = env.int(
+    "RESERVATION_HOLD_TTL_SECONDS", default=60 * 10)
+
+# 예약 가능 시간 변경 구독(SSE)
+# 여러 worker로 운영할 때는 worker 간에 메시지를 전달하는 pub/sub backend로 바꾼다.
+SLOT_BROADCAST_BACKEND = env(
+    "SLOT_BROADCAST_BACKEND", default="reservations.broadcast.LocalPubSub")
+SLOT_STREAM_HEARTBEAT_SECONDS = env.int("SLOT_STREAM_HEARTBEAT_SECONDS", default=15)
+
+# 0보다 크면 웹 서버 프로세스 안에서 이 간격(초)마다, 그리고 자정 직후에 예약 가능 시간 캐시를 미리 저장한다.
+# 별도 프로세스에서 실행하려면 0으로 두고 manage.py warm_available_slots --interval을 사용한다.
+AVAILABLE_SLOTS_WARM_INTERVAL = env.int("AVAILABLE_SLOTS_WARM_INTERVAL", default=0)
+
+# 앞단의 reverse proxy가 예약 가능 시간 응답을 다시 확인하지 않고 재사용할 시간(초) (Cache-Control s-maxage)
+AVAILABLE_SLOTS_SHARED_MAX_AGE = env.int("AVAILABLE_SLOTS_SHARED_MAX_AGE", default=5)
+
+# 예약 이벤트 outbox 전달 (manage.py dispatch_outbox)
+OUTBOX_SINK = env.str("OUTBOX_SINK", default="file")
+OUTBOX_FILE_PATH = env.str("OUTBOX_FILE_PATH", default=str(BASE_DIR / "outbox.jsonl"))
+OUTBOX_WEBHOOK_URL = env.str("OUTBOX_WEBHOOK_URL", default="")
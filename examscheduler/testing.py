@@ -0,0 +1,32 @@
+"""
+테스트 공통 base class
+
+테스트 실행기(`manage.py test`, `python -m django test`, pytest 등)와 관계없이 개발 서버의 캐시 파일을
+건드리지 않도록 모든 캐시를 프로세스 메모리 캐시로 바꾸고, 빈도 제한을 끕니다.
+(빈도 제한 테스트는 BucketRateThrottle.THROTTLE_RATES를 바꿔서 확인합니다.)
+"""
+from django.conf import settings
+from django.test import TestCase as DjangoTestCase, override_settings
+from rest_framework.test import APITestCase as DRFAPITestCase
+
+
+test_settings = override_settings(
+    CACHES={
+        alias: {**config, "BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": alias}
+        for alias, config in settings.CACHES.items()
+    },
+    REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_RATES": dict.fromkeys(settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]),
+    },
+)
+
+
+@test_settings
+class TestCase(DjangoTestCase):
+    pass
+
+
+@test_settings
+class APITestCase(DRFAPITestCase):
+    pass
@@ -0,0 +1,314 @@
+import datetime
+import json
+import logging
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+
+from customers.models import Customer
+from examscheduler.log import JsonFormatter, QueueListenerHandler, RequestIdFilter, SamplingFilter, request_id_var
+from examscheduler.middleware import RequestIdMiddleware
+from examscheduler.routers import is_pinned_to_primary, pin_to_primary, read_from_replica
+from examscheduler.testing import APITestCase, TestCase
+from examscheduler.throttling import BucketRateThrottle, ScopedBucketThrottle
+from reservations.models import Reservation
+from reservations.utils import get_cached_available_slots
+
+
+class _CollectingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class LoggingPipelineTestCase(SimpleTestCase):
+    def make_record(self, msg='message %s', args=('arg',), **extra):
+        record = logging.LogRecord(
+            'reservations.views', logging.DEBUG, __file__, 1, msg, args, None)
+        for key, value in extra.items():
+            setattr(record, key, value)
+        return record
+
+    def test_json_formatter_includes_extra_fields(self):
+        """
+        JSON 포맷터가 메시지 인자와 extra 필드, correlation ID를 함께 기록하는지 확인
+        """
+        record = self.make_record(event='cache_hit', request_id='abc')
+        payload = json.loads(JsonFormatter().format(record))
+
+        self.assertEqual(payload['message'], 'message arg')
+        self.assertEqual(payload['event'], 'cache_hit')
+        self.assertEqual(payload['request_id'], 'abc')
+        self.assertEqual(payload['level'], 'DEBUG')
+
+    def test_request_id_filter_uses_context(self):
+        """
+        현재 컨텍스트의 correlation ID가 레코드에 추가되는지 확인
+        """
+        token = request_id_var.set('req-1')
+        try:
+            record = self.make_record()
+            RequestIdFilter().filter(record)
+        finally:
+            request_id_var.reset(token)
+
+        self.assertEqual(record.request_id, 'req-1')
+
+    def test_sampling_filter_drops_sampled_events_only(self):
+        """
+        샘플링 비율이 0인 이벤트만 걸러지고, 다른 레코드는 통과하는지 확인
+        """
+        sampling = SamplingFilter(rates={'cache_hit': 0.0})
+
+        self.assertFalse(sampling.filter(self.make_record(event='cache_hit')))
+        self.assertTrue(sampling.filter(
+            self.make_record(event='cache_invalidate')))
+        self.assertTrue(sampling.filter(self.make_record()))
+
+    def test_queue_handler_emits_on_listener_thread(self):
+        """
+        큐 handler가 레코드를 listener 스레드의 대상 handler로 전달하는지 확인
+        """
+        target = _CollectingHandler()
+        handler = QueueListenerHandler(targets=[target])
+        handler.handle(self.make_record())
+        handler.close()
+
+        self.assertEqual(len(target.records), 1)
+        self.assertEqual(target.records[0].getMessage(), 'message arg')
+        # atexit에서 다시 닫아도 listener를 두 번 멈추지 않는다.
+        handler.close()
+
+
+class RequestIdMiddlewareTestCase(TestCase):
+    def test_generates_request_id(self):
+        """
+        요청 ID가 없으면 새로 생성하여 응답 헤더에 포함하는지 확인
+        """
+        response = self.client.get(reverse('token_refresh'))
+        self.assertTrue(response['X-Request-ID'])
+
+    def test_echoes_client_request_id(self):
+        """
+        클라이언트가 보낸 요청 ID를 그대로 사용하는지 확인
+        """
+        response = self.client.get(
+            reverse('token_refresh'), headers={'X-Request-ID': 'client-id-1'})
+        self.assertEqual(response['X-Request-ID'], 'client-id-1')
+
+    def test_runs_without_thread_under_asgi(self):
+        """
+        ASGI 요청에서 스레드로 옮기지 않고 요청 ID를 설정하는지 확인
+        """
+        seen = {}
+
+        async def get_response(request):
+            seen['request_id'] = request_id_var.get()
+            return HttpResponse()
+
+        middleware = RequestIdMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        request = RequestFactory().get('/', headers={'X-Request-ID': 'client-id-2'})
+        response = async_to_sync(middleware)(request)
+
+        self.assertEqual(seen['request_id'], 'client-id-2')
+        self.assertEqual(response['X-Request-ID'], 'client-id-2')
+        self.assertEqual(request_id_var.get(), '-')
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class PrimaryReplicaRouterTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.customer = Customer.objects.create_user(
+            company_name="programmers",
+            password="programmers123",
+        )
+
+    def test_reads_go_to_primary_by_default(self):
+        """
+        별도 지정이 없으면 조회와 쓰기 모두 primary로 가는지 확인
+        """
+        self.assertEqual(router.db_for_read(Reservation), 'default')
+        self.assertEqual(router.db_for_write(Reservation), 'default')
+
+    def test_reads_go_to_replica_inside_context(self):
+        """
+        read_from_replica 안의 조회는 replica로, 쓰기는 primary로 가는지 확인
+        """
+        with read_from_replica():
+            self.assertEqual(router.db_for_read(Reservation), 'replica')
+            self.assertEqual(router.db_for_write(Reservation), 'default')
+        self.assertEqual(router.db_for_read(Reservation), 'default')
+
+    def test_capacity_check_reads_primary(self):
+        """
+        replica 조회 중에도 수용 인원 검사는 primary에서 읽는지 확인
+        (테스트 환경에는 replica 연결이 없으므로, replica를 사용하면 예외가 발생합니다.)
+        """
+        with read_from_replica():
+            total = Reservation.confirmed_num_of_participants_in_time_range(
+                datetime.date.today(), datetime.time(9), datetime.time(10))
+        self.assertEqual(total, 0)
+
+    def test_list_reads_from_replica(self):
+        """
+        예약 목록 조회가 replica에서 처리되는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        with patch('examscheduler.routers.random.choice', return_value='default') as mock_choice:
+            response = self.client.get(reverse('reservations'))
+
+        self.assertEqual(response.status_code, 200)
+        mock_choice.assert_called_with(['replica'])
+
+    def test_cached_slots_are_computed_on_primary(self):
+        """
+        replica 조회 중에도 모든 고객이 읽는 예약 가능 시간 캐시는 primary에서 계산하는지 확인
+        (테스트 환경에는 replica 연결이 없으므로, replica를 사용하면 예외가 발생합니다.)
+        """
+        date = datetime.date.today() + datetime.timedelta(days=5)
+        with read_from_replica(), patch('examscheduler.routers.random.choice') as mock_choice:
+            slots = get_cached_available_slots(date)
+
+        mock_choice.assert_not_called()
+        self.assertEqual(cache.get(f"available_slots:{date}"), slots)
+
+    def test_write_pins_customer_to_primary(self):
+        """
+        쓰기 직후에는 고객의 조회가 primary로 고정되는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        pin_to_primary(self.customer)
+        self.assertTrue(is_pinned_to_primary(self.customer))
+
+        with patch('examscheduler.routers.random.choice') as mock_choice:
+            response = self.client.get(reverse('reservations'))
+
+        self.assertEqual(response.status_code, 200)
+        mock_choice.assert_not_called()
+
+    def test_successful_write_sets_pin(self):
+        """
+        성공한 쓰기 요청 이후 고객이 primary에 고정되는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        data = {
+            "title": "테스트 시험",
+            "date": (datetime.date.today() + datetime.timedelta(days=5)).isoformat(),
+            "start_time": "09:00:00",
+            "end_time": "10:00:00",
+            "num_of_participants": 10,
+        }
+        response = self.client.post(reverse('reservations'), data, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(is_pinned_to_primary(self.customer))
+
+
+class TestSettingsTestCase(APITestCase):
+    def test_caches_and_throttles_are_isolated(self):
+        """
+        테스트 base class가 실행기와 관계없이 프로세스 메모리 캐시를 사용하고 빈도 제한을 끄는지 확인
+        """
+        for alias in settings.CACHES:
+            with self.subTest(alias=alias):
+                self.assertEqual(
+                    caches[alias].__class__.__module__, 'django.core.cache.backends.locmem')
+        self.assertIsNone(ScopedBucketThrottle().THROTTLE_RATES['writes'])
+
+
+class ThrottlingTestCase(APITestCase):
+    THROTTLE_RATES = {'slots': '2/m', 'writes': '1/m', 'login': '2/m'}
+
+    def setUp(self):
+        caches['throttle'].clear()
+        self.customer = Customer.objects.create_user(
+            company_name="programmers",
+            password="programmers123",
+        )
+        self.other_customer = Customer.objects.create_user(
+            company_name="grepp",
+            password="grepp123",
+        )
+        self.slots_url = reverse('reservation-available-slots') + \
+            f"?date={(datetime.date.today() + datetime.timedelta(days=5)).isoformat()}"
+
+        patcher = patch.object(BucketRateThrottle, 'THROTTLE_RATES', self.THROTTLE_RATES)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_slots_throttled_per_customer(self):
+        """
+        예약 가능 시간 조회가 고객별로 제한되고, Retry-After 헤더를 반환하는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        for _ in range(2):
+            self.assertEqual(self.client.get(self.slots_url).status_code, 200)
+
+        response = self.client.get(self.slots_url)
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+
+        self.client.force_authenticate(self.other_customer)
+        self.assertEqual(self.client.get(self.slots_url).status_code, 200)
+
+    def test_writes_throttled_but_reads_allowed(self):
+        """
+        쓰기 요청만 'writes' 빈도로 제한되는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        data = {
+            "title": "테스트 시험",
+            "date": (datetime.date.today() + datetime.timedelta(days=5)).isoformat(),
+            "start_time": "09:00:00",
+            "end_time": "10:00:00",
+            "num_of_participants": 10,
+        }
+        self.assertEqual(self.client.post(reverse('reservations'), data, format='json').status_code, 201)
+        self.assertEqual(self.client.post(reverse('reservations'), data, format='json').status_code, 429)
+        self.assertEqual(self.client.get(reverse('reservations')).status_code, 200)
+
+    def test_login_throttled_per_ip(self):
+        """
+        로그인 시도가 IP별로 제한되는지 확인
+        """
+        url = reverse('token_obtain_pair')
+        for _ in range(2):
+            response = self.client.post(url, {'company_name': 'programmers', 'password': 'wrong'})
+            self.assertEqual(response.status_code, 401)
+
+        response = self.client.post(url, {'company_name': 'programmers', 'password': 'programmers123'})
+        self.assertEqual(response.status_code, 429)
+
+        response = self.client.post(url, {'company_name': 'programmers', 'password': 'programmers123'},
+                                    REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, 200)
+
+    def test_previous_window_decays(self):
+        """
+        이전 윈도의 요청이 시간이 지남에 따라 소진되어 다시 허용되는지 확인
+        (2/m 제한, 600초에 2번 요청 후 680초에는 거절되고 690초에는 허용)
+        """
+        self.client.force_authenticate(self.customer)
+        with patch.object(BucketRateThrottle, 'timer', return_value=600.0):
+            for _ in range(2):
+                self.assertEqual(self.client.get(self.slots_url).status_code, 200)
+            response = self.client.get(self.slots_url)
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response['Retry-After'], '90')
+
+        with patch.object(BucketRateThrottle, 'timer', return_value=680.0):
+            self.assertEqual(self.client.get(self.slots_url).status_code, 429)
+
+        with patch.object(BucketRateThrottle, 'timer', return_value=690.0):
+            self.assertEqual(self.client.get(self.slots_url).status_code, 200)
@@ -0,0 +1,110 @@
+import math
+
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class BucketRateThrottle(SimpleRateThrottle):
+    """
+    캐시의 원자적 증가(incr)로 구현한 throttle
+
+    DRF 기본 throttle처럼 요청 시각 목록을 캐시에 읽고 쓰지 않고, 고정 윈도 단위의 카운터
+    두 개(이전/현재 윈도)로 지속적으로 충전되는 토큰 버킷을 근사합니다.
+    이전 윈도의 요청 수는 현재 윈도에서 지난 비율만큼 소진된 것으로 보고,
+    `이전 윈도 요청 수 x 남은 비율 + 현재 윈도 요청 수`가 허용량을 넘으면 요청을 거절합니다.
+    고객별로 식별하며, 로그인하지 않은 요청은 IP로 식별합니다.
+    """
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+
+    # DRF는 캐시와 빈도를 import할 때 읽으므로, 설정이 바뀌어도(테스트의 override_settings 등) 반영되도록 요청마다 읽는다.
+    @property
+    def cache(self):
+        return caches['throttle']
+
+    @property
+    def THROTTLE_RATES(self):
+        return api_settings.DEFAULT_THROTTLE_RATES
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f"user:{request.user.pk}"
+        else:
+            ident = f"ip:{self.get_ident(request)}"
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def _window(self) -> tuple[int, float]:
+        index, offset = divmod(self.now, self.duration)
+        return int(index), offset / self.duration
+
+    def _incr(self, key: str) -> int:
+        # 윈도가 끝난 뒤에도 다음 윈도에서 이전 윈도로 참조되므로 두 윈도 동안 보관한다.
+        self.cache.add(key, 0, timeout=self.duration * 2)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # add와 incr 사이에 키가 만료된 경우
+            self.cache.set(key, 1, timeout=self.duration * 2)
+            return 1
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        index, elapsed = self._window()
+        self.previous = self.cache.get(f"{self.key}:{index - 1}", 0)
+        self.current = self._incr(f"{self.key}:{index}")
+
+        if self.previous * (1 - elapsed) + self.current > self.num_requests:
+            # 거절된 요청은 허용량을 소비하지 않는다.
+            self.current = self.cache.decr(f"{self.key}:{index}")
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """요청이 다시 허용될 때까지 남은 시간(초)을 반환합니다. `Retry-After` 헤더에 사용됩니다."""
+        index, elapsed = self._window()
+        if self.current >= self.num_requests:
+            # 현재 윈도가 가득 찼으므로, 다음 윈도에서 이 윈도의 요청이 충분히 소진될 때까지 기다린다.
+            needed = 1 + max(1 - (self.num_requests - 1) / self.current, 0)
+        else:
+            # 이전 윈도의 요청이 충분히 소진될 때까지 기다린다.
+            needed = 1 - (self.num_requests - self.current - 1) / self.previous
+        return max(math.ceil((needed - elapsed) * self.duration), 1)
+
+
+class ScopedBucketThrottle(BucketRateThrottle):
+    """view의 `throttle_scope`에 해당하는 빈도 제한을 적용합니다. scope가 없는 view는 제한하지 않습니다."""
+    scope_attr = 'throttle_scope'
+
+    def __init__(self):
+        # scope는 view를 알아야 정할 수 있으므로 allow_request에서 빈도를 읽는다.
+        pass
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+
+class WriteBucketThrottle(BucketRateThrottle):
+    """로그인한 고객의 쓰기(POST, PUT, PATCH, DELETE) 요청에 'writes' 빈도 제한을 적용합니다."""
+    scope = 'writes'
+
+    def allow_request(self, request, view):
+        if request.method in SAFE_METHODS or not request.user.is_authenticated:
+            return True
+        return super().allow_request(request, view)
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "examscheduler.settings")
 
 application = get_wsgi_application()
+
+# 예약 가능 시간 캐시 미리 저장 (AVAILABLE_SLOTS_WARM_INTERVAL). 앱이 준비된 뒤 서버 프로세스에서만 시작한다.
+from reservations.warming import start_configured_warm_scheduler  # noqa: E402
+
+start_configured_warm_scheduler()
@@ -1,14 +1,136 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.db import transaction
 
-from reservations.models import Reservation
+from customers.models import Customer
+from reservations.models import OutboxEvent, OutboxEventType, Reservation, ReservationArchive, ReservationStatus
+from reservations.outbox import build_event, record_event
+from reservations.serializers import OCCUPANCY_FIELDS
+from reservations.services import confirm_reservations, release_reservation_holds
+
+
+class CustomerAutocompleteFilter(admin.SimpleListFilter):
+    """
+    고객 목록 전체를 사이드바에 그리지 않고, 자동 완성으로 고객을 골라 필터링합니다.
+    """
+    title = '고객'
+    parameter_name = 'customer'
+    template = 'admin/reservations/customer_autocomplete_filter.html'
+    app_label = 'reservations'
+    model_name = 'reservation'
+    field_name = 'customer'
+
+    def __init__(self, request, params, model, model_admin):
+        super().__init__(request, params, model, model_admin)
+        self.customer = None
+        if self.value():
+            try:
+                self.customer = Customer.objects.filter(pk=self.value()).first()
+            except ValueError:
+                pass
+
+    def has_output(self):
+        return True
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def choices(self, changelist):
+        yield {
+            'selected': self.value() is None,
+            'query_string': changelist.get_query_string(remove=[self.parameter_name]),
+            'display': '전체',
+        }
+
+    def queryset(self, request, queryset):
+        if self.customer is None:
+            return queryset if self.value() is None else queryset.none()
+        return queryset.filter(customer=self.customer)
 
 
 class ReservationAdmin(admin.ModelAdmin):
     list_display = ['title', 'date', 'start_time',
                     'end_time', 'customer', 'status']
-    list_filter = ('customer', 'date', 'status')
-    search_fields = ('customer', 'date', 'status')
+    list_filter = (CustomerAutocompleteFilter, 'status')
+    list_select_related = ('customer',)
+    # 회사명은 정확히 일치하는 값으로, 제목은 앞부분으로 검색하여 인덱스를 사용한다.
+    search_fields = ('=customer__company_name', 'title__startswith')
+    autocomplete_fields = ('customer',)
+    date_hierarchy = 'date'
     ordering = ('-date', 'start_time')
+    # 페이지마다 전체 예약 수를 세지 않는다.
+    show_full_result_count = False
+    actions = ['confirm_selected']
+
+    @property
+    def media(self):
+        # 고객 필터가 자동 완성 위젯의 script를 사용한다.
+        widget = AutocompleteSelect(Reservation._meta.get_field('customer'), self.admin_site)
+        return super().media + widget.media
+
+    # 어드민에서 바꾼 예약도 API와 같이 같은 트랜잭션에서 outbox에 이벤트를 남긴다.
+    # 확정 대기중이 아니게 되거나 시간/인원이 바뀐 예약은 만들 때 사용한 hold를 돌려준다.
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            record_event(OutboxEventType.UPDATED if change else OutboxEventType.CREATED, obj)
+            if change and (obj.status != ReservationStatus.PENDING or set(form.changed_data) & set(OCCUPANCY_FIELDS)):
+                release_reservation_holds(obj.id)
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            record_event(OutboxEventType.DELETED, obj)
+            release_reservation_holds(obj.id)
+            super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            reservations = list(queryset)
+            OutboxEvent.objects.bulk_create([
+                build_event(OutboxEventType.DELETED, reservation) for reservation in reservations
+            ])
+            release_reservation_holds(*(reservation.id for reservation in reservations))
+            super().delete_queryset(request, queryset)
+
+    @admin.action(description='선택된 예약 확정', permissions=['change'])
+    def confirm_selected(self, request, queryset):
+        result = confirm_reservations(queryset)
+        self.message_user(request, f"예약 {len(result.confirmed)}건을 확정했습니다.", messages.SUCCESS)
+        if result.rejected:
+            titles = ', '.join(reservation.title for reservation, _ in result.rejected[:10])
+            self.message_user(
+                request,
+                f"수용 인원을 초과하여 예약 {len(result.rejected)}건을 확정하지 못했습니다. ({titles})",
+                messages.WARNING)
+        if result.conflicted:
+            titles = ', '.join(reservation.title for reservation in result.conflicted[:10])
+            self.message_user(
+                request,
+                f"다른 요청에 의해 먼저 변경되어 예약 {len(result.conflicted)}건을 확정하지 못했습니다. ({titles})",
+                messages.WARNING)
 
 
 admin.site.register(Reservation, ReservationAdmin)
+
+
+class ReservationArchiveAdmin(admin.ModelAdmin):
+    """
+    보관된 예약은 조회만 가능합니다.
+    """
+    list_display = ['title', 'date', 'start_time',
+                    'end_time', 'customer', 'status', 'archived_at']
+    list_filter = ('status',)
+    list_select_related = ('customer',)
+    search_fields = ('=customer__company_name',)
+    date_hierarchy = 'date'
+    ordering = ('-date', 'start_time')
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+admin.site.register(ReservationArchive, ReservationArchiveAdmin)
@@ -0,0 +1,80 @@
+import datetime
+import logging
+
+from django.db import connection, transaction
+
+from reservations.etags import touch_reservation_lists
+from reservations.models import Reservation, ReservationArchive
+
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_FIELDS = [
+    'id', 'title', 'date', 'start_time', 'end_time', 'customer_id',
+    'num_of_participants', 'status', 'created_at', 'updated_at',
+]
+
+
+def _month_range(date: datetime.date) -> tuple[datetime.date, datetime.date]:
+    start = date.replace(day=1)
+    end = (start + datetime.timedelta(days=32)).replace(day=1)
+    return start, end
+
+
+def ensure_archive_partitions(dates) -> None:
+    """보관할 날짜들이 속한 월별 파티션을 생성합니다. PostgreSQL이 아니면 아무것도 하지 않습니다.
+
+    Args:
+        dates (Iterable[datetime.date]): 보관할 예약들의 날짜
+    """
+    if connection.vendor != 'postgresql':
+        return
+
+    table = ReservationArchive._meta.db_table
+    with connection.cursor() as cursor:
+        for start, end in sorted({_month_range(date) for date in dates}):
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS "{table}_y{start:%Y}m{start:%m}" '
+                f'PARTITION OF "{table}" FOR VALUES FROM (%s) TO (%s)',
+                [start, end],
+            )
+
+
+def archive_reservations(before: datetime.date, batch_size: int = 1000) -> int:
+    """`before` 이전 날짜의 예약을 배치 단위로 보관 테이블로 옮깁니다.
+
+    배치마다 별도의 트랜잭션에서 복사와 삭제를 수행하므로, 예약 테이블의 잠금은 짧게 유지됩니다.
+    보관한 예약은 보관 테이블에 남아 있으므로 삭제 기록(변경 피드)과 outbox 이벤트를 남기지 않습니다.
+
+    Args:
+        before (datetime.date): 이 날짜 이전(미포함)의 예약을 옮깁니다.
+        batch_size (int): 한 트랜잭션에서 옮길 예약 수
+
+    Returns:
+        int: 옮긴 예약 수
+    """
+    moved = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                Reservation.objects
+                .filter(date__lt=before)
+                .order_by('date', 'start_time')
+                .select_for_update(skip_locked=True)
+                .values(*ARCHIVED_FIELDS)[:batch_size]
+            )
+            if not rows:
+                break
+
+            ensure_archive_partitions(row['date'] for row in rows)
+            ReservationArchive.objects.bulk_create(
+                [ReservationArchive(**row) for row in rows])
+            # 행마다 삭제 signal(삭제 기록)을 보내는 collector를 거치지 않고 바로 삭제한다.
+            query = Reservation.objects.filter(id__in=[row['id'] for row in rows])
+            query._raw_delete(query.db)
+            touch_reservation_lists(*{row['customer_id'] for row in rows})
+
+        moved += len(rows)
+        logger.info("archived %s reservations before %s", moved, before)
+
+    return moved
@@ -0,0 +1,167 @@
+import asyncio
+import datetime
+import logging
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from reservations.etags import touch_available_slots
+from reservations.utils import compute_available_slots
+
+
+logger = logging.getLogger(__name__)
+
+
+class LocalPubSub:
+    """
+    같은 프로세스 안에서만 메시지를 전달하는 pub/sub
+
+    worker가 하나일 때 사용하는 기본 backend입니다. 여러 worker로 운영할 때는 같은 인터페이스
+    (`subscribe(callback)`, `publish(message)`)로 Redis pub/sub 등을 감싼 backend를
+    SLOT_BROADCAST_BACKEND에 지정하여, 한 worker에서 발행한 변경이 모든 worker에 전달되도록 합니다.
+    """
+
+    def __init__(self):
+        self._callbacks = []
+
+    def subscribe(self, callback):
+        self._callbacks.append(callback)
+
+    def publish(self, message: str):
+        for callback in list(self._callbacks):
+            callback(message)
+
+
+def _put_latest(queue: asyncio.Queue, slots: list[dict]):
+    # 구독자가 아직 가져가지 않은 이전 슬롯은 최신 슬롯으로 대체한다.
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(slots)
+
+
+class SlotBroadcaster:
+    """
+    날짜별 예약 가능 시간 변경을 구독자(SSE 연결)에게 전달하는 broadcaster
+
+    worker마다 하나씩 사용합니다. 변경 알림을 받으면 구독자가 있는 날짜에 대해서만
+    슬롯을 한 번 계산하고, 그 결과를 같은 날짜의 모든 구독자 queue에 넣습니다.
+    슬롯은 변경을 발행한 쓰기 요청이 아니라 구독자의 event loop에서 계산하며, 계산을 기다리는 동안
+    같은 날짜의 알림이 더 오면 한 번만 계산합니다. 구독자는 queue를 기다리는 동안 CPU를 사용하지 않습니다.
+    """
+
+    def __init__(self, backend):
+        self._lock = threading.Lock()
+        self._subscribers: dict[datetime.date, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._pending: set[datetime.date] = set()
+        self.backend = backend
+        self.backend.subscribe(self._on_message)
+
+    def subscribe(self, date: datetime.date) -> asyncio.Queue:
+        """현재 event loop에서 날짜의 변경을 받을 queue를 등록합니다."""
+        queue = asyncio.Queue(maxsize=1)
+        with self._lock:
+            self._subscribers.setdefault(date, set()).add(
+                (asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, date: datetime.date, queue: asyncio.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(date, set())
+            subscribers.difference_update(
+                {subscriber for subscriber in subscribers if subscriber[1] is queue})
+            if not subscribers:
+                self._subscribers.pop(date, None)
+
+    def subscriber_count(self, date: datetime.date) -> int:
+        with self._lock:
+            return len(self._subscribers.get(date, ()))
+
+    def publish(self, date: datetime.date):
+        """날짜의 예약 가능 시간이 바뀌었음을 모든 worker에 알립니다."""
+        self.backend.publish(date.isoformat())
+
+    def _on_message(self, message: str):
+        date = datetime.date.fromisoformat(message)
+        with self._lock:
+            subscribers = list(self._subscribers.get(date, ()))
+            if not subscribers or date in self._pending:
+                return
+            self._pending.add(date)
+
+        for loop, queue in subscribers:
+            try:
+                asyncio.run_coroutine_threadsafe(self._broadcast(date), loop)
+                return
+            except RuntimeError:
+                # 연결이 끊겨 event loop가 이미 닫힌 경우
+                self.unsubscribe(date, queue)
+        with self._lock:
+            self._pending.discard(date)
+
+    async def _broadcast(self, date: datetime.date):
+        with self._lock:
+            # 계산을 시작한 뒤에 온 알림은 다시 계산해야 한다.
+            self._pending.discard(date)
+        try:
+            slots = await sync_to_async(compute_available_slots)(date)
+        except Exception:
+            logger.exception("failed to compute slots for date %s", date, extra={'event': 'slots_broadcast'})
+            return
+
+        with self._lock:
+            subscribers = list(self._subscribers.get(date, ()))
+        logger.debug("broadcasting slots for date %s to %s subscribers",
+                     date, len(subscribers), extra={'event': 'slots_broadcast'})
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_put_latest, queue, slots)
+            except RuntimeError:
+                # 연결이 끊겨 event loop가 이미 닫힌 경우
+                self.unsubscribe(date, queue)
+
+
+_broadcaster = None
+_broadcaster_lock = threading.Lock()
+
+
+def get_broadcaster() -> SlotBroadcaster:
+    """이 worker의 broadcaster를 반환합니다."""
+    global _broadcaster
+    with _broadcaster_lock:
+        if _broadcaster is None:
+            backend = import_string(settings.SLOT_BROADCAST_BACKEND)()
+            _broadcaster = SlotBroadcaster(backend)
+        return _broadcaster
+
+
+def _notify(date: datetime.date):
+    # 이미 커밋된 쓰기 요청에서 실행되므로, 실패해도 요청을 실패시키거나 다른 날짜의 알림을 건너뛰지 않는다.
+    try:
+        # 변경을 받은 구독자가 다시 조회할 때 이전 ETag로 304를 받지 않도록 카운터를 먼저 올린다.
+        touch_available_slots(date)
+        get_broadcaster().publish(date)
+    except Exception:
+        logger.exception("failed to publish slots change for date %s", date, extra={'event': 'slots_broadcast'})
+
+
+def publish_slots_changed(*dates):
+    """트랜잭션이 커밋된 뒤 날짜들의 예약 가능 시간 변경을 알립니다.
+
+    Args:
+        *dates (datetime.date | str): 수용 인원이 바뀐 날짜. None은 무시합니다.
+    """
+    changed = set()
+    for date in dates:
+        if isinstance(date, str):
+            try:
+                date = datetime.date.fromisoformat(date)
+            except ValueError:
+                continue
+        if date:
+            changed.add(date)
+
+    for date in changed:
+        transaction.on_commit(lambda date=date: _notify(date))
@@ -0,0 +1,211 @@
+import datetime
+import heapq
+from collections import defaultdict, deque
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Sum
+from rest_framework import serializers
+
+from reservations.models import (
+    RESERVATION_CLOSING_HOUR, RESERVATION_NUM_OF_PARTICIPANTS_LIMIT, RESERVATION_OPENING_HOUR, Reservation,
+    ReservationHold, ReservationStatus, hourly_occupancy,
+)
+from reservations.serializers import validate_booking_time
+from reservations.utils import bookable_dates
+
+
+CAPACITY_EXCEEDED_MESSAGE = '예약 가능한 인원 수를 초과했습니다.'
+
+
+def confirmed_hourly_occupancy(dates, exclude_holds_of=None) -> dict[datetime.date, list[int]]:
+    """날짜들의 확정된 예약과 만료되지 않은 hold의 시간별 참가자 수를 한 번의 쿼리로 계산합니다.
+
+    같은 날짜/시간의 예약과 hold는 DB에서 묶어 읽고, 날짜마다 difference array로 누적합니다.
+    수용 인원 검사와 같이 replica 지연의 영향을 받지 않도록 primary에서 읽습니다.
+
+    Args:
+        dates (Iterable[datetime.date]): 조회할 날짜
+        exclude_holds_of (QuerySet[Reservation], optional): 확정한다고 가정할 예약.
+            이 예약들을 만들 때 사용한 hold는 예약과 함께 두 번 세지 않도록 빼고 셉니다.
+
+    Returns:
+        dict[datetime.date, list[int]]: 날짜별 0시부터 23시까지 각 시간의 참가자 수.
+            예약이 없는 날짜는 0으로 채워집니다.
+    """
+    dates = set(dates)
+    holds = ReservationHold.objects.active().filter(date__in=dates)
+    if exclude_holds_of is not None:
+        holds = holds.exclude(reservation__in=exclude_holds_of.values('id'))
+    rows_by_date = _rows_by_date(
+        Reservation.objects.filter(date__in=dates, status=ReservationStatus.CONFIRMED),
+        holds,
+    )
+    return {date: hourly_occupancy(rows_by_date[date]) for date in dates}
+
+
+def _rows_by_date(*querysets) -> dict[datetime.date, list[tuple]]:
+    """같은 날짜/시간의 예약(또는 hold)을 DB에서 묶어 날짜별 (시작 시간, 종료 시간, 참가자 수)로 읽습니다.
+
+    여러 queryset은 UNION ALL로 한 번의 쿼리에서 읽습니다.
+    """
+    rows_by_date = defaultdict(list)
+    grouped = [
+        queryset.using(DEFAULT_DB_ALIAS)
+        .values_list('date', 'start_time', 'end_time')
+        .annotate(Sum('num_of_participants'))
+        .order_by()
+        for queryset in querysets
+    ]
+    rows = grouped[0].union(*grouped[1:], all=True) if len(grouped) > 1 else grouped[0]
+    for date, *row in rows:
+        rows_by_date[date].append(row)
+    return rows_by_date
+
+
+def peak_occupancy(occupancy: list[int], start_time: datetime.time, end_time: datetime.time) -> int:
+    """시간 범위 안에서 참가자 수가 가장 많은 시간의 참가자 수를 반환합니다."""
+    return max(occupancy[start_time.hour:end_time.hour], default=0)
+
+
+def check_windows(windows: list[dict]) -> list[dict]:
+    """예약을 만들지 않고 시간 범위들의 예약 가능 여부를 확인합니다.
+
+    예약 생성과 같은 규칙(예약 가능 기간, 예약 가능 시간, 수용 인원)으로 확인하며,
+    수용 인원은 모든 날짜의 시간별 참가자 수를 한 번의 쿼리로 읽어 계산합니다.
+    시간 범위들은 서로 영향을 주지 않고 각각 확인합니다.
+
+    Args:
+        windows (list[dict]): date, start_time, end_time, num_of_participants를 가진 시간 범위
+
+    Returns:
+        list[dict]: 시간 범위마다 available, remaining(더 예약할 수 있는 인원 수), detail(예약할 수 없는 이유)을 더한 결과
+    """
+    valid = []
+    results = []
+    for window in windows:
+        result = {**window, 'available': False, 'remaining': None, 'detail': None}
+        try:
+            validate_booking_time(window['date'], window['start_time'], window['end_time'])
+        except serializers.ValidationError as err:
+            result['detail'] = str(err.detail[0])
+        else:
+            valid.append(result)
+        results.append(result)
+
+    occupancy = confirmed_hourly_occupancy(result['date'] for result in valid)
+    for result in valid:
+        result['remaining'] = max(0, RESERVATION_NUM_OF_PARTICIPANTS_LIMIT - peak_occupancy(
+            occupancy[result['date']], result['start_time'], result['end_time']))
+        result['available'] = result['num_of_participants'] <= result['remaining']
+        if not result['available']:
+            result['detail'] = CAPACITY_EXCEEDED_MESSAGE
+    return results
+
+
+def simulate_confirmations(reservations) -> list[dict]:
+    """예약들을 모두 확정한다고 가정했을 때 날짜별/시간별 참가자 수와 수용 인원 초과 여부를 계산합니다.
+
+    확정할 예약과 이미 확정된 예약을 각각 한 번의 쿼리로 읽어 날짜마다 difference array로 누적하므로,
+    예약마다 수용 인원을 조회하지 않습니다. 예약은 바꾸지 않습니다.
+
+    Args:
+        reservations (QuerySet[Reservation]): 확정할 예약. 확정 대기중인 예약만 더합니다.
+
+    Returns:
+        list[dict]: 날짜 순서로 date, overflow, hours. hours는 예약 가능 시간마다
+            hour, confirmed(확정된 예약과 hold의 참가자 수), proposed(확정할 참가자 수), occupancy(합계), overflow
+    """
+    proposed = reservations.filter(status=ReservationStatus.PENDING)
+    proposed_by_date = _rows_by_date(proposed)
+    confirmed_by_date = confirmed_hourly_occupancy(proposed_by_date, exclude_holds_of=proposed)
+
+    results = []
+    for date in sorted(proposed_by_date):
+        confirmed = confirmed_by_date[date]
+        proposed = hourly_occupancy(proposed_by_date[date])
+        hours = [
+            {
+                'hour': hour,
+                'confirmed': confirmed[hour],
+                'proposed': proposed[hour],
+                'occupancy': confirmed[hour] + proposed[hour],
+                'overflow': confirmed[hour] + proposed[hour] > RESERVATION_NUM_OF_PARTICIPANTS_LIMIT,
+            }
+            for hour in range(RESERVATION_OPENING_HOUR, RESERVATION_CLOSING_HOUR)
+        ]
+        results.append({'date': date, 'overflow': any(hour['overflow'] for hour in hours), 'hours': hours})
+    return results
+
+
+def sliding_window_min(values: list[int], width: int) -> list[int]:
+    """길이 `width`인 연속 구간마다 최솟값을 반환합니다.
+
+    구간의 최솟값 후보만 deque에 남겨 값마다 한 번씩만 넣고 빼므로 O(len(values))입니다.
+
+    Returns:
+        list[int]: i번째 값은 values[i:i + width]의 최솟값
+    """
+    minimums = []
+    candidates = deque()
+    for index, value in enumerate(values):
+        while candidates and values[candidates[-1]] >= value:
+            candidates.pop()
+        candidates.append(index)
+        if candidates[0] <= index - width:
+            candidates.popleft()
+        if index >= width - 1:
+            minimums.append(values[candidates[0]])
+    return minimums
+
+
+def suggest_windows(
+    num_of_participants: int,
+    hours: int,
+    limit: int,
+    preferred: datetime.datetime | None = None,
+    today: datetime.date | None = None,
+) -> list[dict]:
+    """예약 가능 기간 전체에서 `num_of_participants`명이 `hours`시간 동안 예약할 수 있는 시간 범위를 찾습니다.
+
+    모든 날짜의 시간별 참가자 수를 한 번의 쿼리로 읽고, 날짜마다 남은 인원의 sliding window 최솟값으로
+    시간 범위 안에서 가장 붐비는 시간의 남은 인원을 구합니다.
+
+    Args:
+        num_of_participants (int): 참가자 수
+        hours (int): 예약 시간 (시간 단위)
+        limit (int): 반환할 최대 시간 범위 수
+        preferred (datetime.datetime, optional): 원하는 시작 일시. 지정하면 가까운 순서로, 없으면 이른 순서로 반환합니다.
+        today (datetime.date, optional): 기준 날짜. 기본값은 오늘입니다.
+
+    Returns:
+        list[dict]: date, start_time, end_time, remaining(시간 범위 안에서 더 예약할 수 있는 인원 수)
+    """
+    dates = bookable_dates(today)
+    occupancy = confirmed_hourly_occupancy(dates)
+
+    candidates = []
+    for date in dates:
+        remaining = [
+            RESERVATION_NUM_OF_PARTICIPANTS_LIMIT - occupancy[date][hour]
+            for hour in range(RESERVATION_OPENING_HOUR, RESERVATION_CLOSING_HOUR)
+        ]
+        for offset, minimum in enumerate(sliding_window_min(remaining, hours)):
+            if minimum >= num_of_participants:
+                start = datetime.datetime.combine(date, datetime.time(RESERVATION_OPENING_HOUR + offset))
+                candidates.append((start, minimum))
+
+    def distance(candidate):
+        start = candidate[0]
+        if preferred is None:
+            return (start,)
+        return (abs(start - preferred), start)
+
+    return [
+        {
+            'date': start.date(),
+            'start_time': start.time(),
+            'end_time': (start + datetime.timedelta(hours=hours)).time(),
+            'remaining': remaining,
+        }
+        for start, remaining in heapq.nsmallest(limit, candidates, key=distance)
+    ]
@@ -0,0 +1,124 @@
+import base64
+import binascii
+import datetime
+import heapq
+import uuid
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from reservations.models import Reservation, ReservationTombstone
+
+
+CHANGE_CREATED = 'created'
+CHANGE_UPDATED = 'updated'
+CHANGE_DELETED = 'deleted'
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class ExpiredCursor(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Cursor:
+    changed_at: datetime.datetime
+    id: uuid.UUID
+
+    def encode(self) -> str:
+        raw = f"{self.changed_at.isoformat()}|{self.id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @classmethod
+    def decode(cls, value: str) -> 'Cursor':
+        try:
+            raw = base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)).decode()
+            changed_at, id = raw.split('|')
+            cursor = cls(datetime.datetime.fromisoformat(changed_at), uuid.UUID(id))
+        except (binascii.Error, UnicodeDecodeError, ValueError) as err:
+            raise InvalidCursor(value) from err
+        if cursor.changed_at.tzinfo is None:
+            raise InvalidCursor(value)
+        return cursor
+
+
+@dataclass(frozen=True)
+class Change:
+    type: str
+    id: uuid.UUID
+    changed_at: datetime.datetime
+    reservation: Reservation | None = None
+
+    @property
+    def cursor(self) -> Cursor:
+        return Cursor(self.changed_at, self.id)
+
+
+def _after(cursor: Cursor | None, time_field: str, id_field: str) -> Q:
+    if cursor is None:
+        return Q()
+    return (
+        Q(**{f"{time_field}__gt": cursor.changed_at}) |
+        Q(**{time_field: cursor.changed_at, f"{id_field}__gt": cursor.id})
+    )
+
+
+def fetch_changes(customer, cursor: Cursor | None, limit: int) -> tuple[list[Change], bool]:
+    """`cursor` 이후에 생성/수정/삭제된 예약을 (변경 시각, id) 순서로 반환합니다.
+
+    아직 커밋되지 않은 트랜잭션의 변경을 건너뛰지 않도록, RESERVATION_CHANGES_LAG_SECONDS보다
+    최근의 변경은 다음 조회에서 반환합니다.
+
+    Args:
+        customer (Customer): 조회하는 고객. 어드민이 아니면 자신의 예약만 반환합니다.
+        cursor (Cursor, optional): 마지막으로 받은 변경의 cursor. 없으면 처음부터 반환합니다.
+        limit (int): 반환할 최대 변경 수
+
+    Returns:
+        tuple[list[Change], bool]: 변경 목록과 더 가져올 변경이 있는지 여부
+
+    Raises:
+        ExpiredCursor: 삭제 기록이 정리된 시점보다 오래된 cursor인 경우
+    """
+    now = timezone.now()
+    horizon = now - datetime.timedelta(days=settings.RESERVATION_TOMBSTONE_RETENTION_DAYS)
+    if cursor is not None and cursor.changed_at < horizon:
+        raise ExpiredCursor(cursor)
+    until = now - datetime.timedelta(seconds=settings.RESERVATION_CHANGES_LAG_SECONDS)
+
+    reservations = Reservation.objects.select_related('customer').filter(
+        _after(cursor, 'updated_at', 'id'), updated_at__lte=until)
+    tombstones = ReservationTombstone.objects.filter(
+        _after(cursor, 'deleted_at', 'reservation_id'), deleted_at__lte=until)
+    if not customer.is_admin:
+        reservations = reservations.filter(customer=customer)
+        tombstones = tombstones.filter(customer=customer)
+
+    updated = (
+        Change(
+            CHANGE_CREATED if cursor is None or reservation.created_at > cursor.changed_at else CHANGE_UPDATED,
+            reservation.id, reservation.updated_at, reservation)
+        for reservation in reservations.order_by('updated_at', 'id')[:limit + 1]
+    )
+    deleted = (
+        Change(CHANGE_DELETED, tombstone.reservation_id, tombstone.deleted_at)
+        for tombstone in tombstones.order_by('deleted_at', 'reservation_id')[:limit + 1]
+    )
+    changes = list(heapq.merge(updated, deleted, key=lambda change: (change.changed_at, change.id)))
+    return changes[:limit], len(changes) > limit
+
+
+def prune_tombstones() -> int:
+    """RESERVATION_TOMBSTONE_RETENTION_DAYS보다 오래된 삭제 기록을 정리합니다.
+
+    Returns:
+        int: 정리한 삭제 기록 수
+    """
+    horizon = timezone.now() - datetime.timedelta(days=settings.RESERVATION_TOMBSTONE_RETENTION_DAYS)
+    deleted, _ = ReservationTombstone.objects.filter(deleted_at__lt=horizon).delete()
+    return deleted
@@ -0,0 +1,120 @@
+import datetime
+import time
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from examscheduler.routers import read_from_primary
+from reservations.models import ChangeCounter
+
+
+# 예약 목록과 예약 가능 시간은 응답마다 DB에서 version을 모으지 않고, 변경될 때마다 올리는 카운터로 ETag를 만든다.
+# 동시에 커밋된 변경이 같은 값을 쓰지 않도록 카운터는 DB에서 원자적으로 올리고, replica보다 앞서야 하므로 primary에서 읽는다.
+
+ALL_RESERVATIONS = 'all'
+
+
+def _initial_value() -> int:
+    # 카운터 행이 지워졌다가 다시 만들어져도 이전에 발급한 ETag와 겹치지 않도록 현재 시각(ms)에서 시작한다.
+    return time.time_ns() // 1_000_000
+
+
+def _read(key: str) -> int:
+    try:
+        with read_from_primary():
+            return ChangeCounter.objects.values_list('value', flat=True).get(key=key)
+    except ChangeCounter.DoesNotExist:
+        return ChangeCounter.objects.get_or_create(key=key, defaults={'value': _initial_value()})[0].value
+
+
+def _bump(keys):
+    keys = set(keys)
+    updated = ChangeCounter.objects.filter(key__in=keys).update(value=F('value') + 1)
+    if updated < len(keys):
+        # 아직 읽지 않은 카운터는 발급한 ETag가 없으므로 만들기만 한다.
+        ChangeCounter.objects.bulk_create(
+            [ChangeCounter(key=key, value=_initial_value()) for key in keys], ignore_conflicts=True)
+
+
+def _reservation_list_key(scope) -> str:
+    return f"reservation_list:{scope}"
+
+
+def _available_slots_key(date: datetime.date) -> str:
+    return f"available_slots:{date}"
+
+
+def touch_reservation_lists(*customer_ids):
+    """트랜잭션이 커밋된 뒤 고객들의 예약 목록과 어드민의 전체 예약 목록 ETag를 바꿉니다.
+
+    커밋 전에 카운터를 올리면 아직 이전 데이터를 읽는 조회가 새 ETag를 받을 수 있으므로 커밋 뒤에 올립니다.
+
+    Args:
+        *customer_ids (int): 예약이 바뀐 고객의 ID
+    """
+    keys = [_reservation_list_key(ALL_RESERVATIONS)]
+    keys += [_reservation_list_key(customer_id) for customer_id in set(customer_ids)]
+    transaction.on_commit(lambda: _bump(keys))
+
+
+def touch_available_slots(*dates: datetime.date):
+    """날짜들의 예약 가능 시간 ETag를 바꿉니다. 커밋된 뒤에 호출해야 합니다."""
+    _bump([_available_slots_key(date) for date in dates])
+
+
+def available_slots_versions(dates) -> dict:
+    """날짜별 예약 가능 시간 ETag 카운터를 반환합니다.
+
+    예약 가능 시간을 계산하기 전후로 비교하면, 계산하는 동안 캐시가 비워진 날짜를 알 수 있습니다.
+    """
+    keys = {_available_slots_key(date): date for date in dates}
+    with read_from_primary():
+        values = dict(ChangeCounter.objects.filter(key__in=list(keys)).values_list('key', 'value'))
+    missing = [key for key in keys if key not in values]
+    if missing:
+        ChangeCounter.objects.bulk_create(
+            [ChangeCounter(key=key, value=_initial_value()) for key in missing], ignore_conflicts=True)
+        with read_from_primary():
+            values.update(ChangeCounter.objects.filter(key__in=missing).values_list('key', 'value'))
+    return {date: values[_available_slots_key(date)] for date in dates}
+
+
+def expire_available_slots_at(expirations: dict):
+    """날짜별로 예약 가능 시간에 반영한 hold가 처음 만료되는 시각을 기록합니다.
+
+    hold는 만료될 때 변경을 알리지 않으므로, 기록한 시각이 지난 뒤 조회할 때 알립니다. (pop_expired_hold 참고)
+
+    Args:
+        expirations (dict[datetime.date, datetime.datetime]): 날짜별 hold 만료 시각
+    """
+    ChangeCounter.objects.bulk_create(
+        [
+            ChangeCounter(key=_available_slots_key(date), value=_initial_value(), hold_expires_at=expires_at)
+            for date, expires_at in expirations.items()
+        ],
+        update_conflicts=True, unique_fields=['key'], update_fields=['hold_expires_at'],
+    )
+
+
+def pop_expired_hold(date: datetime.date) -> bool:
+    """날짜의 예약 가능 시간에 반영한 hold가 만료되었으면 기록을 지우고 True를 반환합니다.
+
+    기록을 지운 요청만 True를 받으므로, 동시에 조회해도 한 번만 알립니다.
+    """
+    expired = ChangeCounter.objects.filter(key=_available_slots_key(date), hold_expires_at__lte=timezone.now())
+    with read_from_primary():
+        if not expired.exists():
+            return False
+    return expired.update(hold_expires_at=None) > 0
+
+
+def reservation_list_etag(customer) -> str:
+    """고객이 조회하는 예약 목록의 ETag를 반환합니다. 어드민은 모든 예약을 보므로 전체 카운터를 사용합니다."""
+    scope = ALL_RESERVATIONS if customer.is_admin else customer.pk
+    return f'"{scope}-{_read(_reservation_list_key(scope))}"'
+
+
+def available_slots_etag(date: datetime.date) -> str:
+    """날짜의 예약 가능 시간 ETag를 반환합니다."""
+    return f'"{date}-{_read(_available_slots_key(date))}"'
@@ -0,0 +1,29 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from reservations.archive import archive_reservations
+from reservations.changes import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = "보관 기간이 지난 예약을 보관 테이블로 옮깁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-days', type=int, default=settings.RESERVATION_ARCHIVE_RETENTION_DAYS,
+            help="오늘로부터 며칠 전까지의 예약을 예약 테이블에 남겨둘지 지정합니다.")
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help="한 트랜잭션에서 옮길 예약 수")
+
+    def handle(self, *args, **options):
+        before = datetime.date.today() - datetime.timedelta(days=options['retention_days'])
+        moved = archive_reservations(before, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{before} 이전의 예약 {moved}건을 보관했습니다."))
+
+        pruned = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(
+            f"보관 기간이 지난 삭제 기록 {pruned}건을 정리했습니다."))
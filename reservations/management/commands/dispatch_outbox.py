@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from reservations.outbox import FileSink, QueueSink, WebhookSink, dispatch_outbox
+
+
+class Command(BaseCommand):
+    help = "outbox에 저장된 예약 이벤트를 배치 단위로 외부 시스템에 전달합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sink', choices=['file', 'webhook', 'queue'], default=settings.OUTBOX_SINK,
+            help="file: JSON Lines 파일, webhook: HTTP POST, queue: 프로세스 내부 queue")
+        parser.add_argument(
+            '--path', default=settings.OUTBOX_FILE_PATH,
+            help="file sink가 이벤트를 덧붙일 파일 경로")
+        parser.add_argument(
+            '--url', default=settings.OUTBOX_WEBHOOK_URL,
+            help="webhook sink가 이벤트를 보낼 URL")
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help="한 번에 전달할 이벤트 수")
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help="0보다 크면 종료하지 않고, 전달할 이벤트가 없을 때 이 간격(초)만큼 쉬었다가 반복 실행합니다.")
+
+    def get_sink(self, options):
+        if options['sink'] == 'file':
+            return FileSink(options['path'])
+        if options['sink'] == 'webhook':
+            if not options['url']:
+                raise CommandError("webhook sink는 --url 또는 OUTBOX_WEBHOOK_URL이 필요합니다.")
+            return WebhookSink(options['url'])
+        return QueueSink()
+
+    def handle(self, *args, **options):
+        sink = self.get_sink(options)
+        while True:
+            dispatched = dispatch_outbox(sink, batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f"이벤트 {dispatched}건을 전달했습니다. ({options['sink']})"))
+
+            if options['interval'] <= 0:
+                break
+            time.sleep(options['interval'])
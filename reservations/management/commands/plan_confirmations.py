@@ -0,0 +1,38 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reservations.planning import OBJECTIVE_PARTICIPANTS, OBJECTIVES, apply_plan, plan_confirmations
+
+
+class Command(BaseCommand):
+    help = "기간 안의 확정 대기중 예약 중 수용 인원을 넘지 않고 확정할 예약을 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--from', dest='date_from', type=datetime.date.fromisoformat, required=True,
+            help="시작 날짜 (YYYY-MM-DD, 포함)")
+        parser.add_argument(
+            '--to', dest='date_to', type=datetime.date.fromisoformat, required=True,
+            help="종료 날짜 (YYYY-MM-DD, 포함)")
+        parser.add_argument(
+            '--objective', choices=OBJECTIVES, default=OBJECTIVE_PARTICIPANTS,
+            help="participants: 확정되는 참가자 수를 늘립니다. reservations: 확정되는 예약 수를 늘립니다.")
+        parser.add_argument(
+            '--apply', action='store_true',
+            help="계획한 예약을 한 트랜잭션에서 확정합니다.")
+
+    def handle(self, *args, **options):
+        if options['date_from'] > options['date_to']:
+            raise CommandError("--from은 --to보다 이후일 수 없습니다.")
+
+        plan = plan_confirmations(options['date_from'], options['date_to'], options['objective'])
+        self.stdout.write(
+            f"확정 대기중 예약 {len(plan.confirm) + len(plan.skip)}건 중 "
+            f"{len(plan.confirm)}건(참가자 {plan.participants}명)을 확정할 수 있습니다. ({plan.objective})")
+
+        if options['apply']:
+            result = apply_plan(plan)
+            self.stdout.write(self.style.SUCCESS(
+                f"예약 {len(result.confirmed)}건을 확정했습니다. "
+                f"(수용 인원 초과 {len(result.rejected)}건, 변경 충돌 {len(result.conflicted)}건)"))
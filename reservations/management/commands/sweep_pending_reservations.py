@@ -0,0 +1,43 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from examscheduler.idempotency import prune_idempotency_keys
+from reservations.sweeper import SWEEP_POLICIES, prune_expired_holds, sweep_stale_pending_reservations
+
+
+class Command(BaseCommand):
+    help = "날짜가 지났거나 예약 가능 기간을 벗어난 확정 대기중 예약과 만료된 hold, Idempotency-Key를 정리합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--policy', choices=SWEEP_POLICIES, default=settings.PENDING_RESERVATION_SWEEP_POLICY,
+            help="cancel: 취소 상태로 변경, delete: 삭제")
+        parser.add_argument(
+            '--cutoff-days', type=int, default=settings.PENDING_RESERVATION_SWEEP_CUTOFF_DAYS,
+            help="오늘로부터 이 일수 이전 날짜의 확정 대기중 예약을 정리합니다.")
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="한 트랜잭션에서 처리할 예약 수")
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help="0보다 크면 종료하지 않고 이 간격(초)마다 반복 실행합니다.")
+
+    def handle(self, *args, **options):
+        while True:
+            swept = sweep_stale_pending_reservations(
+                policy=options['policy'],
+                cutoff_days=options['cutoff_days'],
+                batch_size=options['batch_size'],
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"확정 대기중 예약 {swept}건을 정리했습니다. ({options['policy']})"))
+            pruned = prune_expired_holds(batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f"만료된 hold {pruned}건을 정리했습니다."))
+            pruned = prune_idempotency_keys(batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f"만료된 Idempotency-Key {pruned}건을 정리했습니다."))
+
+            if options['interval'] <= 0:
+                break
+            time.sleep(options['interval'])
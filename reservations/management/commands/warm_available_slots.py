@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reservations.warming import seconds_until_next_warm, warm_available_slots
+
+
+class Command(BaseCommand):
+    help = "예약 가능한 모든 날짜의 예약 가능 시간을 미리 계산하여 캐시에 저장합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help="0보다 크면 종료하지 않고 이 간격(초)마다, 그리고 자정 직후에 반복 실행합니다. "
+                 "캐시 만료 시간(1시간)보다 짧게 지정합니다.")
+
+    def handle(self, *args, **options):
+        while True:
+            warmed = warm_available_slots()
+            self.stdout.write(self.style.SUCCESS(
+                f"{warmed}일의 예약 가능 시간을 캐시에 저장했습니다."))
+
+            if options['interval'] <= 0:
+                break
+            time.sleep(seconds_until_next_warm(options['interval']))
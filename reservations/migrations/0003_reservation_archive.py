@@ -0,0 +1,100 @@
+# Generated by Django 5.1.7 on 2026-10-19 12:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# PostgreSQL에서는 보관 테이블을 날짜 범위로 파티셔닝한다.
+# 파티션 키(date)가 기본 키에 포함되어야 하므로 (id, date)를 기본 키로 사용하고,
+# 월별 파티션은 archive_reservations 명령이 필요할 때 생성한다.
+CREATE_PARTITIONED_ARCHIVE_SQL = """
+CREATE TABLE "reservations_reservationarchive" (
+    "id" uuid NOT NULL,
+    "title" varchar(50) NOT NULL,
+    "date" date NOT NULL,
+    "start_time" time NOT NULL,
+    "end_time" time NOT NULL,
+    "num_of_participants" integer NOT NULL CHECK ("num_of_participants" >= 0),
+    "status" varchar(10) NOT NULL,
+    "created_at" timestamp with time zone NOT NULL,
+    "updated_at" timestamp with time zone NOT NULL,
+    "archived_at" timestamp with time zone NOT NULL,
+    "customer_id" bigint NOT NULL
+        REFERENCES "customers_customer" ("id") DEFERRABLE INITIALLY DEFERRED,
+    PRIMARY KEY ("id", "date")
+) PARTITION BY RANGE ("date");
+CREATE TABLE "reservations_reservationarchive_default"
+    PARTITION OF "reservations_reservationarchive" DEFAULT;
+CREATE INDEX "reservations_archive_customer_idx"
+    ON "reservations_reservationarchive" ("customer_id");
+"""
+
+
+def create_archive_table(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_PARTITIONED_ARCHIVE_SQL)
+    else:
+        schema_editor.create_model(apps.get_model("reservations", "ReservationArchive"))
+
+
+def drop_archive_table(apps, schema_editor):
+    schema_editor.delete_model(apps.get_model("reservations", "ReservationArchive"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0002_alter_reservation_num_of_participants_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="ReservationArchive",
+                    fields=[
+                        (
+                            "id",
+                            models.UUIDField(
+                                editable=False, primary_key=True, serialize=False
+                            ),
+                        ),
+                        ("title", models.CharField(max_length=50)),
+                        ("date", models.DateField()),
+                        ("start_time", models.TimeField()),
+                        ("end_time", models.TimeField()),
+                        ("num_of_participants", models.PositiveIntegerField()),
+                        (
+                            "status",
+                            models.CharField(
+                                choices=[
+                                    ("PENDING", "확정 대기중"),
+                                    ("APPROVED", "확정됨"),
+                                    ("REJECTED", "취소됨"),
+                                ],
+                                max_length=10,
+                            ),
+                        ),
+                        ("created_at", models.DateTimeField()),
+                        ("updated_at", models.DateTimeField()),
+                        ("archived_at", models.DateTimeField(auto_now_add=True)),
+                        (
+                            "customer",
+                            models.ForeignKey(
+                                on_delete=django.db.models.deletion.CASCADE,
+                                to=settings.AUTH_USER_MODEL,
+                            ),
+                        ),
+                    ],
+                ),
+            ],
+        ),
+        migrations.RunPython(create_archive_table, drop_archive_table),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["date", "start_time"], name="reservation_date_start_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.7 on 2026-10-19 12:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0003_reservation_archive"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["status", "date"], name="reservation_status_date_idx"
+            ),
+        ),
+    ]
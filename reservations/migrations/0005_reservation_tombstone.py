@@ -0,0 +1,56 @@
+# Generated by Django 5.1.7 on 2026-10-19 12:45
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0004_reservation_status_date_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReservationTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("reservation_id", models.UUIDField()),
+                ("date", models.DateField()),
+                ("deleted_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["updated_at", "id"], name="reservation_updated_id_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="reservationtombstone",
+            name="customer",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reservationtombstone",
+            index=models.Index(
+                fields=["deleted_at", "reservation_id"], name="tombstone_deleted_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-19 12:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0006_outbox_event"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="reservation",
+            name="title",
+            field=models.CharField(db_index=True, max_length=50),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-19 13:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0007_reservation_title_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reservation",
+            name="version",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
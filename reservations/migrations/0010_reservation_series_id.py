@@ -0,0 +1,20 @@
+# Generated by Django 5.1.7 on 2026-10-19 13:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0009_reservationhold"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reservation",
+            name="series_id",
+            field=models.UUIDField(
+                blank=True, db_index=True, editable=False, null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.7 on 2026-10-19 13:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+# PostgreSQL에서는 제목 검색(title__icontains)에 trigram GIN 인덱스를 사용한다.
+# icontains는 UPPER("title"::text) LIKE UPPER(...)로 변환되므로 같은 식에 인덱스를 만든다.
+# 다른 DB에서는 만들지 않으며, 제목 검색은 다른 필터로 좁힌 예약을 읽어 비교한다.
+CREATE_TITLE_TRGM_INDEX_SQL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS "reservation_title_trgm_idx"
+    ON "reservations_reservation" USING gin (UPPER("title"::text) gin_trgm_ops);
+"""
+DROP_TITLE_TRGM_INDEX_SQL = 'DROP INDEX IF EXISTS "reservation_title_trgm_idx";'
+
+
+def create_title_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_TITLE_TRGM_INDEX_SQL)
+
+
+def drop_title_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_TITLE_TRGM_INDEX_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0010_reservation_series_id"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["customer", "date", "start_time"],
+                name="reservation_customer_date_idx",
+            ),
+        ),
+        migrations.RunPython(create_title_trgm_index, drop_title_trgm_index),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0011_reservation_list_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reservationhold",
+            name="reservation",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="reservations.reservation",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-19 14:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0012_reservationhold_reservation"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeCounter",
+            fields=[
+                (
+                    "key",
+                    models.CharField(max_length=100, primary_key=True, serialize=False),
+                ),
+                ("value", models.BigIntegerField()),
+                ("hold_expires_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
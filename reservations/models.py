@@ -1,27 +1,61 @@
+import itertools
 import logging
 import uuid
 from django.core.cache import cache
-from django.db import models
+from django.db import DEFAULT_DB_ALIAS, models, transaction
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 
 from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
 
 
 RESERVATION_NUM_OF_PARTICIPANTS_LIMIT = 50000
+# 예약은 오늘을 기준으로 3일 후부터 15일 후까지 가능하다.
+RESERVATION_WINDOW_START_DAYS = 3
+RESERVATION_WINDOW_END_DAYS = 15
+# 예약은 1시간 단위이며, 9시부터 18시까지 가능하다.
+RESERVATION_OPENING_HOUR = 9
+RESERVATION_CLOSING_HOUR = 18
+HOURS_PER_DAY = 24
 
 logger = logging.getLogger(__name__)
 
 
+def hourly_occupancy(reservations) -> list[int]:
+    """예약들의 시간별 참가자 수를 반환합니다.
+
+    예약마다 시작 시간에 참가자 수를 더하고 종료 시간에 빼는 difference array를 누적하므로,
+    예약 수만큼만 계산합니다.
+
+    Args:
+        reservations (Iterable[tuple[datetime.time, datetime.time, int]]): (시작 시간, 종료 시간, 참가자 수)
+
+    Returns:
+        list[int]: 0시부터 23시까지 각 시간의 참가자 수
+    """
+    diff = [0] * (HOURS_PER_DAY + 1)
+    for start_time, end_time, num_of_participants in reservations:
+        diff[start_time.hour] += num_of_participants
+        diff[end_time.hour] -= num_of_participants
+    return list(itertools.accumulate(diff[:HOURS_PER_DAY]))
+
+
 class ReservationStatus(models.TextChoices):
     PENDING = 'PENDING', '확정 대기중'
     CONFIRMED = 'APPROVED', '확정됨'
     CANCELLED = 'REJECTED', '취소됨'
 
 
+class ReservationVersionConflict(Exception):
+    """예약을 읽은 뒤 다른 요청이 먼저 예약을 변경했습니다."""
+
+
 class Reservation(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    title = models.CharField(max_length=50)
+    # 어드민에서 제목 앞부분으로 검색할 때 사용한다.
+    title = models.CharField(max_length=50, db_index=True)
     date = models.DateField()
     start_time = models.TimeField()
     end_time = models.TimeField()
@@ -35,6 +69,10 @@ class Reservation(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # 저장할 때마다 1씩 증가한다. 조건부 수정(ETag/If-Match)에 사용한다.
+    version = models.PositiveIntegerField(default=1, editable=False)
+    # 반복 예약으로 함께 만들어진 예약은 같은 값을 가진다. 함께 확정/취소할 때 사용한다.
+    series_id = models.UUIDField(null=True, blank=True, editable=False, db_index=True)
 
     class Meta:
         constraints = [
@@ -49,6 +87,22 @@ class Reservation(models.Model):
                 name='times_on_the_hour'
             ),
         ]
+        indexes = [
+            # 날짜별 수용 인원 집계와 보관 대상(과거 날짜) 조회에 사용한다.
+            models.Index(fields=['date', 'start_time'],
+                         name='reservation_date_start_idx'),
+            # 상태별로 날짜가 지난 예약을 찾을 때 사용한다. (reservations.sweeper)
+            models.Index(fields=['status', 'date'],
+                         name='reservation_status_date_idx'),
+            # 변경 피드를 (updated_at, id) 순서로 읽을 때 사용한다. (reservations.changes)
+            models.Index(fields=['updated_at', 'id'],
+                         name='reservation_updated_id_idx'),
+            # 고객의 예약 목록을 날짜 범위로 거르고 날짜/시작 시간 순서로 읽을 때 사용한다.
+            models.Index(fields=['customer', 'date', 'start_time'],
+                         name='reservation_customer_date_idx'),
+        ]
+        # PostgreSQL에서는 제목 검색(q)에 사용하는 trigram 인덱스(reservation_title_trgm_idx)가 있다.
+        # (migrations/0011_reservation_list_filter_indexes.py)
 
     def clean(self):
         super().clean()
@@ -58,18 +112,248 @@ class Reservation(models.Model):
             raise ValidationError(
                 'Start time and end time must be on the hour.')
 
-    def save(self, *args, **kwargs):
-        self.full_clean()
-        super().save(*args, **kwargs)
+    def save(self, *args, expected_version=None, **kwargs):
+        """
+        예약을 저장합니다.
+
+        `expected_version`을 전달하면 DB의 version이 같을 때만 한 번의 UPDATE로 저장하고,
+        다르면 ReservationVersionConflict를 발생시킵니다.
+        """
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.full_clean()
+        else:
+            # 일부 필드만 저장할 때는 저장하지 않는 필드의 검증을 건너뛴다.
+            self.full_clean(exclude=[
+                field.name for field in self._meta.concrete_fields if field.name not in update_fields])
+
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            return
+
+        if update_fields is not None:
+            kwargs['update_fields'] = [*update_fields, 'version']
+        if expected_version is None:
+            # 읽은 뒤 다른 요청이 저장했더라도 version이 되돌아가지 않도록 DB에서 증가시키고,
+            # 증가된 값은 다음에 접근할 때 다시 읽는다.
+            self.version = models.F('version') + 1
+            super().save(*args, **kwargs)
+            del self.version
+            return
+
+        self._expected_version = expected_version
+        self.version = expected_version + 1
+        try:
+            # 충돌은 저장 중에 발생하므로, 바깥 트랜잭션을 계속 사용할 수 있도록 savepoint 안에서 저장한다.
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+        except ReservationVersionConflict:
+            self.version = expected_version
+            raise
+        finally:
+            del self._expected_version
+
+    def delete(self, *args, expected_version=None, **kwargs):
+        """
+        예약을 삭제합니다.
+
+        `expected_version`을 전달하면 DB의 version이 같을 때만 삭제하고, 다르면
+        ReservationVersionConflict를 발생시킵니다. 조건부 UPDATE로 행을 먼저 잠그므로
+        트랜잭션 안에서 호출해야 합니다.
+        """
+        if expected_version is not None:
+            claimed = Reservation.objects.filter(pk=self.pk, version=expected_version).update(
+                version=expected_version + 1)
+            if not claimed:
+                raise ReservationVersionConflict(self.pk)
+            self.version = expected_version + 1
+        return super().delete(*args, **kwargs)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        expected_version = getattr(self, '_expected_version', None)
+        if expected_version is None:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        # UPDATE ... WHERE id = %s AND version = %s
+        if not super()._do_update(
+                base_qs.filter(version=expected_version), using, pk_val, values, update_fields, forced_update):
+            raise ReservationVersionConflict(pk_val)
+        return True
 
     @staticmethod
-    def confirmed_num_of_participants_in_time_range(date, start_time, end_time, exclude_reservation=None):
-        reservations = Reservation.objects.filter(
+    def confirmed_num_of_participants_in_time_range(
+            date, start_time, end_time, exclude_reservation=None, exclude_hold=None):
+        """시간 범위 안에서 확정된 참가자 수가 가장 많은 시간의 참가자 수를 반환합니다.
+
+        수용 인원은 한 시간 단위로 계산하므로, 같은 범위 안에 있어도 시간이 겹치지 않는 예약은 함께 세지 않습니다.
+        만료되지 않은 hold(ReservationHold)도 확정된 예약과 같이 셉니다.
+        `exclude_reservation`을 전달하면 그 예약과, 그 예약을 만들 때 사용한 hold를 빼고 셉니다.
+        """
+        # 수용 인원 검사는 replica 지연의 영향을 받지 않도록 항상 primary에서 읽는다.
+        reservations = Reservation.objects.using(DEFAULT_DB_ALIAS).filter(
             date=date,
             start_time__lt=end_time,
             end_time__gt=start_time,
             status=ReservationStatus.CONFIRMED
         )
+        holds = ReservationHold.objects.using(DEFAULT_DB_ALIAS).active().filter(
+            date=date,
+            start_time__lt=end_time,
+            end_time__gt=start_time,
+        )
         if exclude_reservation:
+            # 예약을 수정할 때는 예약이 사용한 hold도 함께 빼고 센다.
             reservations = reservations.exclude(id=exclude_reservation.id)
-        return reservations.aggregate(models.Sum('num_of_participants'))['num_of_participants__sum'] or 0
+            holds = holds.exclude(reservation_id=exclude_reservation.id)
+        if exclude_hold:
+            holds = holds.exclude(id=exclude_hold.id)
+        occupancy = hourly_occupancy(
+            reservations.values_list('start_time', 'end_time').annotate(models.Sum('num_of_participants')).order_by()
+            .union(
+                holds.values_list('start_time', 'end_time').annotate(models.Sum('num_of_participants')).order_by(),
+                all=True))
+        return max(occupancy[start_time.hour:end_time.hour], default=0)
+
+
+class ReservationHoldQuerySet(models.QuerySet):
+    def active(self):
+        """만료되지 않은 hold"""
+        return self.filter(expires_at__gt=timezone.now())
+
+
+class ReservationHold(models.Model):
+    """
+    예약을 만드는 동안 수용 인원을 잠시 잡아두는 hold
+
+    만료되지 않은 hold는 확정된 예약과 같이 수용 인원에 포함되며, 같은 시간으로 예약을 만들면 사용됩니다.
+    사용한 hold는 예약(`reservation`)에 연결되어, 예약이 확정/취소/삭제되거나 만료될 때까지 수용 인원을 잡아둡니다.
+    만료된 hold는 수용 인원을 계산할 때 세지 않고, 같은 날짜의 hold를 잡을 때나
+    `manage.py sweep_pending_reservations`를 실행할 때 삭제됩니다. (reservations.services.take_hold 참고)
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    customer = models.ForeignKey(
+        'customers.Customer', on_delete=models.CASCADE, related_name='+')
+    date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    num_of_participants = models.PositiveIntegerField()
+    # 예약은 보관/정리할 때 삭제 신호 없이 지워지므로 DB 제약 조건을 두지 않고, 예약을 바꾸는 쪽에서 hold를 삭제한다.
+    # (reservations.services.release_reservation_holds 참고)
+    reservation = models.ForeignKey(
+        Reservation, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    objects = ReservationHoldQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # 날짜별 수용 인원 집계와 만료된 hold 정리에 사용한다.
+            models.Index(fields=['date', 'expires_at'],
+                         name='reservation_hold_date_exp_idx'),
+            models.Index(fields=['expires_at'],
+                         name='reservation_hold_expires_idx'),
+        ]
+
+
+class ReservationArchive(models.Model):
+    """
+    보관 기간이 지나 예약 테이블에서 옮겨진 예약
+
+    PostgreSQL에서는 날짜 범위(월 단위)로 파티셔닝된 테이블에 저장됩니다.
+    (reservations.archive 참고)
+    """
+    id = models.UUIDField(primary_key=True, editable=False)
+    title = models.CharField(max_length=50)
+    date = models.DateField()
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    customer = models.ForeignKey(
+        'customers.Customer', on_delete=models.CASCADE)
+    num_of_participants = models.PositiveIntegerField()
+    status = models.CharField(
+        max_length=10,
+        choices=ReservationStatus.choices,
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+
+class ReservationTombstone(models.Model):
+    """
+    삭제된 예약의 기록
+
+    변경 피드(reservations.changes)가 삭제된 예약을 알려주기 위해 사용합니다.
+    고객이 삭제된 뒤에도 기록이 남도록 고객에 대한 외래 키 제약은 두지 않습니다.
+    """
+    reservation_id = models.UUIDField()
+    customer = models.ForeignKey(
+        'customers.Customer', on_delete=models.DO_NOTHING, db_constraint=False, related_name='+')
+    date = models.DateField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['deleted_at', 'reservation_id'],
+                         name='tombstone_deleted_id_idx'),
+        ]
+
+
+class OutboxEventType(models.TextChoices):
+    CREATED = 'reservation.created', '예약 생성'
+    CONFIRMED = 'reservation.confirmed', '예약 확정'
+    UPDATED = 'reservation.updated', '예약 수정'
+    DELETED = 'reservation.deleted', '예약 삭제'
+
+
+class OutboxEvent(models.Model):
+    """
+    외부 시스템에 전달할 예약 이벤트
+
+    예약 변경과 같은 트랜잭션에서 저장되고, dispatch_outbox 명령이 배치로 전달합니다.
+    (reservations.outbox 참고)
+    """
+    event_type = models.CharField(max_length=30, choices=OutboxEventType.choices)
+    reservation_id = models.UUIDField()
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            # 아직 전달되지 않은 이벤트를 저장된 순서대로 읽을 때 사용한다.
+            models.Index(fields=['id'], condition=models.Q(dispatched_at__isnull=True),
+                         name='outbox_pending_idx'),
+        ]
+
+
+class ChangeCounter(models.Model):
+    """
+    예약 목록/예약 가능 시간 ETag의 변경 카운터
+
+    변경이 커밋될 때마다 DB에서 `F('value') + 1`로 올리므로, 동시에 커밋된 변경도 서로 다른 값을 받습니다.
+    (reservations.etags 참고)
+    """
+    key = models.CharField(max_length=100, primary_key=True)
+    value = models.BigIntegerField()
+    # 예약 가능 시간에 반영한 hold가 처음 만료되는 시각 (날짜별 예약 가능 시간 카운터에만 기록한다)
+    hold_expires_at = models.DateTimeField(null=True, blank=True)
+
+
+@receiver(post_save, sender=Reservation)
+def touch_reservation_lists_on_save(sender, instance, **kwargs):
+    # reservations.etags가 이 모듈의 ChangeCounter를 사용하므로 호출할 때 가져온다.
+    from reservations.etags import touch_reservation_lists
+    touch_reservation_lists(instance.customer_id)
+
+
+@receiver(post_delete, sender=Reservation)
+def record_reservation_tombstone(sender, instance, **kwargs):
+    # 여러 예약을 한 번에 지우는 경로(sweeper, 고객 삭제)는 signal 없이 삭제 기록을 한 번에 저장한다.
+    from reservations.etags import touch_reservation_lists
+    ReservationTombstone.objects.create(
+        reservation_id=instance.id, customer_id=instance.customer_id, date=instance.date)
+    touch_reservation_lists(instance.customer_id)
@@ -0,0 +1,218 @@
+import contextlib
+import datetime
+import json
+import logging
+import os
+import queue
+import urllib.request
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.utils import timezone
+
+from examscheduler import metrics
+from reservations.models import OutboxEvent, Reservation
+
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_RETRY_BASE_SECONDS = 5
+OUTBOX_RETRY_MAX_SECONDS = 60 * 10
+
+OUTBOX_DISPATCH_LOCK_ID = zlib.crc32(b'outbox_dispatch')
+
+
+def build_event(event_type: str, reservation: Reservation) -> OutboxEvent:
+    """예약 이벤트를 저장하지 않고 만듭니다. 여러 이벤트를 bulk_create로 저장할 때 사용합니다."""
+    return OutboxEvent(
+        event_type=event_type,
+        reservation_id=reservation.id,
+        payload={
+            'id': reservation.id,
+            'customer_id': reservation.customer_id,
+            'title': reservation.title,
+            'date': reservation.date,
+            'start_time': reservation.start_time,
+            'end_time': reservation.end_time,
+            'num_of_participants': reservation.num_of_participants,
+            'status': reservation.status,
+            'updated_at': reservation.updated_at,
+            'version': reservation.version,
+            'series_id': reservation.series_id,
+        },
+    )
+
+
+def record_event(event_type: str, reservation: Reservation) -> OutboxEvent:
+    """예약 이벤트를 outbox에 저장합니다.
+
+    예약 변경과 같은 트랜잭션 안에서 호출해야, 변경이 롤백되면 이벤트도 함께 롤백됩니다.
+
+    Args:
+        event_type (str): OutboxEventType 값
+        reservation (Reservation): 변경된 예약. 삭제 이벤트는 삭제되기 전의 예약입니다.
+    """
+    event = build_event(event_type, reservation)
+    event.save()
+    return event
+
+
+class SinkUnavailable(Exception):
+    """sink가 이벤트를 받을 수 없는 상태입니다. (장애 또는 backpressure)"""
+
+
+class FileSink:
+    """이벤트를 JSON Lines 파일에 덧붙이는 sink"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def send(self, events: list[dict]):
+        with open(self.path, 'a', encoding='utf-8') as file:
+            for event in events:
+                file.write(json.dumps(event, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n')
+            file.flush()
+            os.fsync(file.fileno())
+
+
+class WebhookSink:
+    """이벤트 배치를 JSON 배열로 webhook URL에 POST하는 sink"""
+
+    def __init__(self, url: str, timeout: float = 10):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, events: list[dict]):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(events, cls=DjangoJSONEncoder).encode(),
+            headers={'Content-Type': 'application/json'},
+            method='POST',
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                pass
+        except OSError as err:
+            raise SinkUnavailable(str(err)) from err
+
+
+class QueueSink:
+    """
+    이벤트를 크기가 제한된 queue에 넣는 sink
+
+    message broker 대신 사용하는 프로세스 내부 구현입니다. queue가 가득 차면
+    SinkUnavailable을 발생시켜, 소비자가 따라올 때까지 dispatcher가 전달을 미루도록 합니다.
+    """
+
+    def __init__(self, maxsize: int = 1000):
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def send(self, events: list[dict]):
+        if self.queue.maxsize and self.queue.qsize() + len(events) > self.queue.maxsize:
+            raise SinkUnavailable('queue is full')
+        for event in events:
+            self.queue.put_nowait(event)
+
+
+def _retry_delay(attempts: int) -> datetime.timedelta:
+    return datetime.timedelta(
+        seconds=min(OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), OUTBOX_RETRY_MAX_SECONDS))
+
+
+def _serialize(event: OutboxEvent) -> dict:
+    return {
+        'id': event.id,
+        'type': event.event_type,
+        'reservation_id': event.reservation_id,
+        'payload': event.payload,
+        'created_at': event.created_at,
+    }
+
+
+@contextlib.contextmanager
+def dispatcher_lock():
+    """이벤트를 전달하는 dispatcher가 하나만 실행되도록 잠급니다. 잠금을 얻었는지 여부를 반환합니다.
+
+    PostgreSQL에서는 트랜잭션과 관계없는 session advisory lock을 기다리지 않고 시도합니다.
+    다른 DB에서는 dispatcher를 하나만 실행한다고 가정하고 항상 잠금을 얻은 것으로 봅니다.
+    """
+    if connection.vendor != 'postgresql':
+        yield True
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_lock(%s)', [OUTBOX_DISPATCH_LOCK_ID])
+        acquired = cursor.fetchone()[0]
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_unlock(%s)', [OUTBOX_DISPATCH_LOCK_ID])
+
+
+def dispatch_batch(sink, batch_size: int = 100) -> int:
+    """아직 전달되지 않은 이벤트를 저장된 순서대로 한 배치만큼 sink에 전달합니다.
+
+    dispatcher 잠금(`dispatcher_lock`)을 얻은 하나의 dispatcher만 전달하므로, 여러 프로세스에서 실행해도
+    이벤트는 저장된 순서대로 전달됩니다. sink에 보내는 동안에는 트랜잭션과 행 잠금을 잡고 있지 않으며,
+    전달한 뒤 전달 완료로 표시하기 전에 중단되면 다음 실행에서 다시 전달됩니다. (at-least-once)
+    전달에 실패하면 배치 전체를 지수적으로 늘어나는 간격 뒤에 다시 시도하며, 그동안 이후 이벤트도
+    전달하지 않아 순서가 유지됩니다.
+
+    Args:
+        sink: `send(events: list[dict])`를 구현한 sink
+        batch_size (int): 한 번에 전달할 이벤트 수
+
+    Returns:
+        int: 전달한 이벤트 수. 전달할 이벤트가 없거나, 재시도를 기다리는 중이거나, 다른 dispatcher가 전달하는 중이면 0입니다.
+    """
+    with dispatcher_lock() as acquired:
+        if not acquired:
+            return 0
+
+        events = list(OutboxEvent.objects.filter(dispatched_at__isnull=True).order_by('id')[:batch_size])
+        now = timezone.now()
+        if not events or events[0].next_attempt_at > now:
+            return 0
+
+        ids = [event.id for event in events]
+        try:
+            sink.send([_serialize(event) for event in events])
+        except Exception as err:
+            attempts = events[0].attempts + 1
+            logger.warning("failed to dispatch %s outbox events (attempt %s): %s",
+                           len(events), attempts, err)
+            OutboxEvent.objects.filter(id__in=ids).update(
+                attempts=attempts,
+                next_attempt_at=now + _retry_delay(attempts),
+                last_error=str(err)[:1000],
+            )
+            return 0
+
+        OutboxEvent.objects.filter(id__in=ids).update(
+            dispatched_at=timezone.now(), attempts=events[0].attempts + 1, last_error='')
+    return len(events)
+
+
+def dispatch_outbox(sink, batch_size: int = 100, max_batches: int | None = None) -> int:
+    """전달할 이벤트가 없거나 실패할 때까지 배치 단위로 이벤트를 전달합니다.
+
+    Args:
+        sink: `send(events: list[dict])`를 구현한 sink
+        batch_size (int): 한 번에 전달할 이벤트 수
+        max_batches (int, optional): 한 번 실행에서 전달할 최대 배치 수
+
+    Returns:
+        int: 전달한 이벤트 수
+    """
+    with metrics.timed('outbox_dispatch', sink=type(sink).__name__, rows=0) as values:
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            dispatched = dispatch_batch(sink, batch_size)
+            values['rows'] += dispatched
+            batches += 1
+            if dispatched < batch_size:
+                break
+    return values['rows']
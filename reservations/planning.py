@@ -0,0 +1,187 @@
+import bisect
+import datetime
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+from examscheduler import metrics
+from reservations.capacity import confirmed_hourly_occupancy
+from reservations.models import HOURS_PER_DAY, RESERVATION_NUM_OF_PARTICIPANTS_LIMIT, Reservation, ReservationStatus
+from reservations.services import ConfirmResult, confirm_reservations, id_batches
+
+
+OBJECTIVE_PARTICIPANTS = 'participants'
+OBJECTIVE_RESERVATIONS = 'reservations'
+OBJECTIVES = (OBJECTIVE_PARTICIPANTS, OBJECTIVE_RESERVATIONS)
+
+
+class Candidate(NamedTuple):
+    id: uuid.UUID
+    date: datetime.date
+    start_hour: int
+    end_hour: int
+    num_of_participants: int
+
+
+@dataclass
+class ConfirmationPlan:
+    objective: str
+    confirm: list[uuid.UUID] = field(default_factory=list)
+    skip: list[uuid.UUID] = field(default_factory=list)
+    participants: int = 0
+
+
+def _plan_date(candidates: list[Candidate], capacity: list[int], objective: str) -> list[int]:
+    """한 날짜의 후보 중 시간별 남은 인원을 넘지 않고 확정할 후보의 index를 반환합니다.
+
+    모두 확정한다고 가정한 뒤(greedy) 넘치는 시간마다 후보를 빼고(repair), 뺀 후보 중
+    다시 들어갈 수 있는 후보를 목표에 유리한 순서로 되돌려 넣습니다.
+    - participants: 넘치는 인원 이상인 가장 작은 후보 하나와, 넘치는 인원을 채울 때까지의
+      작은 후보들 중 빼는 인원이 적은 쪽을 뺍니다.
+    - reservations: 가장 큰 후보부터 빼서 빼는 예약 수를 줄입니다.
+    같은 인원이면 나중에 만들어진 예약을 먼저 뺍니다. (candidates는 생성 순서입니다.)
+    """
+    occupancy = [0] * (HOURS_PER_DAY + 1)
+    covering = defaultdict(list)
+    for index, candidate in enumerate(candidates):
+        occupancy[candidate.start_hour] += candidate.num_of_participants
+        occupancy[candidate.end_hour] -= candidate.num_of_participants
+        for hour in range(candidate.start_hour, candidate.end_hour):
+            covering[hour].append(index)
+    for hour in range(1, HOURS_PER_DAY):
+        occupancy[hour] += occupancy[hour - 1]
+
+    accepted = [True] * len(candidates)
+    dropped = []
+
+    def drop(index):
+        accepted[index] = False
+        dropped.append(index)
+        candidate = candidates[index]
+        for hour in range(candidate.start_hour, candidate.end_hour):
+            occupancy[hour] -= candidate.num_of_participants
+
+    for hour in sorted(covering):
+        # 이미 확정된 예약만으로 넘친 시간은 후보를 모두 빼면 끝난다.
+        limit = max(capacity[hour], 0)
+        if occupancy[hour] <= limit:
+            continue
+        excess = occupancy[hour] - limit
+        if objective == OBJECTIVE_PARTICIPANTS:
+            # 인원 오름차순, 같은 인원이면 나중에 만들어진 예약이 앞에 온다.
+            indices = sorted(covering[hour], key=lambda index: (candidates[index].num_of_participants, -index))
+            smaller, total = [], 0
+            for index in indices:
+                if total >= excess:
+                    break
+                if accepted[index]:
+                    smaller.append(index)
+                    total += candidates[index].num_of_participants
+            nums = [candidates[index].num_of_participants for index in indices]
+            position = bisect.bisect_left(nums, excess)
+            while position < len(indices) and not accepted[indices[position]]:
+                position += 1
+            if position < len(indices) and nums[position] <= total:
+                drop(indices[position])
+            else:
+                for index in smaller:
+                    drop(index)
+        else:
+            for index in sorted(covering[hour], key=lambda index: (-candidates[index].num_of_participants, -index)):
+                if occupancy[hour] <= limit:
+                    break
+                if accepted[index]:
+                    drop(index)
+
+    if objective == OBJECTIVE_PARTICIPANTS:
+        dropped.sort(key=lambda index: (-candidates[index].num_of_participants, index))
+    else:
+        dropped.sort(key=lambda index: (candidates[index].num_of_participants, index))
+    for index in dropped:
+        candidate = candidates[index]
+        hours = range(candidate.start_hour, candidate.end_hour)
+        if all(occupancy[hour] + candidate.num_of_participants <= capacity[hour] for hour in hours):
+            accepted[index] = True
+            for hour in hours:
+                occupancy[hour] += candidate.num_of_participants
+
+    return [index for index, is_accepted in enumerate(accepted) if is_accepted]
+
+
+def solve(candidates: list[Candidate], occupancy_by_date: dict, objective: str) -> ConfirmationPlan:
+    """확정 대기중 예약 후보 중 수용 인원을 넘지 않고 확정할 예약을 고릅니다.
+
+    Args:
+        candidates (list[Candidate]): 생성 순서로 정렬된 후보
+        occupancy_by_date (dict[datetime.date, list[int]]): 날짜별 이미 확정된 예약의 시간별 참가자 수
+        objective (str): 'participants'면 확정되는 참가자 수를, 'reservations'면 확정되는 예약 수를 늘립니다.
+
+    Returns:
+        ConfirmationPlan: 확정할 예약과 확정하지 않을 예약
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"unknown objective: {objective}")
+
+    candidates_by_date = defaultdict(list)
+    for candidate in candidates:
+        candidates_by_date[candidate.date].append(candidate)
+
+    plan = ConfirmationPlan(objective=objective)
+    for date, date_candidates in sorted(candidates_by_date.items()):
+        capacity = [RESERVATION_NUM_OF_PARTICIPANTS_LIMIT - confirmed for confirmed in occupancy_by_date[date]]
+        accepted = set(_plan_date(date_candidates, capacity, objective))
+        for index, candidate in enumerate(date_candidates):
+            if index in accepted:
+                plan.confirm.append(candidate.id)
+                plan.participants += candidate.num_of_participants
+            else:
+                plan.skip.append(candidate.id)
+    return plan
+
+
+def plan_confirmations(
+    date_from: datetime.date,
+    date_to: datetime.date,
+    objective: str = OBJECTIVE_PARTICIPANTS,
+) -> ConfirmationPlan:
+    """기간 안의 확정 대기중 예약 중 수용 인원을 넘지 않고 확정할 예약을 계산합니다. 예약은 바꾸지 않습니다.
+
+    확정 대기중 예약과 확정된 예약의 시간별 참가자 수를 각각 한 번의 쿼리로 읽습니다.
+
+    Args:
+        date_from (datetime.date): 시작 날짜 (포함)
+        date_to (datetime.date): 종료 날짜 (포함)
+        objective (str): 'participants' 또는 'reservations'
+
+    Returns:
+        ConfirmationPlan: 확정할 예약과 확정하지 않을 예약
+    """
+    with metrics.timed('confirmation_plan', objective=objective, rows=0) as values:
+        pending = Reservation.objects.filter(status=ReservationStatus.PENDING, date__gte=date_from, date__lte=date_to)
+        candidates = [
+            Candidate(id, date, start_time.hour, end_time.hour, num_of_participants)
+            for id, date, start_time, end_time, num_of_participants in (
+                pending
+                .order_by('created_at', 'id')
+                .values_list('id', 'date', 'start_time', 'end_time', 'num_of_participants')
+            )
+        ]
+        values['rows'] = len(candidates)
+        # 후보 예약이 사용한 hold는 후보와 함께 두 번 세지 않는다.
+        occupancy_by_date = confirmed_hourly_occupancy(
+            {candidate.date for candidate in candidates}, exclude_holds_of=pending)
+        plan = solve(candidates, occupancy_by_date, objective)
+        values['confirm'] = len(plan.confirm)
+    return plan
+
+
+def apply_plan(plan: ConfirmationPlan) -> ConfirmResult:
+    """계획한 예약을 예약 확정과 같은 경로로 한 트랜잭션에서 확정합니다.
+
+    계획한 뒤 예약이 바뀌었다면 확정할 때 수용 인원을 다시 확인하므로, 일부는 확정되지 않을 수 있습니다.
+    """
+    reservations = []
+    for ids in id_batches(plan.confirm):
+        reservations += Reservation.objects.filter(id__in=ids)
+    return confirm_reservations(reservations)
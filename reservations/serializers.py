@@ -1,20 +1,84 @@
 import datetime
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 
-from reservations.models import RESERVATION_NUM_OF_PARTICIPANTS_LIMIT, Reservation
+from reservations.models import (
+    RESERVATION_CLOSING_HOUR, RESERVATION_NUM_OF_PARTICIPANTS_LIMIT, RESERVATION_OPENING_HOUR,
+    RESERVATION_WINDOW_END_DAYS, RESERVATION_WINDOW_START_DAYS, Reservation, ReservationHold, ReservationStatus,
+)
+
+
+# 한 번에 예약 가능 여부를 확인할 수 있는 최대 시간 범위 수
+CHECK_MAX_WINDOWS = 100
+# 한 번에 확정을 시뮬레이션할 수 있는 최대 예약 수
+SIMULATION_MAX_IDS = 1000
+# 한 번에 조회할 수 있는 최대 예약 수
+BATCH_GET_MAX_IDS = 200
+
+# 추천하는 시간 범위 수
+SUGGESTIONS_DEFAULT_LIMIT = 5
+SUGGESTIONS_MAX_LIMIT = 20
+
+# 제목 검색어의 최소 길이. trigram 인덱스는 세 글자 이상일 때 사용된다.
+TITLE_SEARCH_MIN_LENGTH = 3
+
+# 반복 예약의 반복 단위
+SERIES_FREQUENCY_DAYS = {'daily': 1, 'weekly': 7}
+
+# 값이 바뀌면 예약 가능 기간과 수용 인원을 다시 확인해야 하는 필드
+OCCUPANCY_FIELDS = ('date', 'start_time', 'end_time', 'num_of_participants')
+
+# 예약 목록의 `?fields=`로 고를 수 있는 필드와, 그 필드를 직렬화하는 데 필요한 컬럼
+SPARSE_FIELD_COLUMNS = {
+    'id': ('id',),
+    'title': ('title',),
+    'date': ('date',),
+    'start_time': ('start_time',),
+    'end_time': ('end_time',),
+    'num_of_participants': ('num_of_participants',),
+    'status': ('status',),
+    'status_display': ('status',),
+    'created_at': ('created_at',),
+    'customer': ('customer', 'customer__company_name'),
+    'version': ('version',),
+    'series_id': ('series_id',),
+}
 
 
 def is_date_within_three_to_fifteen_days_from_today(date: datetime.time) -> bool:
     return (
-        date >= (datetime.datetime.now() + datetime.timedelta(days=3)).date() and
-        date <= (datetime.datetime.now() + datetime.timedelta(days=15)).date()
+        date >= (datetime.datetime.now() + datetime.timedelta(days=RESERVATION_WINDOW_START_DAYS)).date() and
+        date <= (datetime.datetime.now() + datetime.timedelta(days=RESERVATION_WINDOW_END_DAYS)).date()
     )
 
 
+def validate_booking_time(date: datetime.date, start_time: datetime.time, end_time: datetime.time):
+    """예약 가능 기간(3일 후부터 15일 후까지)과 예약 가능 시간(9시부터 18시까지)을 확인합니다.
+
+    Raises:
+        serializers.ValidationError: 예약할 수 없는 날짜나 시간인 경우
+    """
+    if is_date_within_three_to_fifteen_days_from_today(date) is False:
+        raise serializers.ValidationError(
+            '예약은 오늘을 기준으로 3일 후부터 15일 후까지 가능합니다.')
+
+    if (
+        start_time >= end_time or
+        start_time.hour < RESERVATION_OPENING_HOUR or
+        end_time.hour > RESERVATION_CLOSING_HOUR
+    ):
+        raise serializers.ValidationError('올바른 시간을 입력해주세요.')
+
+
 class ReservationSerializer(serializers.ModelSerializer):
     customer = serializers.StringRelatedField(read_only=True)
     status_display = serializers.CharField(
         source='get_status_display', read_only=True)
+    hold = serializers.PrimaryKeyRelatedField(
+        queryset=ReservationHold.objects.all(), write_only=True, required=False,
+        help_text='같은 시간으로 잡아둔 hold ID. 예약을 만들 때 사용되며, hold의 인원만큼 수용 인원을 다시 확인하지 않습니다. '
+                  '사용한 hold는 예약이 확정/취소/삭제되거나 만료될 때까지 수용 인원을 잡아둡니다.')
 
     class Meta:
         model = Reservation
@@ -29,29 +93,192 @@ class ReservationSerializer(serializers.ModelSerializer):
             'status_display',
             'created_at',
             'customer',
+            'version',
+            'series_id',
+            'hold',
         ]
-        read_only_fields = ['id', 'created_at', 'status']
+        read_only_fields = ['id', 'created_at', 'status', 'version', 'series_id']
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            # 요청한 필드만 직렬화한다.
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
     def validate(self, attrs):
-        if is_date_within_three_to_fifteen_days_from_today(attrs['date']) is False:
-            raise serializers.ValidationError(
-                '예약은 오늘을 기준으로 3일 후부터 15일 후까지 가능합니다.')
+        hold = attrs.get('hold')
+        if hold is not None:
+            self.validate_hold_for(hold, attrs)
+        if self.instance is not None and not self.occupancy_changed(attrs):
+            return attrs
 
-        if (
-            attrs['start_time'] >= attrs['end_time'] or
-            attrs['start_time'].hour < 9 or
-            attrs['end_time'].hour > 18
-        ):
-            raise serializers.ValidationError('올바른 시간을 입력해주세요.')
+        # 일부 수정이면 보내지 않은 필드는 기존 예약의 값으로 검사한다.
+        values = {field: attrs.get(field, getattr(self.instance, field, None)) for field in OCCUPANCY_FIELDS}
+        validate_booking_time(values['date'], values['start_time'], values['end_time'])
 
         if (
             Reservation.confirmed_num_of_participants_in_time_range(
-                attrs['date'], attrs['start_time'], attrs['end_time'], exclude_reservation=self.instance) +
-            attrs['num_of_participants'] > RESERVATION_NUM_OF_PARTICIPANTS_LIMIT
+                values['date'], values['start_time'], values['end_time'],
+                exclude_reservation=self.instance, exclude_hold=hold) +
+            values['num_of_participants'] > RESERVATION_NUM_OF_PARTICIPANTS_LIMIT
         ):
             raise serializers.ValidationError('예약 가능한 인원 수를 초과했습니다.')
         return attrs
 
+    def validate_hold_for(self, hold: ReservationHold, attrs):
+        """hold가 요청한 고객의 만료되지 않은 hold이고, 예약과 같은 시간인지 확인합니다."""
+        if self.instance is not None:
+            raise serializers.ValidationError({'hold': 'hold는 예약을 만들 때만 사용할 수 있습니다.'})
+        if hold.customer_id != self.context['request'].user.pk:
+            raise serializers.ValidationError({'hold': '사용할 수 없는 hold입니다.'})
+        if hold.expires_at <= timezone.now():
+            raise serializers.ValidationError({'hold': '만료된 hold입니다.'})
+        if hold.reservation_id is not None:
+            raise serializers.ValidationError({'hold': '이미 사용된 hold입니다.'})
+        if (
+            (attrs['date'], attrs['start_time'], attrs['end_time']) != (hold.date, hold.start_time, hold.end_time) or
+            attrs['num_of_participants'] > hold.num_of_participants
+        ):
+            raise serializers.ValidationError({'hold': 'hold와 예약 시간 또는 인원이 다릅니다.'})
+
+    def create(self, validated_data):
+        hold = validated_data.pop('hold', None)
+        with transaction.atomic():
+            reservation = super().create(validated_data)
+            # hold는 삭제하지 않고 예약에 연결하여, 예약이 확정될 때까지 수용 인원을 잡아둔다.
+            # 같은 hold로 동시에 예약을 만들면 하나만 연결되고, 나머지는 만든 예약을 되돌린다.
+            if hold is not None and not (
+                ReservationHold.objects.active()
+                .filter(id=hold.id, reservation__isnull=True)
+                .update(reservation=reservation)
+            ):
+                raise serializers.ValidationError({'hold': '만료되었거나 이미 사용된 hold입니다.'})
+        return reservation
+
+    def occupancy_changed(self, attrs) -> bool:
+        """수정할 값 중 수용 인원에 영향을 주는 필드가 기존 예약과 다른지 확인합니다."""
+        return any(
+            field in attrs and attrs[field] != getattr(self.instance, field)
+            for field in OCCUPANCY_FIELDS
+        )
+
+    def update(self, instance, validated_data):
+        # serializer.save(expected_version=...)로 전달되면 조건부로 저장한다.
+        expected_version = validated_data.pop('expected_version', None)
+        # 바뀐 필드만 저장하여, 제목만 수정할 때 다른 필드를 다시 검증하거나 쓰지 않는다.
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        instance.save(update_fields=[*validated_data, 'updated_at'], expected_version=expected_version)
+        return instance
+
+
+class ReservationSeriesSerializer(serializers.Serializer):
+    """
+    반복 예약 생성 요청을 직렬화하는 Serializer
+
+    반복되는 날짜는 모두 예약 가능 기간 안에 있어야 하며, 검증한 뒤 `dates`에 담깁니다.
+    """
+    title = serializers.CharField(max_length=50)
+    start_date = serializers.DateField(help_text='첫 예약 날짜')
+    start_time = serializers.TimeField()
+    end_time = serializers.TimeField()
+    num_of_participants = serializers.IntegerField(min_value=1)
+    frequency = serializers.ChoiceField(choices=list(SERIES_FREQUENCY_DAYS), help_text='daily: 매일, weekly: 매주')
+    interval = serializers.IntegerField(min_value=1, default=1, help_text='반복 간격. 2면 이틀(또는 2주)마다 반복합니다.')
+    count = serializers.IntegerField(min_value=1, required=False, help_text='반복 횟수')
+    until = serializers.DateField(required=False, help_text='마지막 예약 날짜 (포함). count와 until이 없으면 예약 가능 기간 끝까지 반복합니다.')
+
+    def validate(self, attrs):
+        if 'count' in attrs and 'until' in attrs:
+            raise serializers.ValidationError('count와 until은 함께 지정할 수 없습니다.')
+
+        last_bookable_date = (
+            datetime.datetime.now() + datetime.timedelta(days=RESERVATION_WINDOW_END_DAYS)).date()
+        until = attrs.get('until', last_bookable_date)
+        if until > last_bookable_date:
+            raise serializers.ValidationError('반복 예약은 예약 가능 기간 안에서만 만들 수 있습니다.')
+
+        step = datetime.timedelta(days=SERIES_FREQUENCY_DAYS[attrs['frequency']] * attrs['interval'])
+        count = attrs.get('count')
+        dates = []
+        date = attrs['start_date']
+        while date <= until and (count is None or len(dates) < count):
+            dates.append(date)
+            date += step
+        if not dates:
+            raise serializers.ValidationError('반복되는 날짜가 없습니다.')
+        if count is not None and len(dates) < count:
+            raise serializers.ValidationError('반복 예약은 예약 가능 기간 안에서만 만들 수 있습니다.')
+
+        # 날짜는 순서대로 늘어나므로 처음과 마지막 날짜만 확인하면 된다.
+        for date in (dates[0], dates[-1]):
+            validate_booking_time(date, attrs['start_time'], attrs['end_time'])
+        attrs['dates'] = dates
+        return attrs
+
+
+class ReservationHoldSerializer(serializers.ModelSerializer):
+    """
+    수용 인원 hold를 직렬화하는 Serializer
+    """
+    class Meta:
+        model = ReservationHold
+        fields = ['id', 'date', 'start_time', 'end_time', 'num_of_participants', 'expires_at']
+        read_only_fields = ['id', 'expires_at']
+
+    def validate(self, attrs):
+        validate_booking_time(attrs['date'], attrs['start_time'], attrs['end_time'])
+        return attrs
+
+
+class ReservationBatchGetSerializer(serializers.Serializer):
+    """
+    예약 일괄 조회 요청을 직렬화하는 Serializer
+    """
+    ids = serializers.ListField(
+        child=serializers.UUIDField(), allow_empty=False, max_length=BATCH_GET_MAX_IDS, help_text='조회할 예약 ID')
+
+
+class ReservationBatchGetResultSerializer(serializers.Serializer):
+    """
+    예약 일괄 조회 결과를 직렬화하는 Serializer
+    """
+    reservations = ReservationSerializer(many=True, help_text='요청한 순서대로 정렬된 예약')
+    missing = serializers.ListField(child=serializers.UUIDField(), help_text='존재하지 않는 예약 ID')
+    forbidden = serializers.ListField(child=serializers.UUIDField(), help_text='다른 고객의 예약 ID')
+
+
+class ReservationListFilterSerializer(serializers.Serializer):
+    """
+    예약 목록 필터와 응답 필드 선택을 직렬화하는 Serializer
+    """
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    status = serializers.MultipleChoiceField(choices=ReservationStatus.choices, required=False)
+    start_time = serializers.TimeField(required=False)
+    end_time = serializers.TimeField(required=False)
+    customer = serializers.IntegerField(required=False)
+    title = serializers.CharField(required=False)
+    q = serializers.CharField(required=False, min_length=TITLE_SEARCH_MIN_LENGTH)
+    fields = serializers.CharField(required=False)
+
+    def validate_fields(self, value):
+        fields = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+        unknown = [name for name in fields if name not in SPARSE_FIELD_COLUMNS]
+        if unknown:
+            raise serializers.ValidationError(f"알 수 없는 필드입니다: {', '.join(unknown)}")
+        if not fields:
+            raise serializers.ValidationError('필드를 하나 이상 입력해주세요.')
+        return fields
+
+    def validate(self, attrs):
+        if 'date_from' in attrs and 'date_to' in attrs and attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError('date_from은 date_to보다 이후일 수 없습니다.')
+        if 'start_time' in attrs and 'end_time' in attrs and attrs['start_time'] >= attrs['end_time']:
+            raise serializers.ValidationError('올바른 시간을 입력해주세요.')
+        return attrs
+
 
 class ReservationConfirmSerializer(serializers.ModelSerializer):
     status_display = serializers.CharField(
@@ -71,3 +298,167 @@ class ReservationSlotSerializer(serializers.Serializer):
     start_time = serializers.TimeField()
     end_time = serializers.TimeField()
     remaining = serializers.IntegerField()
+
+
+class ReservationChangeSerializer(serializers.Serializer):
+    """
+    변경 피드의 변경 하나를 직렬화하는 Serializer
+    """
+    type = serializers.ChoiceField(choices=['created', 'updated', 'deleted'])
+    id = serializers.UUIDField()
+    changed_at = serializers.DateTimeField()
+    reservation = ReservationSerializer(allow_null=True)
+
+
+class ReservationChangesSerializer(serializers.Serializer):
+    """
+    변경 피드 응답을 직렬화하는 Serializer
+    """
+    changes = ReservationChangeSerializer(many=True)
+    next_cursor = serializers.CharField(allow_null=True)
+    has_more = serializers.BooleanField()
+
+
+class ReservationCheckWindowSerializer(serializers.Serializer):
+    """
+    예약 가능 여부를 확인할 시간 범위를 직렬화하는 Serializer
+    """
+    date = serializers.DateField()
+    start_time = serializers.TimeField()
+    end_time = serializers.TimeField()
+    num_of_participants = serializers.IntegerField(min_value=1)
+
+
+class ReservationCheckSerializer(serializers.Serializer):
+    """
+    예약 가능 여부 확인 요청을 직렬화하는 Serializer
+    """
+    windows = ReservationCheckWindowSerializer(many=True, allow_empty=False, max_length=CHECK_MAX_WINDOWS)
+
+
+class ReservationCheckResultSerializer(ReservationCheckWindowSerializer):
+    """
+    시간 범위별 예약 가능 여부를 직렬화하는 Serializer
+    """
+    available = serializers.BooleanField()
+    remaining = serializers.IntegerField(allow_null=True, help_text='이미 확정된 예약을 제외하고 더 예약할 수 있는 인원 수')
+    detail = serializers.CharField(allow_null=True, help_text='예약할 수 없는 이유')
+
+
+class ReservationCheckResultsSerializer(serializers.Serializer):
+    """
+    예약 가능 여부 확인 응답을 직렬화하는 Serializer
+    """
+    results = ReservationCheckResultSerializer(many=True)
+
+
+class ReservationSuggestionQuerySerializer(serializers.Serializer):
+    """
+    예약 가능한 시간 범위 추천 조건을 직렬화하는 Serializer
+    """
+    num_of_participants = serializers.IntegerField(min_value=1, max_value=RESERVATION_NUM_OF_PARTICIPANTS_LIMIT)
+    hours = serializers.IntegerField(
+        min_value=1, max_value=RESERVATION_CLOSING_HOUR - RESERVATION_OPENING_HOUR, default=1)
+    limit = serializers.IntegerField(min_value=1, max_value=SUGGESTIONS_MAX_LIMIT, default=SUGGESTIONS_DEFAULT_LIMIT)
+    date = serializers.DateField(required=False)
+    start_time = serializers.TimeField(required=False)
+
+    def validate(self, attrs):
+        if 'start_time' in attrs and 'date' not in attrs:
+            raise serializers.ValidationError('start_time은 date와 함께 지정해야 합니다.')
+        return attrs
+
+
+class ReservationSuggestionSerializer(serializers.Serializer):
+    """
+    추천하는 시간 범위를 직렬화하는 Serializer
+    """
+    date = serializers.DateField()
+    start_time = serializers.TimeField()
+    end_time = serializers.TimeField()
+    remaining = serializers.IntegerField(help_text='시간 범위 안에서 더 예약할 수 있는 인원 수')
+
+
+class ConfirmationPlanRequestSerializer(serializers.Serializer):
+    """
+    예약 확정 계획 요청을 직렬화하는 Serializer
+    """
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    objective = serializers.ChoiceField(
+        choices=['participants', 'reservations'], default='participants',
+        help_text='participants: 확정되는 참가자 수를 늘립니다. reservations: 확정되는 예약 수를 늘립니다.')
+    apply = serializers.BooleanField(default=False, help_text='true면 계획한 예약을 바로 확정합니다.')
+
+    def validate(self, attrs):
+        if attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError('date_from은 date_to보다 이후일 수 없습니다.')
+        return attrs
+
+
+class ConfirmationPlanResultSerializer(serializers.Serializer):
+    """
+    계획을 적용한 결과를 직렬화하는 Serializer
+    """
+    confirmed = serializers.IntegerField()
+    rejected = serializers.IntegerField()
+    conflicted = serializers.IntegerField()
+
+
+class ConfirmationPlanSerializer(serializers.Serializer):
+    """
+    예약 확정 계획을 직렬화하는 Serializer
+    """
+    objective = serializers.CharField()
+    confirm = serializers.ListField(child=serializers.UUIDField(), help_text='확정할 예약 ID')
+    skip = serializers.ListField(child=serializers.UUIDField(), help_text='수용 인원 때문에 확정하지 않을 예약 ID')
+    participants = serializers.IntegerField(help_text='확정할 예약의 참가자 수 합')
+    applied = ConfirmationPlanResultSerializer(allow_null=True, help_text='apply가 true일 때 적용한 결과')
+
+
+class ReservationSimulationSerializer(serializers.Serializer):
+    """
+    예약 확정 시뮬레이션 요청을 직렬화하는 Serializer
+    """
+    ids = serializers.ListField(
+        child=serializers.UUIDField(), required=False, allow_empty=False, max_length=SIMULATION_MAX_IDS,
+        help_text='확정할 예약 ID')
+    date_from = serializers.DateField(required=False, help_text='확정할 예약의 시작 날짜 (포함)')
+    date_to = serializers.DateField(required=False, help_text='확정할 예약의 종료 날짜 (포함)')
+
+    def validate(self, attrs):
+        if ('date_from' in attrs) != ('date_to' in attrs):
+            raise serializers.ValidationError('date_from과 date_to는 함께 지정해야 합니다.')
+        if 'ids' not in attrs and 'date_from' not in attrs:
+            raise serializers.ValidationError('ids 또는 date_from과 date_to를 지정해야 합니다.')
+        if 'date_from' in attrs and attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError('date_from은 date_to보다 이후일 수 없습니다.')
+        return attrs
+
+
+class ReservationSimulationHourSerializer(serializers.Serializer):
+    """
+    시간별 시뮬레이션 결과를 직렬화하는 Serializer
+    """
+    hour = serializers.IntegerField()
+    confirmed = serializers.IntegerField(help_text='이미 확정된 참가자 수')
+    proposed = serializers.IntegerField(help_text='확정할 예약의 참가자 수')
+    occupancy = serializers.IntegerField(help_text='확정한 뒤의 참가자 수')
+    overflow = serializers.BooleanField(help_text='수용 인원 초과 여부')
+
+
+class ReservationSimulationDateSerializer(serializers.Serializer):
+    """
+    날짜별 시뮬레이션 결과를 직렬화하는 Serializer
+    """
+    date = serializers.DateField()
+    overflow = serializers.BooleanField(help_text='수용 인원을 넘는 시간이 있는지 여부')
+    hours = ReservationSimulationHourSerializer(many=True)
+
+
+class ReservationSimulationResultSerializer(serializers.Serializer):
+    """
+    예약 확정 시뮬레이션 결과를 직렬화하는 Serializer
+    """
+    overflow = serializers.BooleanField(help_text='수용 인원을 넘는 시간이 있는지 여부')
+    dates = ReservationSimulationDateSerializer(many=True)
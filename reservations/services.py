@@ -0,0 +1,354 @@
+import datetime
+import logging
+import uuid
+import zlib
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from reservations.broadcast import publish_slots_changed
+from reservations.capacity import CAPACITY_EXCEEDED_MESSAGE, confirmed_hourly_occupancy, peak_occupancy
+from reservations.etags import pop_expired_hold, touch_reservation_lists
+from reservations.models import (
+    RESERVATION_NUM_OF_PARTICIPANTS_LIMIT, OutboxEvent, OutboxEventType, Reservation, ReservationHold,
+    ReservationStatus, ReservationVersionConflict,
+)
+from reservations.outbox import build_event, record_event
+
+
+logger = logging.getLogger(__name__)
+
+# SQLite의 쿼리 파라미터 수 제한(999)을 넘지 않도록 id 목록으로 읽거나 지울 때 나눠서 보내는 크기
+ID_BATCH_SIZE = 900
+
+
+def id_batches(ids: list) -> list[list]:
+    """id 목록을 ID_BATCH_SIZE씩 나눕니다. `id__in` 조건 하나에 모든 id를 넣지 않도록 사용합니다."""
+    return [ids[start:start + ID_BATCH_SIZE] for start in range(0, len(ids), ID_BATCH_SIZE)]
+
+
+def lock_dates(dates):
+    """트랜잭션이 끝날 때까지 날짜별 수용 인원 변경을 직렬화합니다.
+
+    PostgreSQL에서는 날짜별 advisory lock을 사용합니다. 다른 DB에서는 아무것도 하지 않습니다.
+    (SQLite는 쓰기 트랜잭션이 하나씩만 실행됩니다.) 교착 상태를 피하도록 날짜 순서대로 잠급니다.
+
+    Args:
+        dates (Iterable[datetime.date]): 잠글 날짜
+    """
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        for date in sorted(set(dates)):
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)',
+                           [zlib.crc32(f"reservation_capacity:{date}".encode())])
+
+
+@dataclass
+class ConfirmResult:
+    confirmed: list[Reservation] = field(default_factory=list)
+    rejected: list[tuple[Reservation, str]] = field(default_factory=list)
+    conflicted: list[Reservation] = field(default_factory=list)
+
+
+def confirm_reservations(reservations) -> ConfirmResult:
+    """예약들을 수용 인원을 확인하며 확정합니다.
+
+    날짜별로 잠근 뒤 확정된 예약의 시간별 참가자 수를 한 번에 읽고 시작 시간 순서대로 확정하며,
+    이미 확정된 예약과 함께 수용 인원을 넘는 예약은 확정하지 않고 `rejected`에 담습니다. 읽은 뒤 다른 요청이 먼저 변경한 예약은 확정하지 않고
+    `conflicted`에 담습니다. 확정된 예약의 날짜별 예약 가능 시간 캐시는 커밋된 뒤 한 번씩만 비웁니다.
+    예약을 만들 때 사용한 hold의 인원은 예약이 이미 잡고 있는 인원으로 보고, 확정하면 hold를 삭제합니다.
+
+    Args:
+        reservations (Iterable[Reservation]): 확정할 예약
+
+    Returns:
+        ConfirmResult: 확정된 예약과, 확정하지 못한 예약
+    """
+    result = ConfirmResult()
+    changed_dates = set()
+    reservations = sorted(reservations, key=lambda reservation: (reservation.date, reservation.start_time))
+
+    with transaction.atomic():
+        lock_dates(reservation.date for reservation in reservations)
+        # 날짜를 잠근 뒤 읽으므로, 확정하는 동안 다른 확정이 수용 인원을 바꾸지 않는다.
+        pending = [reservation for reservation in reservations if reservation.status != ReservationStatus.CONFIRMED]
+        occupancy = confirmed_hourly_occupancy(reservation.date for reservation in pending)
+        # 예약이 사용한 hold는 위의 참가자 수에 이미 포함되어 있다.
+        held = {}
+        for ids in id_batches([reservation.id for reservation in pending]):
+            held.update(
+                ReservationHold.objects.active()
+                .filter(reservation__in=ids)
+                .values_list('reservation_id')
+                .annotate(Sum('num_of_participants'))
+                .order_by()
+            )
+        consumed = []
+        for reservation in reservations:
+            if reservation.status == ReservationStatus.CONFIRMED:
+                result.confirmed.append(reservation)
+                continue
+
+            hours = occupancy[reservation.date]
+            confirmed = peak_occupancy(hours, reservation.start_time, reservation.end_time)
+            # hold와 예약은 같은 시간이므로, hold를 예약으로 바꾸는 데 필요한 인원만 더 확인한다.
+            added = reservation.num_of_participants - held.get(reservation.id, 0)
+            if confirmed + added > RESERVATION_NUM_OF_PARTICIPANTS_LIMIT:
+                result.rejected.append((reservation, CAPACITY_EXCEEDED_MESSAGE))
+                continue
+
+            previous_status, reservation.status = reservation.status, ReservationStatus.CONFIRMED
+            try:
+                # 수용 인원을 확인한 뒤 예약이 바뀌었다면 확정하지 않는다.
+                reservation.save(update_fields=['status', 'updated_at'], expected_version=reservation.version)
+            except ReservationVersionConflict:
+                reservation.status = previous_status
+                result.conflicted.append(reservation)
+                continue
+            record_event(OutboxEventType.CONFIRMED, reservation)
+            for hour in range(reservation.start_time.hour, reservation.end_time.hour):
+                hours[hour] += added
+            if reservation.id in held:
+                consumed.append(reservation.id)
+            result.confirmed.append(reservation)
+            changed_dates.add(reservation.date)
+        # 확정된 예약이 hold 대신 수용 인원을 차지한다.
+        for ids in id_batches(consumed):
+            ReservationHold.objects.filter(reservation__in=ids).delete()
+
+        # 바깥 트랜잭션(반복 예약 확정)이 되돌리면 캐시도 비우지 않는다.
+        clear_available_slots_cache(*changed_dates)
+    return result
+
+
+class CapacityExceeded(Exception):
+    """수용 인원을 넘어 hold를 잡거나 예약을 만들 수 없습니다. 수용 인원을 넘는 날짜를 담습니다."""
+
+
+def take_hold(customer, date, start_time, end_time, num_of_participants) -> ReservationHold:
+    """수용 인원을 확인하고 RESERVATION_HOLD_TTL_SECONDS 동안 hold를 잡습니다.
+
+    확인과 저장은 날짜를 잠근 한 트랜잭션에서 실행되므로, 같은 날짜의 hold와 예약 확정은
+    하나씩 수용 인원을 확인합니다. 잠근 동안에는 만료된 hold 삭제, 시간별 참가자 수 조회, hold 저장만 실행합니다.
+
+    Args:
+        customer (Customer): hold를 잡는 고객
+        date (datetime.date): 예약 날짜
+        start_time (datetime.time): 시작 시간
+        end_time (datetime.time): 종료 시간
+        num_of_participants (int): 참가자 수
+
+    Returns:
+        ReservationHold: 잡은 hold
+
+    Raises:
+        CapacityExceeded: 확정된 예약과 다른 hold와 함께 수용 인원을 넘는 경우
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        lock_dates([date])
+        # 만료된 hold는 세지 않지만, 잠근 김에 같은 날짜의 만료된 hold를 정리한다.
+        # SQLite에서는 이 쓰기로 트랜잭션이 쓰기 잠금을 잡으므로, 이후의 확인과 저장이 다른 쓰기와 섞이지 않는다.
+        ReservationHold.objects.filter(date=date, expires_at__lte=now).delete()
+        occupancy = confirmed_hourly_occupancy([date])[date]
+        if peak_occupancy(occupancy, start_time, end_time) + num_of_participants > RESERVATION_NUM_OF_PARTICIPANTS_LIMIT:
+            raise CapacityExceeded(date)
+        hold = ReservationHold.objects.create(
+            customer=customer, date=date, start_time=start_time, end_time=end_time,
+            num_of_participants=num_of_participants,
+            expires_at=now + datetime.timedelta(seconds=settings.RESERVATION_HOLD_TTL_SECONDS),
+        )
+
+    clear_available_slots_cache(date)
+    return hold
+
+
+def release_hold(hold: ReservationHold) -> bool:
+    """hold를 삭제하여 잡아둔 수용 인원을 돌려줍니다.
+
+    예약을 만들 때 사용한 hold는 예약을 취소/삭제해야 돌려주므로 삭제하지 않습니다.
+
+    Returns:
+        bool: 만료되지 않은 hold를 삭제했으면 True
+    """
+    deleted, _ = ReservationHold.objects.active().filter(id=hold.id, reservation__isnull=True).delete()
+    if deleted:
+        clear_available_slots_cache(hold.date)
+    return bool(deleted)
+
+
+def release_reservation_holds(*reservation_ids):
+    """예약을 만들 때 사용한 hold를 삭제하여, 확정 대기중인 예약이 잡아둔 수용 인원을 돌려줍니다.
+
+    예약이 취소/삭제되거나 시간/인원이 바뀌면 호출합니다. 만료되지 않은 hold가 있던 날짜는
+    예약 가능 시간 캐시를 비웁니다. 사용한 hold가 없으면 한 번의 쿼리만 실행합니다.
+
+    Args:
+        *reservation_ids (uuid.UUID): 예약 ID
+    """
+    holds = list(
+        ReservationHold.objects
+        .filter(reservation__in=reservation_ids)
+        .values_list('id', 'date', 'expires_at')
+    )
+    if not holds:
+        return
+    ReservationHold.objects.filter(id__in=[id for id, _, _ in holds]).delete()
+    now = timezone.now()
+    dates = {date for _, date, expires_at in holds if expires_at > now}
+    if dates:
+        clear_available_slots_cache(*dates)
+
+
+def clear_available_slots_cache(*dates):
+    """트랜잭션이 커밋된 뒤 날짜들의 예약 가능 시간 캐시를 비우고 변경을 알립니다.
+
+    커밋 전에 비우면 아직 이전 데이터를 읽는 요청이 캐시를 다시 채울 수 있고, 트랜잭션이 되돌려지면
+    바뀌지 않은 날짜의 캐시를 비우게 되므로 커밋 뒤에 비웁니다. 트랜잭션 밖에서 호출하면 바로 비웁니다.
+    """
+    if not dates:
+        return
+
+    def clear():
+        for date in dates:
+            logger.debug("clearing cache for date %s", date,
+                         extra={'event': 'cache_invalidate'})
+            cache.delete(f"available_slots:{date}")
+
+    transaction.on_commit(clear)
+    publish_slots_changed(*dates)
+
+
+def notify_expired_holds(date: datetime.date) -> bool:
+    """날짜의 예약 가능 시간에 반영한 hold가 만료되었으면 캐시를 비우고 변경을 알립니다.
+
+    hold는 만료될 때 아무 요청도 없으므로, 예약 가능 시간을 조회하거나 구독 연결을 유지할 때 확인합니다.
+    만료된 hold 행은 `manage.py sweep_pending_reservations`가 삭제합니다.
+
+    Returns:
+        bool: 만료된 hold가 있어 변경을 알렸으면 True
+    """
+    if not pop_expired_hold(date):
+        return False
+    clear_available_slots_cache(date)
+    return True
+
+
+class SeriesAlreadyConfirmed(Exception):
+    """확정된 예약이 있어 고객이 반복 예약을 취소할 수 없습니다."""
+
+
+def create_series(customer, title, dates, start_time, end_time, num_of_participants) -> list[Reservation]:
+    """반복 예약을 한 트랜잭션에서 만듭니다.
+
+    날짜들을 잠근 뒤 모든 날짜의 수용 인원을 한 번의 쿼리로 확인하고, 예약과 outbox 이벤트를 각각 bulk_create로 저장합니다.
+    확인과 저장이 한 트랜잭션에서 실행되므로, 확인한 뒤 다른 요청이 같은 날짜의 수용 인원을 바꾸지 못합니다.
+    만든 예약은 같은 series_id를 가집니다.
+
+    Args:
+        customer (Customer): 예약하는 고객
+        title (str): 예약 제목
+        dates (list[datetime.date]): 예약 날짜. 예약 가능 기간과 시간은 이미 확인되어 있어야 합니다.
+        start_time (datetime.time): 시작 시간
+        end_time (datetime.time): 종료 시간
+        num_of_participants (int): 참가자 수
+
+    Returns:
+        list[Reservation]: 만든 예약
+
+    Raises:
+        CapacityExceeded: 수용 인원을 넘는 날짜가 있는 경우
+    """
+    series_id = uuid.uuid4()
+    with transaction.atomic():
+        lock_dates(dates)
+        occupancy = confirmed_hourly_occupancy(dates)
+        exceeded = [
+            date for date in dates
+            if peak_occupancy(occupancy[date], start_time, end_time) + num_of_participants >
+            RESERVATION_NUM_OF_PARTICIPANTS_LIMIT
+        ]
+        if exceeded:
+            raise CapacityExceeded(*exceeded)
+
+        reservations = Reservation.objects.bulk_create([
+            Reservation(
+                title=title, customer=customer, date=date, start_time=start_time, end_time=end_time,
+                num_of_participants=num_of_participants, series_id=series_id)
+            for date in dates
+        ])
+        OutboxEvent.objects.bulk_create([
+            build_event(OutboxEventType.CREATED, reservation) for reservation in reservations
+        ])
+        # bulk_create는 post_save를 보내지 않는다.
+        touch_reservation_lists(customer.pk)
+    return reservations
+
+
+def confirm_series(series_id) -> ConfirmResult:
+    """반복 예약 중 취소되지 않은 예약을 모두 확정합니다. 하나라도 확정할 수 없으면 하나도 확정하지 않습니다.
+
+    Returns:
+        ConfirmResult: 확정하지 못한 예약이 있으면 `confirmed`는 비어 있습니다.
+    """
+    reservations = list(
+        Reservation.objects.select_related('customer')
+        .filter(series_id=series_id)
+        .exclude(status=ReservationStatus.CANCELLED)
+    )
+    with transaction.atomic():
+        result = confirm_reservations(reservations)
+        if result.rejected or result.conflicted:
+            # 확정한 예약과 outbox 이벤트를 되돌리고, 커밋된 뒤 보낼 알림도 보내지 않는다.
+            transaction.set_rollback(True)
+            result.confirmed = []
+    return result
+
+
+def cancel_series(series_id, allow_confirmed: bool = True) -> list[Reservation]:
+    """반복 예약 중 취소되지 않은 예약을 한 트랜잭션에서 모두 취소합니다.
+
+    Args:
+        series_id (uuid.UUID): 반복 예약 ID
+        allow_confirmed (bool): False면 확정된 예약이 있을 때 하나도 취소하지 않습니다.
+
+    Returns:
+        list[Reservation]: 취소한 예약
+
+    Raises:
+        SeriesAlreadyConfirmed: `allow_confirmed`가 False이고 확정된 예약이 있는 경우
+    """
+    updated_at = timezone.now()
+    with transaction.atomic():
+        reservations = list(
+            Reservation.objects
+            .select_related('customer')
+            .filter(series_id=series_id)
+            .exclude(status=ReservationStatus.CANCELLED)
+            .select_for_update(of=('self',))
+        )
+        confirmed_dates = {
+            reservation.date for reservation in reservations if reservation.status == ReservationStatus.CONFIRMED}
+        if confirmed_dates and not allow_confirmed:
+            raise SeriesAlreadyConfirmed(series_id)
+
+        Reservation.objects.filter(id__in=[reservation.id for reservation in reservations]).update(
+            status=ReservationStatus.CANCELLED, updated_at=updated_at, version=F('version') + 1)
+        for reservation in reservations:
+            reservation.status = ReservationStatus.CANCELLED
+            reservation.updated_at = updated_at
+            reservation.version += 1
+        OutboxEvent.objects.bulk_create([
+            build_event(OutboxEventType.UPDATED, reservation) for reservation in reservations
+        ])
+        touch_reservation_lists(*{reservation.customer_id for reservation in reservations})
+        release_reservation_holds(*[reservation.id for reservation in reservations])
+
+    if confirmed_dates:
+        clear_available_slots_cache(*confirmed_dates)
+    return reservations
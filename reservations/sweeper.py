@@ -0,0 +1,124 @@
+import datetime
+import logging
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from examscheduler import metrics
+from reservations.etags import touch_reservation_lists
+from reservations.models import (
+    OutboxEvent, OutboxEventType, Reservation, ReservationHold, ReservationStatus, ReservationTombstone,
+)
+from reservations.outbox import build_event
+from reservations.services import clear_available_slots_cache, release_reservation_holds
+
+
+logger = logging.getLogger(__name__)
+
+SWEEP_POLICY_CANCEL = 'cancel'
+SWEEP_POLICY_DELETE = 'delete'
+SWEEP_POLICIES = (SWEEP_POLICY_CANCEL, SWEEP_POLICY_DELETE)
+
+
+def sweep_stale_pending_reservations(
+    policy: str = SWEEP_POLICY_CANCEL,
+    cutoff_days: int = 3,
+    batch_size: int = 500,
+) -> int:
+    """더 이상 확정될 수 없는 확정 대기중 예약을 정리합니다.
+
+    날짜가 지났거나, 오늘로부터 `cutoff_days`일 이내로 들어와 예약 가능 기간을 벗어난 예약이 대상입니다.
+    배치마다 짧은 트랜잭션에서 처리하며, 다른 트랜잭션이 잠근 행은 건너뛰고 다음 실행에서 처리합니다.
+    취소/삭제한 예약은 같은 트랜잭션에서 outbox에 이벤트를 한 번에 저장하고, 예약을 만들 때 사용한 hold를 삭제합니다.
+
+    Args:
+        policy (str): 'cancel'이면 취소 상태로 바꾸고, 'delete'면 삭제합니다.
+        cutoff_days (int): 오늘로부터 이 일수 이전의 날짜를 대상으로 합니다.
+        batch_size (int): 한 트랜잭션에서 처리할 예약 수
+
+    Returns:
+        int: 정리한 예약 수
+    """
+    if policy not in SWEEP_POLICIES:
+        raise ValueError(f"unknown sweep policy: {policy}")
+
+    cutoff = datetime.date.today() + datetime.timedelta(days=cutoff_days)
+    stale_reservations = Reservation.objects.filter(
+        status=ReservationStatus.PENDING, date__lt=cutoff
+    ).order_by('date')
+
+    swept = 0
+    with metrics.timed('pending_reservation_sweep', policy=policy, rows=0) as metric:
+        while True:
+            with transaction.atomic():
+                # outbox 이벤트에 예약 전체를 담으므로 모든 컬럼을 읽는다.
+                batch = list(stale_reservations.select_for_update(skip_locked=True)[:batch_size])
+                if not batch:
+                    break
+
+                if policy == SWEEP_POLICY_DELETE:
+                    OutboxEvent.objects.bulk_create([
+                        build_event(OutboxEventType.DELETED, reservation) for reservation in batch
+                    ])
+                    # 개별 삭제와 같이 변경 피드에 삭제를 남기되, 행마다 signal을 보내지 않고 한 번에 저장한다.
+                    ReservationTombstone.objects.bulk_create([
+                        ReservationTombstone(
+                            reservation_id=reservation.id, customer_id=reservation.customer_id, date=reservation.date)
+                        for reservation in batch
+                    ])
+                    query = Reservation.objects.filter(id__in=[reservation.id for reservation in batch])
+                    query._raw_delete(query.db)
+                else:
+                    updated_at = timezone.now()
+                    Reservation.objects.filter(id__in=[reservation.id for reservation in batch]).update(
+                        status=ReservationStatus.CANCELLED, updated_at=updated_at, version=F('version') + 1)
+                    for reservation in batch:
+                        reservation.status = ReservationStatus.CANCELLED
+                        reservation.updated_at = updated_at
+                        reservation.version += 1
+                    OutboxEvent.objects.bulk_create([
+                        build_event(OutboxEventType.UPDATED, reservation) for reservation in batch
+                    ])
+                # update와 _raw_delete는 signal을 보내지 않는다.
+                touch_reservation_lists(*(reservation.customer_id for reservation in batch))
+                release_reservation_holds(*(reservation.id for reservation in batch))
+
+            swept += len(batch)
+            metric['rows'] = swept
+            logger.debug("swept %s stale pending reservations (%s)",
+                         swept, policy)
+
+    return swept
+
+
+def prune_expired_holds(batch_size: int = 500) -> int:
+    """만료된 hold를 배치 단위로 삭제합니다.
+
+    만료된 hold는 수용 인원을 계산할 때 이미 세지 않으므로, 테이블 크기를 유지하기 위한 정리입니다.
+    캐시된 예약 가능 시간에는 hold가 남아 있을 수 있으므로, 삭제한 hold의 날짜는 캐시를 비웁니다.
+
+    Args:
+        batch_size (int): 한 번에 삭제할 hold 수
+
+    Returns:
+        int: 삭제한 hold 수
+    """
+    pruned = 0
+    dates = set()
+    while True:
+        batch = list(
+            ReservationHold.objects
+            .filter(expires_at__lte=timezone.now())
+            .values_list('id', 'date')[:batch_size]
+        )
+        if not batch:
+            break
+        ReservationHold.objects.filter(id__in=[id for id, _ in batch]).delete()
+        dates.update(date for _, date in batch)
+        pruned += len(batch)
+        logger.debug("pruned %s expired holds", pruned)
+
+    if dates:
+        clear_available_slots_cache(*dates)
+    return pruned
@@ -1,16 +1,80 @@
+import asyncio
 import datetime
+import hashlib
+import json
 import re
+import tempfile
+import time as time_module
+import uuid
+from io import StringIO
+from pathlib import Path
 from typing import cast
-from unittest.mock import patch
+from unittest.mock import Mock, patch
+from asgiref.sync import sync_to_async
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib import admin
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.timezone import now
-from rest_framework.test import APITestCase
 from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
 from datetime import time, timedelta
 
-from customers.models import Customer
-from reservations.utils import Slot, is_slot_in_reservation
-from .models import RESERVATION_NUM_OF_PARTICIPANTS_LIMIT, Reservation, ReservationStatus
+from customers.models import Customer, IdempotencyKey
+from examscheduler.idempotency import prune_idempotency_keys
+from examscheduler.testing import APITestCase, TestCase
+from reservations.admin import ReservationAdmin
+from reservations.broadcast import LocalPubSub, SlotBroadcaster, get_broadcaster, publish_slots_changed
+from reservations.capacity import confirmed_hourly_occupancy, sliding_window_min
+from reservations.changes import Cursor
+from reservations.etags import available_slots_etag, available_slots_versions, touch_available_slots
+from reservations.outbox import QueueSink, dispatch_outbox
+from reservations.planning import Candidate, apply_plan, plan_confirmations, solve
+from reservations.services import confirm_series, create_series
+from reservations.warming import seconds_until_next_warm, start_configured_warm_scheduler, warm_available_slots
+from reservations.utils import Slot, bookable_dates, build_available_slots, is_slot_in_reservation
+from .models import (
+    HOURS_PER_DAY, RESERVATION_NUM_OF_PARTICIPANTS_LIMIT, ChangeCounter, OutboxEvent, OutboxEventType, Reservation,
+    ReservationArchive, ReservationHold, ReservationStatus, ReservationTombstone, ReservationVersionConflict,
+)
+
+
+class ReservationFixtureMixin:
+    """
+    예약 테스트에서 공통으로 쓰는 고객과 예약 픽스처
+
+    setUp에서 캐시를 비우고 어드민(`admin_customer`)과 고객 두 명(`customer`, `other_customer`)을 만듭니다.
+    `date`는 신청 가능한 날짜(5일 뒤)입니다.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.admin_customer = Customer.objects.create_superuser(company_name="grepp", password="grepp1234")
+        self.customer = Customer.objects.create(company_name="programmers", password="programmers123")
+        self.other_customer = Customer.objects.create(company_name="kakao", password="kakao1234")
+        self.date = now().date() + timedelta(days=5)
+
+    def create_reservation(self, customer: Customer | None = None, *, date: datetime.date | None = None,
+                           start_hour=9, end_hour=10, num_of_participants=10, title="테스트 시험",
+                           **kwargs) -> Reservation:
+        """
+        예약을 DB에 바로 만듭니다. 지정하지 않은 값은 `customer`가 `date` 9시부터 10시까지 10명으로 신청한 예약입니다.
+        """
+        return Reservation.objects.create(
+            title=title,
+            customer=customer or self.customer,
+            date=date or self.date,
+            start_time=time(hour=start_hour),
+            end_time=time(hour=end_hour),
+            num_of_participants=num_of_participants,
+            **kwargs
+        )
 
 
 class ReservationAPITestCase(APITestCase):
@@ -208,7 +272,8 @@ class ReservationAPITestCase(APITestCase):
                 "num_of_participants": RESERVATION_NUM_OF_PARTICIPANTS_LIMIT // 2
             }
 
-            response = self.client.put(url, data, format="json")
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.put(url, data, format="json")
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertEqual(mock_delete.call_count, 2)
             mock_delete.assert_any_call(
@@ -216,6 +281,54 @@ class ReservationAPITestCase(APITestCase):
             mock_delete.assert_any_call(
                 f'available_slots:{reservation.date.isoformat()}')
 
+    def test_partial_update_title_skips_capacity_check(self):
+        """
+        제목만 일부 수정하면 수용 인원을 다시 확인하지 않고 예약을 한 번만 쓰는지 확인
+        """
+        self.authenticate(self.admin_customer)
+        reservation = self.create_reservation(self.normal_customer)
+        reservation.status = ReservationStatus.CONFIRMED
+        reservation.save()
+
+        url = reverse('reservation-detail', args=[reservation.id])
+        with patch('django.core.cache.cache.delete') as mock_delete, \
+                CaptureQueriesContext(connection) as context:
+            response = self.client.patch(url, {"title": "변경된 테스트 시험"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], "변경된 테스트 시험")
+        mock_delete.assert_not_called()
+
+        queries = [query['sql'] for query in context.captured_queries]
+        self.assertFalse([sql for sql in queries if 'SUM(' in sql])
+        updates = [sql for sql in queries if sql.startswith('UPDATE "reservations_reservation"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"title"', updates[0])
+        self.assertNotIn('"date"', updates[0])
+
+    def test_partial_update_date_validates_with_existing_values(self):
+        """
+        날짜만 일부 수정하면 기존 시간과 인원으로 예약 가능 기간과 수용 인원을 확인하는지 확인
+        """
+        self.authenticate(self.normal_customer)
+        reservation = self.create_reservation(self.normal_customer)
+        other = self.create_reservation(self.normal_customer2, num_of_participants=RESERVATION_NUM_OF_PARTICIPANTS_LIMIT)
+        other.date = now().date() + timedelta(days=8)
+        other.status = ReservationStatus.CONFIRMED
+        other.save()
+
+        url = reverse('reservation-detail', args=[reservation.id])
+        response = self.client.patch(url, {"date": (now() + timedelta(days=1)).date().isoformat()}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.patch(url, {"date": other.date.isoformat()}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.patch(url, {"date": (now() + timedelta(days=9)).date().isoformat()}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        reservation.refresh_from_db()
+        self.assertEqual(reservation.date, (now() + timedelta(days=9)).date())
+
     def test_user_cannot_update_other_customer_reservation(self):
         """
         다른 고객의 예약을 수정할 수 없는지 확인
@@ -281,7 +394,8 @@ class ReservationAPITestCase(APITestCase):
 
         with patch('django.core.cache.cache.delete') as mock_delete:
             url = reverse('reservation-confirm', args=[reservation.id])
-            response = self.client.post(url)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(url)
             reservation.refresh_from_db()
 
             self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -325,7 +439,8 @@ class ReservationAPITestCase(APITestCase):
 
         with patch('django.core.cache.cache.delete') as mock_delete:
             url = reverse('reservation-detail', args=[reservation.id])
-            response = self.client.delete(url)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.delete(url)
             self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
             mock_delete.assert_called_once_with(
                 f'available_slots:{reservation.date.isoformat()}')
@@ -525,3 +640,1771 @@ class ReservationAPITestCase(APITestCase):
         response = self.client.get(
             url + f'?date={(now() + timedelta(days=16)).date().isoformat()}')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ReservationArchiveTestCase(ReservationFixtureMixin, APITestCase):
+    def test_archive_moves_only_reservations_past_retention(self):
+        """
+        보관 기간이 지난 예약만 보관 테이블로 옮겨지는지 확인
+        """
+        today = now().date()
+        old_reservations = [self.create_reservation(
+            date=today - timedelta(days=40 + i)) for i in range(3)]
+        recent_reservation = self.create_reservation(
+            date=today - timedelta(days=10))
+
+        call_command('archive_reservations', retention_days=30,
+                     batch_size=2, stdout=StringIO())
+
+        self.assertEqual(
+            list(Reservation.objects.values_list('id', flat=True)), [recent_reservation.id])
+        self.assertEqual(
+            set(ReservationArchive.objects.values_list('id', flat=True)),
+            {reservation.id for reservation in old_reservations})
+        archived = ReservationArchive.objects.get(id=old_reservations[0].id)
+        self.assertEqual(archived.customer, self.customer)
+        self.assertEqual(archived.created_at, old_reservations[0].created_at)
+        # 보관한 예약은 보관 테이블에 남아 있으므로 변경 피드에 삭제로 기록하지 않는다.
+        self.assertFalse(ReservationTombstone.objects.exists())
+
+
+class PendingReservationSweepTestCase(ReservationFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        today = now().date()
+        self.past = self.create_reservation(date=today - timedelta(days=1))
+        self.inside_cutoff = self.create_reservation(date=today + timedelta(days=2))
+        self.bookable = self.create_reservation(date=today + timedelta(days=5))
+        self.confirmed_past = self.create_reservation(
+            date=today - timedelta(days=1), status=ReservationStatus.CONFIRMED)
+
+    def test_sweep_cancels_stale_pending_reservations(self):
+        """
+        날짜가 지났거나 3일 이내인 확정 대기중 예약만 취소되는지 확인
+        """
+        with patch('examscheduler.metrics.emit') as mock_emit:
+            call_command('sweep_pending_reservations', policy='cancel',
+                         batch_size=1, stdout=StringIO())
+
+        statuses = dict(Reservation.objects.values_list('id', 'status'))
+        self.assertEqual(statuses[self.past.id], ReservationStatus.CANCELLED)
+        self.assertEqual(
+            statuses[self.inside_cutoff.id], ReservationStatus.CANCELLED)
+        self.assertEqual(statuses[self.bookable.id], ReservationStatus.PENDING)
+        self.assertEqual(
+            statuses[self.confirmed_past.id], ReservationStatus.CONFIRMED)
+
+        self.past.refresh_from_db()
+        self.assertGreater(self.past.updated_at, self.past.created_at)
+        events = {event.reservation_id: event for event in OutboxEvent.objects.all()}
+        self.assertEqual(set(events), {self.past.id, self.inside_cutoff.id})
+        self.assertEqual(events[self.past.id].event_type, OutboxEventType.UPDATED)
+        self.assertEqual(events[self.past.id].payload['status'], ReservationStatus.CANCELLED)
+        self.assertEqual(events[self.past.id].payload['version'], self.past.version)
+        mock_emit.assert_called_once()
+        self.assertEqual(mock_emit.call_args.kwargs['rows'], 2)
+        self.assertIn('rows_per_second', mock_emit.call_args.kwargs)
+
+    def test_sweep_deletes_stale_pending_reservations(self):
+        """
+        delete 정책에서는 대상 예약이 삭제되는지 확인
+        """
+        with CaptureQueriesContext(connection) as queries:
+            call_command('sweep_pending_reservations', policy='delete',
+                         stdout=StringIO())
+
+        self.assertEqual(
+            set(Reservation.objects.values_list('id', flat=True)),
+            {self.bookable.id, self.confirmed_past.id})
+        self.assertEqual(
+            set(ReservationTombstone.objects.values_list('reservation_id', flat=True)),
+            {self.past.id, self.inside_cutoff.id})
+        self.assertEqual(
+            set(OutboxEvent.objects.filter(event_type=OutboxEventType.DELETED).values_list('reservation_id', flat=True)),
+            {self.past.id, self.inside_cutoff.id})
+        # 삭제 기록은 예약마다가 아니라 배치마다 한 번에 저장한다.
+        inserts = [query for query in queries if query['sql'].startswith('INSERT INTO "reservations_reservationtombstone"')]
+        self.assertEqual(len(inserts), 1)
+
+
+class ReservationIdempotencyTestCase(ReservationFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.data = {
+            "title": "테스트 시험",
+            "date": self.date.isoformat(),
+            "start_time": "09:00:00",
+            "end_time": "10:00:00",
+            "num_of_participants": 10
+        }
+
+    def test_retry_with_same_key_replays_first_response(self):
+        """
+        같은 Idempotency-Key로 재시도하면 예약이 한 번만 생성되고 첫 응답이 반환되는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        url = reverse('reservations')
+        headers = {'Idempotency-Key': 'create-1'}
+
+        first = self.client.post(url, self.data, format="json", headers=headers)
+        # 재시도는 저장된 응답을 한 번 읽기만 한다.
+        with patch('reservations.serializers.ReservationSerializer.validate') as mock_validate, \
+                self.assertNumQueries(1):
+            second = self.client.post(
+                url, self.data, format="json", headers=headers)
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data['id'], first.data['id'])
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        mock_validate.assert_not_called()
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_same_key_with_different_body_is_rejected(self):
+        """
+        같은 Idempotency-Key로 다른 요청을 보내면 거절되는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        url = reverse('reservations')
+        headers = {'Idempotency-Key': 'create-2'}
+
+        self.client.post(url, self.data, format="json", headers=headers)
+        response = self.client.post(
+            url, {**self.data, "num_of_participants": 20}, format="json", headers=headers)
+
+        self.assertEqual(response.status_code,
+                         status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_in_flight_duplicate_is_rejected(self):
+        """
+        같은 키의 요청이 처리 중일 때 들어온 중복 요청은 409를 반환하는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        url = reverse('reservations')
+        headers = {'Idempotency-Key': 'create-3'}
+        # 같은 키의 첫 요청이 처리를 시작한 상태 (응답을 저장하기 전)
+        with patch('reservations.views.ReservationView.perform_create', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.post(url, self.data, format="json", headers=headers)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        claim = IdempotencyKey.objects.create(
+            customer=self.customer, key_hash=hashlib.sha256(b'create-3').hexdigest(),
+            fingerprint='', expires_at=now() + timedelta(days=1))
+
+        response = self.client.post(url, self.data, format="json", headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        IdempotencyKey.objects.filter(pk=claim.pk).update(
+            fingerprint=hashlib.sha256(
+                f"POST:{url}:{json.dumps(self.data, sort_keys=True)}".encode()).hexdigest())
+        response = self.client.post(url, self.data, format="json", headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Reservation.objects.count(), 0)
+
+        # 처리 중에 중단되어 잠금 시간이 지난 요청은 다시 처리한다.
+        IdempotencyKey.objects.filter(pk=claim.pk).update(created_at=now() - timedelta(minutes=5))
+        response = self.client.post(url, self.data, format="json", headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_keys_are_scoped_per_customer(self):
+        """
+        다른 고객이 같은 키를 사용해도 각각 처리되는지 확인
+        """
+        url = reverse('reservations')
+        headers = {'Idempotency-Key': 'shared-key'}
+
+        self.client.force_authenticate(self.customer)
+        self.client.post(url, self.data, format="json", headers=headers)
+        self.client.force_authenticate(self.other_customer)
+        self.client.post(url, self.data, format="json", headers=headers)
+
+        self.assertEqual(Reservation.objects.count(), 2)
+
+    def test_confirm_retry_is_replayed(self):
+        """
+        예약 확정을 같은 키로 재시도하면 저장된 응답이 반환되는지 확인
+        """
+        self.client.force_authenticate(self.admin_customer)
+        reservation = self.create_reservation()
+        url = reverse('reservation-confirm', args=[reservation.id])
+        headers = {'Idempotency-Key': 'confirm-1'}
+
+        first = self.client.post(url, headers=headers)
+        second = self.client.post(url, headers=headers)
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+
+    def test_retry_replays_response_headers(self):
+        """
+        재시도 응답이 첫 번째 응답의 ETag를 그대로 반환하는지 확인
+        """
+        self.client.force_authenticate(self.admin_customer)
+        reservation = self.create_reservation()
+        url = reverse('reservation-confirm', args=[reservation.id])
+        headers = {'Idempotency-Key': 'confirm-2'}
+
+        first = self.client.post(url, headers=headers)
+        second = self.client.post(url, headers=headers)
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertTrue(first['ETag'])
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+
+    def test_expired_keys_are_pruned(self):
+        """
+        만료된 Idempotency-Key를 정리하고, 만료된 키는 새 요청으로 처리하는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        url = reverse('reservations')
+        headers = {'Idempotency-Key': 'create-4'}
+        self.client.post(url, self.data, format="json", headers=headers)
+        IdempotencyKey.objects.update(expires_at=now())
+
+        response = self.client.post(url, self.data, format="json", headers=headers)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Reservation.objects.count(), 2)
+
+        IdempotencyKey.objects.update(expires_at=now())
+        self.assertEqual(prune_idempotency_keys(), 1)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+
+class ReservationSlotStreamTestCase(ReservationFixtureMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('reservation-available-slots-stream')
+        self.headers = {
+            'Authorization': f"Bearer {RefreshToken.for_user(self.customer).access_token}"}
+
+    @staticmethod
+    def parse_event(chunk: bytes) -> list[dict]:
+        event, data = chunk.decode().strip().split('\n')
+        assert event == 'event: slots'
+        return json.loads(data.removeprefix('data: '))
+
+    async def test_stream_requires_authentication(self):
+        """
+        인증하지 않으면 구독할 수 없는지 확인
+        """
+        response = await self.async_client.get(self.url, {'date': self.date.isoformat()})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_rejects_date_outside_window(self):
+        """
+        예약 가능 기간을 벗어난 날짜는 구독할 수 없는지 확인
+        """
+        response = await self.async_client.get(
+            self.url, {'date': (self.date + timedelta(days=30)).isoformat()}, headers=self.headers)
+        self.assertEqual(response.status_code, 400)
+
+    async def test_stream_pushes_updated_slots(self):
+        """
+        연결 직후 현재 예약 가능 시간을 보내고, 변경이 발행되면 새 예약 가능 시간을 보내는지 확인
+        """
+        response = await self.async_client.get(
+            self.url, {'date': self.date.isoformat()}, headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        stream = aiter(response.streaming_content)
+        slots = self.parse_event(await anext(stream))
+        self.assertEqual(slots[0]['remaining'], RESERVATION_NUM_OF_PARTICIPANTS_LIMIT)
+
+        await sync_to_async(self.create_reservation)(
+            num_of_participants=100, status=ReservationStatus.CONFIRMED)
+        # 변경한 요청은 커밋된 뒤 캐시를 비우고 변경을 발행한다.
+        await sync_to_async(cache.delete)(f"available_slots:{self.date}")
+        await sync_to_async(get_broadcaster().publish)(self.date)
+
+        slots = self.parse_event(await asyncio.wait_for(anext(stream), timeout=5))
+        self.assertEqual(slots[0]['remaining'], RESERVATION_NUM_OF_PARTICIPANTS_LIMIT - 100)
+        self.assertEqual(slots[1]['remaining'], RESERVATION_NUM_OF_PARTICIPANTS_LIMIT)
+
+    async def test_broadcaster_computes_slots_once_per_date(self):
+        """
+        구독자가 여러 명이어도 슬롯은 발행한 쪽이 아닌 구독자의 event loop에서 한 번만 계산하고,
+        구독자가 없는 날짜는 계산하지 않는지 확인
+        """
+        broadcaster = SlotBroadcaster(LocalPubSub())
+        queues = [broadcaster.subscribe(self.date) for _ in range(3)]
+
+        with patch('reservations.broadcast.compute_available_slots', return_value=[]) as mock_compute:
+            broadcaster.publish(self.date)
+            broadcaster.publish(self.date)
+            broadcaster.publish(self.date + timedelta(days=1))
+            mock_compute.assert_not_called()
+
+            for queue in queues:
+                self.assertEqual(await asyncio.wait_for(queue.get(), timeout=5), [])
+                broadcaster.unsubscribe(self.date, queue)
+
+        mock_compute.assert_called_once_with(self.date)
+        self.assertEqual(broadcaster.subscriber_count(self.date), 0)
+
+    def test_confirm_publishes_after_commit(self):
+        """
+        예약을 확정하면 트랜잭션 커밋 후 해당 날짜의 변경이 발행되는지 확인
+        """
+        reservation = self.create_reservation(num_of_participants=100)
+        self.client.force_login(self.admin_customer)
+
+        with patch.object(get_broadcaster(), 'publish') as mock_publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    reverse('reservation-confirm', kwargs={'pk': reservation.id}))
+                mock_publish.assert_not_called()
+
+        self.assertEqual(response.status_code, 200)
+        mock_publish.assert_called_once_with(self.date)
+
+    def test_publish_failure_does_not_fail_committed_write(self):
+        """
+        커밋된 뒤 변경 발행이 실패해도 요청은 성공하고, 다른 날짜의 변경은 발행되는지 확인
+        """
+        reservation = self.create_reservation(num_of_participants=100)
+        self.client.force_login(self.admin_customer)
+
+        with patch.object(get_broadcaster(), 'publish', side_effect=RuntimeError):
+            with self.assertLogs('reservations.broadcast', 'ERROR'), self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    reverse('reservation-confirm', kwargs={'pk': reservation.id}))
+        self.assertEqual(response.status_code, 200)
+
+        other_date = self.date + timedelta(days=1)
+        with patch.object(get_broadcaster(), 'publish', side_effect=[RuntimeError, None]) as mock_publish:
+            with self.assertLogs('reservations.broadcast', 'ERROR'), self.captureOnCommitCallbacks(execute=True):
+                publish_slots_changed(self.date, other_date)
+        self.assertEqual(mock_publish.call_count, 2)
+
+
+class AvailableSlotsWarmingTestCase(ReservationFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.today = now().date()
+        for num_of_participants in (100, 200):
+            self.create_reservation(
+                end_hour=11, num_of_participants=num_of_participants, status=ReservationStatus.CONFIRMED)
+
+    def test_warm_caches_every_bookable_date_with_one_query(self):
+        """
+        예약 가능한 모든 날짜와 내일 새로 열릴 날짜의 예약 가능 시간을 한 번의 쿼리로 캐시하는지 확인
+        """
+        dates = bookable_dates(self.today) + [self.today + timedelta(days=16)]
+        available_slots_versions(dates)
+
+        # 예약 가능 시간을 읽는 쿼리와, 읽기 전후로 모든 날짜의 변경 카운터를 한 번씩 읽는 쿼리
+        with self.assertNumQueries(3):
+            warmed = warm_available_slots(self.today)
+
+        self.assertEqual(warmed, len(dates))
+        for date in dates:
+            self.assertIsNotNone(cache.get(f"available_slots:{date}"))
+
+        slots = cache.get(f"available_slots:{self.date}")
+        self.assertEqual(slots[0]['remaining'], RESERVATION_NUM_OF_PARTICIPANTS_LIMIT - 300)
+        self.assertEqual(slots[1]['remaining'], RESERVATION_NUM_OF_PARTICIPANTS_LIMIT - 300)
+        self.assertEqual(slots[2]['remaining'], RESERVATION_NUM_OF_PARTICIPANTS_LIMIT)
+
+    def test_warm_skips_dates_changed_while_reading(self):
+        """
+        읽는 동안 예약 가능 시간이 바뀐 날짜는 캐시에 저장하지 않는지 확인
+        """
+        def build_and_change(reservations):
+            if not touched:
+                # 읽은 뒤 다른 요청이 예약을 확정하고 캐시를 비운 경우
+                touched.append(self.date)
+                touch_available_slots(self.date)
+            return build_available_slots(reservations)
+
+        touched = []
+        with patch('reservations.warming.build_available_slots', side_effect=build_and_change):
+            warmed = warm_available_slots(self.today)
+
+        self.assertEqual(warmed, len(bookable_dates(self.today)))
+        self.assertIsNone(cache.get(f"available_slots:{self.date}"))
+        self.assertIsNotNone(cache.get(f"available_slots:{self.date + timedelta(days=1)}"))
+
+    def test_warm_caches_held_dates_until_hold_expires(self):
+        """
+        hold가 있는 날짜는 hold를 반영하고, hold가 만료될 때까지만 캐시하는지 확인
+        """
+        ReservationHold.objects.create(
+            customer=self.customer, date=self.date, start_time=time(9), end_time=time(10),
+            num_of_participants=1000, expires_at=now() + timedelta(seconds=60))
+
+        warm_available_slots(self.today)
+
+        slots = cache.get(f"available_slots:{self.date}")
+        self.assertEqual(slots[0]['remaining'], RESERVATION_NUM_OF_PARTICIPANTS_LIMIT - 1300)
+        with patch('time.time', return_value=time_module.time() + 61):
+            self.assertIsNone(cache.get(f"available_slots:{self.date}"))
+            self.assertIsNotNone(cache.get(f"available_slots:{self.date + timedelta(days=1)}"))
+
+    def test_available_slots_served_from_warm_cache(self):
+        """
+        캐시를 미리 저장한 뒤에는 예약 가능 시간 조회가 DB를 사용하지 않는지 확인
+        """
+        out = StringIO()
+        call_command('warm_available_slots', stdout=out)
+        self.assertIn(f"{len(bookable_dates()) + 1}일", out.getvalue())
+
+        self.client.force_authenticate(self.customer)
+        with patch('reservations.utils.compute_available_slots_until') as mock_compute:
+            response = self.client.get(
+                reverse('reservation-available-slots') + f"?date={self.date.isoformat()}")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_compute.assert_not_called()
+        self.assertEqual(response.data[0]['remaining'], RESERVATION_NUM_OF_PARTICIPANTS_LIMIT - 300)
+
+    def test_next_warm_waits_at_most_until_midnight(self):
+        """
+        자정 전에는 자정 직후까지만 기다리는지 확인
+        """
+        self.assertEqual(
+            seconds_until_next_warm(3600, datetime.datetime(2025, 5, 1, 10, 0)), 3600)
+        self.assertEqual(
+            seconds_until_next_warm(3600, datetime.datetime(2025, 5, 1, 23, 50)), 601)
+
+    def test_scheduler_starts_only_from_server_entrypoint(self):
+        """
+        앱을 불러올 때는 scheduler를 시작하지 않고, 서버 진입점에서 간격을 지정한 경우에만 시작하는지 확인
+        """
+        with patch('reservations.warming.start_warm_scheduler') as mock_start:
+            with override_settings(AVAILABLE_SLOTS_WARM_INTERVAL=600):
+                django_apps.get_app_config('reservations').ready()
+                mock_start.assert_not_called()
+
+                start_configured_warm_scheduler()
+                mock_start.assert_called_once_with(600)
+
+            self.assertIsNone(start_configured_warm_scheduler())
+            mock_start.assert_called_once()
+
+
+@override_settings(RESERVATION_CHANGES_LAG_SECONDS=0)
+class ReservationChangesTestCase(ReservationFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('reservation-changes')
+
+    def get_changes(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_changes_since_cursor(self):
+        """
+        cursor 이후의 생성/수정/삭제만 변경 순서대로 반환하는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        first = self.create_reservation(self.customer, start_hour=9, end_hour=10)
+        second = self.create_reservation(self.customer, start_hour=10, end_hour=11)
+        self.create_reservation(self.other_customer, start_hour=11, end_hour=12)
+
+        data = self.get_changes()
+        self.assertEqual([(change['type'], change['id']) for change in data['changes']],
+                         [('created', str(first.id)), ('created', str(second.id))])
+        self.assertFalse(data['has_more'])
+
+        first.title = "수정된 시험"
+        first.save()
+        second_id = second.id
+        second.delete()
+
+        data = self.get_changes(since=data['next_cursor'])
+        self.assertEqual([(change['type'], change['id']) for change in data['changes']],
+                         [('updated', str(first.id)), ('deleted', str(second_id))])
+        self.assertEqual(data['changes'][0]['reservation']['title'], "수정된 시험")
+        self.assertIsNone(data['changes'][1]['reservation'])
+
+        cursor = data['next_cursor']
+        data = self.get_changes(since=cursor)
+        self.assertEqual(data['changes'], [])
+        self.assertEqual(data['next_cursor'], cursor)
+
+    def test_changes_are_paginated_by_limit(self):
+        """
+        limit보다 변경이 많으면 has_more와 next_cursor로 이어서 받을 수 있는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        reservations = [
+            self.create_reservation(self.customer, start_hour=hour, end_hour=hour + 1) for hour in (9, 10, 11)
+        ]
+
+        received = []
+        cursor = None
+        while True:
+            data = self.get_changes(limit=2, **({'since': cursor} if cursor else {}))
+            received += [change['id'] for change in data['changes']]
+            cursor = data['next_cursor']
+            if not data['has_more']:
+                break
+
+        self.assertEqual(received, [str(reservation.id) for reservation in reservations])
+
+    def test_admin_receives_every_customer_changes(self):
+        """
+        어드민은 모든 고객의 변경을 받는지 확인
+        """
+        self.create_reservation(self.customer, start_hour=9, end_hour=10)
+        self.create_reservation(self.other_customer, start_hour=10, end_hour=11).delete()
+
+        self.client.force_authenticate(self.admin_customer)
+        data = self.get_changes()
+        self.assertEqual([change['type'] for change in data['changes']], ['created', 'deleted'])
+
+    def test_confirm_appears_as_update(self):
+        """
+        예약을 확정하면 변경 피드에 수정으로 나타나는지 확인
+        """
+        reservation = self.create_reservation(self.customer)
+        self.client.force_authenticate(self.customer)
+        cursor = self.get_changes()['next_cursor']
+
+        self.client.force_authenticate(self.admin_customer)
+        self.client.post(reverse('reservation-confirm', kwargs={'pk': reservation.id}))
+
+        self.client.force_authenticate(self.customer)
+        data = self.get_changes(since=cursor)
+        self.assertEqual(len(data['changes']), 1)
+        self.assertEqual(data['changes'][0]['type'], 'updated')
+        self.assertEqual(data['changes'][0]['reservation']['status'], ReservationStatus.CONFIRMED)
+
+    @override_settings(RESERVATION_CHANGES_LAG_SECONDS=60)
+    def test_recent_changes_are_delayed(self):
+        """
+        커밋되지 않았을 수 있는 최근 변경은 다음 조회로 미루는지 확인
+        """
+        self.create_reservation(self.customer)
+        self.client.force_authenticate(self.customer)
+        self.assertEqual(self.get_changes()['changes'], [])
+
+    def test_invalid_and_expired_cursor(self):
+        """
+        잘못된 cursor는 400, 삭제 기록 보관 기간보다 오래된 cursor는 410을 반환하는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        response = self.client.get(self.url, {'since': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        expired = Cursor(now() - timedelta(days=31), Reservation().id).encode()
+        response = self.client.get(self.url, {'since': expired})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_prune_tombstones(self):
+        """
+        보관 기간이 지난 삭제 기록이 정리되는지 확인
+        """
+        self.create_reservation(self.customer, start_hour=9, end_hour=10).delete()
+        self.create_reservation(self.customer, start_hour=10, end_hour=11).delete()
+        ReservationTombstone.objects.filter(
+            id=ReservationTombstone.objects.earliest('id').id).update(deleted_at=now() - timedelta(days=31))
+
+        call_command('archive_reservations', stdout=StringIO())
+        self.assertEqual(ReservationTombstone.objects.count(), 1)
+
+
+class _RecordingSink:
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+
+    def send(self, events):
+        if self.fail:
+            raise ConnectionError('sink is down')
+        self.batches.append(events)
+
+
+class ReservationOutboxTestCase(ReservationFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.data = {
+            "title": "테스트 시험",
+            "date": self.date.isoformat(),
+            "start_time": "09:00:00",
+            "end_time": "10:00:00",
+            "num_of_participants": 10,
+        }
+
+    def post_reservation(self) -> str:
+        self.client.force_authenticate(self.customer)
+        response = self.client.post(reverse('reservations'), self.data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data['id']
+
+    def test_reservation_changes_are_recorded(self):
+        """
+        예약 생성/수정/확정/삭제가 순서대로 outbox에 저장되는지 확인
+        """
+        reservation_id = self.post_reservation()
+        url = reverse('reservation-detail', kwargs={'pk': reservation_id})
+        self.client.patch(url, {**self.data, 'title': '수정된 시험'}, format='json')
+
+        self.client.force_authenticate(self.admin_customer)
+        self.client.post(reverse('reservation-confirm', kwargs={'pk': reservation_id}))
+        self.client.delete(url)
+
+        events = list(OutboxEvent.objects.order_by('id'))
+        self.assertEqual([event.event_type for event in events], [
+            OutboxEventType.CREATED, OutboxEventType.UPDATED, OutboxEventType.CONFIRMED, OutboxEventType.DELETED])
+        self.assertTrue(all(str(event.reservation_id) == reservation_id for event in events))
+        self.assertEqual(events[1].payload['title'], '수정된 시험')
+        self.assertEqual(events[2].payload['status'], ReservationStatus.CONFIRMED)
+
+    def test_event_is_rolled_back_with_reservation(self):
+        """
+        이벤트를 저장하지 못하면 예약도 저장되지 않는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        with patch('reservations.views.record_event', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.post(reverse('reservations'), self.data, format='json')
+
+        self.assertFalse(Reservation.objects.exists())
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_dispatch_to_file_in_batches(self):
+        """
+        이벤트가 배치 단위로 파일에 전달되고, 전달된 이벤트는 다시 전달되지 않는지 확인
+        """
+        for _ in range(3):
+            self.post_reservation()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'outbox.jsonl'
+            out = StringIO()
+            call_command('dispatch_outbox', sink='file', path=str(path), batch_size=2, stdout=out)
+            self.assertIn("3건", out.getvalue())
+
+            lines = [json.loads(line) for line in path.read_text().splitlines()]
+            self.assertEqual([line['type'] for line in lines], [OutboxEventType.CREATED] * 3)
+
+            call_command('dispatch_outbox', sink='file', path=str(path), stdout=StringIO())
+            self.assertEqual(len(path.read_text().splitlines()), 3)
+
+        self.assertFalse(OutboxEvent.objects.filter(dispatched_at__isnull=True).exists())
+
+    def test_failed_dispatch_is_retried_after_backoff(self):
+        """
+        전달에 실패하면 재시도 시각까지 기다렸다가 같은 이벤트를 다시 전달하는지 확인
+        """
+        self.post_reservation()
+
+        self.assertEqual(dispatch_outbox(_RecordingSink(fail=True)), 0)
+        event = OutboxEvent.objects.get()
+        self.assertIsNone(event.dispatched_at)
+        self.assertEqual(event.attempts, 1)
+        self.assertGreater(event.next_attempt_at, now())
+
+        sink = _RecordingSink()
+        self.assertEqual(dispatch_outbox(sink), 0)
+
+        OutboxEvent.objects.update(next_attempt_at=now())
+        self.assertEqual(dispatch_outbox(sink), 1)
+        self.assertEqual(sink.batches[0][0]['id'], event.id)
+
+    def test_sink_is_called_outside_transaction(self):
+        """
+        sink에 보내는 동안 트랜잭션(행 잠금)을 잡고 있지 않는지 확인
+        """
+        self.post_reservation()
+        depth = len(connection.atomic_blocks)
+        depths = []
+
+        class Sink:
+            def send(self, events):
+                depths.append(len(connection.atomic_blocks))
+
+        self.assertEqual(dispatch_outbox(Sink()), 1)
+        self.assertEqual(depths, [depth])
+
+    def test_admin_changes_are_recorded(self):
+        """
+        어드민에서 추가/수정/삭제한 예약도 outbox에 저장되는지 확인
+        """
+        model_admin = ReservationAdmin(Reservation, admin.site)
+        request = RequestFactory().post('/')
+        request.user = self.admin_customer
+        reservation = Reservation(customer=self.customer, **{**self.data, 'date': self.date})
+        model_admin.save_model(request, reservation, None, False)
+        reservation.title = '수정된 시험'
+        model_admin.save_model(request, reservation, Mock(changed_data=['title']), True)
+        reservation_id = reservation.id
+        other = self.create_reservation()
+        model_admin.delete_model(request, reservation)
+        model_admin.delete_queryset(request, Reservation.objects.filter(id=other.id))
+
+        events = list(OutboxEvent.objects.order_by('id').values_list('event_type', 'reservation_id'))
+        self.assertEqual(events, [
+            (OutboxEventType.CREATED, reservation_id), (OutboxEventType.UPDATED, reservation_id),
+            (OutboxEventType.DELETED, reservation_id), (OutboxEventType.DELETED, other.id)])
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_full_queue_applies_backpressure(self):
+        """
+        queue가 가득 차면 이벤트를 전달하지 않고 나중에 다시 시도하는지 확인
+        """
+        self.post_reservation()
+        self.post_reservation()
+
+        sink = QueueSink(maxsize=1)
+        self.assertEqual(dispatch_outbox(sink), 0)
+        self.assertEqual(sink.queue.qsize(), 0)
+        self.assertEqual(OutboxEvent.objects.filter(dispatched_at__isnull=True).count(), 2)
+
+
+class ReservationAdminTestCase(ReservationFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('admin:reservations_reservation_changelist')
+        self.client.force_login(self.admin_customer)
+
+    def create_reservations(self, customer: Customer, count: int, num_of_participants: int = 10):
+        return [
+            self.create_reservation(
+                customer, title=f"{customer.company_name} 시험 {i}", num_of_participants=num_of_participants)
+            for i in range(count)
+        ]
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """
+        목록의 고객 열이 예약 수만큼 추가 쿼리를 만들지 않는지 확인
+        """
+        self.create_reservations(self.customer, 2)
+        with CaptureQueriesContext(connection) as few:
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        self.create_reservations(self.other_customer, 10)
+        with CaptureQueriesContext(connection) as many:
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        self.assertEqual(len(few), len(many))
+
+    def test_filter_and_search(self):
+        """
+        고객 필터와 회사명/제목 검색이 동작하는지 확인
+        """
+        self.create_reservations(self.customer, 2)
+        self.create_reservations(self.other_customer, 3)
+
+        response = self.client.get(self.url, {'customer': self.customer.pk})
+        self.assertEqual(response.context['cl'].result_count, 2)
+        self.assertContains(response, 'customer-autocomplete-filter')
+
+        response = self.client.get(self.url, {'q': 'kakao'})
+        self.assertEqual(response.context['cl'].result_count, 3)
+
+        response = self.client.get(self.url, {'q': '"programmers 시험"'})
+        self.assertEqual(response.context['cl'].result_count, 2)
+
+    def test_bulk_confirm_checks_capacity(self):
+        """
+        일괄 확정이 수용 인원을 넘는 예약은 확정하지 않는지 확인
+        """
+        reservations = self.create_reservations(
+            self.customer, 2, num_of_participants=RESERVATION_NUM_OF_PARTICIPANTS_LIMIT // 2 + 1)
+
+        response = self.client.post(self.url, {
+            'action': 'confirm_selected',
+            '_selected_action': [reservation.pk for reservation in reservations],
+        }, follow=True)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Reservation.objects.filter(status=ReservationStatus.CONFIRMED).count(), 1)
+        self.assertContains(response, '1건을 확정했습니다')
+        self.assertContains(response, '1건을 확정하지 못했습니다')
+
+    def test_confirm_view_checks_capacity(self):
+        """
+        수용 인원을 넘는 예약은 확정 API로도 확정할 수 없는지 확인
+        """
+        first, second = self.create_reservations(
+            self.customer, 2, num_of_participants=RESERVATION_NUM_OF_PARTICIPANTS_LIMIT // 2 + 1)
+
+        self.client.force_authenticate(self.admin_customer)
+        response = self.client.post(reverse('reservation-confirm', args=[first.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(reverse('reservation-confirm', args=[second.id]))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        second.refresh_from_db()
+        self.assertEqual(second.status, ReservationStatus.PENDING)
+
+
+class ReservationVersionTestCase(ReservationFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.reservation = self.create_reservation()
+        self.url = reverse('reservation-detail', args=[self.reservation.id])
+        self.client.force_authenticate(self.admin_customer)
+
+    def test_update_with_matching_etag(self):
+        """
+        조회한 ETag를 If-Match로 보내면 수정되고 새 ETag를 반환하는지 확인
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response['ETag'], '"1"')
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(
+                self.url, {"title": "변경된 테스트 시험"}, format="json", HTTP_IF_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], '"2"')
+        self.assertEqual(response.data['version'], 2)
+
+        updates = [query['sql'] for query in context.captured_queries
+                   if query['sql'].startswith('UPDATE "reservations_reservation"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"version" = 1', updates[0])
+
+    def test_stale_if_match_returns_412(self):
+        """
+        다른 요청이 먼저 수정한 뒤 이전 ETag로 수정/삭제/확정하면 412를 반환하는지 확인
+        """
+        etag = self.client.get(self.url)['ETag']
+        self.client.patch(self.url, {"title": "먼저 수정한 시험"}, format="json", HTTP_IF_MATCH=etag)
+
+        response = self.client.patch(self.url, {"title": "나중에 수정한 시험"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        response = self.client.delete(self.url, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        response = self.client.post(reverse('reservation-confirm', args=[self.reservation.id]), HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+        self.reservation.refresh_from_db()
+        self.assertEqual(self.reservation.title, "먼저 수정한 시험")
+        self.assertEqual(self.reservation.status, ReservationStatus.PENDING)
+
+        response = self.client.delete(self.url, HTTP_IF_MATCH='"2"')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Reservation.objects.filter(id=self.reservation.id).exists())
+
+    def test_concurrent_save_raises_conflict(self):
+        """
+        같은 version을 읽은 두 요청 중 나중에 저장하는 요청이 덮어쓰지 않는지 확인
+        """
+        first = Reservation.objects.get(id=self.reservation.id)
+        second = Reservation.objects.get(id=self.reservation.id)
+
+        first.title = "첫 번째 수정"
+        first.save(update_fields=['title', 'updated_at'], expected_version=first.version)
+        second.title = "두 번째 수정"
+        with self.assertRaises(ReservationVersionConflict):
+            second.save(update_fields=['title', 'updated_at'], expected_version=second.version)
+
+        self.reservation.refresh_from_db()
+        self.assertEqual(self.reservation.title, "첫 번째 수정")
+        self.assertEqual(self.reservation.version, 2)
+
+    def test_unconditional_save_increments_version(self):
+        """
+        조건 없이 저장해도 version이 증가하여 이전 ETag가 더 이상 일치하지 않는지 확인
+        """
+        stale = Reservation.objects.get(id=self.reservation.id)
+        self.reservation.title = "어드민에서 수정한 시험"
+        self.reservation.save()
+        stale.save()
+
+        self.assertEqual(stale.version, 3)
+        response = self.client.patch(self.url, {"title": "변경된 테스트 시험"}, format="json", HTTP_IF_MATCH='"2"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+
+class ReservationConditionalGetTestCase(ReservationFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.reservation = self.create_reservation(self.customer)
+
+    def create_reservation(self, *args, **kwargs) -> Reservation:
+        # 예약 목록의 ETag는 커밋된 뒤에 바뀐다.
+        with self.captureOnCommitCallbacks(execute=True):
+            return super().create_reservation(*args, **kwargs)
+
+    def test_detail_not_modified_reads_only_version(self):
+        """
+        단일 예약이 바뀌지 않았으면 version만 읽고 304를 반환하는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        url = reverse('reservation-detail', args=[self.reservation.id])
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('Authorization', response['Vary'])
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+        self.client.patch(url, {"title": "변경된 테스트 시험"}, format="json")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        self.client.force_authenticate(self.other_customer)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_etag_changes_with_customer_reservations(self):
+        """
+        예약 목록의 ETag가 고객의 예약이 바뀔 때만 바뀌는지 확인
+        """
+        url = reverse('reservations')
+        self.client.force_authenticate(self.customer)
+        customer_etag = self.client.get(url)['ETag']
+        self.client.force_authenticate(self.admin_customer)
+        admin_etag = self.client.get(url)['ETag']
+        self.assertNotEqual(customer_etag, admin_etag)
+
+        # 예약 목록은 읽지 않고 변경 카운터만 읽는다.
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=admin_etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.create_reservation(self.other_customer)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=admin_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.client.force_authenticate(self.customer)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=customer_etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_counters_survive_cache_clear(self):
+        """
+        ETag 변경 카운터가 캐시가 아닌 DB에서 올라가, 캐시를 비워도 이전 ETag로 돌아가지 않는지 확인
+        """
+        etag = available_slots_etag(self.date)
+        touch_available_slots(self.date)
+        touch_available_slots(self.date)
+        cache.clear()
+
+        self.assertNotEqual(available_slots_etag(self.date), etag)
+        self.assertEqual(
+            ChangeCounter.objects.get(key=f"available_slots:{self.date}").value,
+            int(etag.strip('"').rsplit('-', 1)[1]) + 2)
+
+    def test_available_slots_etag_changes_with_confirm(self):
+        """
+        예약 가능 시간의 ETag가 날짜의 수용 인원이 바뀔 때 바뀌는지 확인
+        """
+        url = reverse('reservation-available-slots') + f'?date={self.reservation.date.isoformat()}'
+        self.client.force_authenticate(self.customer)
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('s-maxage', response['Cache-Control'])
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=f'W/{etag}')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.force_authenticate(self.admin_customer)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('reservation-confirm', args=[self.reservation.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['remaining'], RESERVATION_NUM_OF_PARTICIPANTS_LIMIT - 10)
+
+
+class ReservationCheckTestCase(ReservationFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.customer)
+        self.url = reverse('reservation-check')
+
+    def window(self, start_hour: int, end_hour: int, num_of_participants: int, date=None) -> dict:
+        return {
+            "date": (date or self.date).isoformat(),
+            "start_time": time(start_hour).strftime('%H:%M:%S'),
+            "end_time": time(end_hour).strftime('%H:%M:%S'),
+            "num_of_participants": num_of_participants,
+        }
+
+    def test_check_windows_in_one_query(self):
+        """
+        여러 시간 범위의 예약 가능 여부를 예약을 만들지 않고 한 번의 쿼리로 확인하는지 확인
+        """
+        self.create_reservation(
+            start_hour=9, end_hour=12, num_of_participants=RESERVATION_NUM_OF_PARTICIPANTS_LIMIT - 100, status=ReservationStatus.CONFIRMED)
+        windows = [
+            self.window(10, 11, 100),
+            self.window(11, 13, 101),
+            self.window(12, 13, RESERVATION_NUM_OF_PARTICIPANTS_LIMIT),
+            self.window(10, 11, 1, date=now().date() + timedelta(days=1)),
+            self.window(8, 10, 1),
+        ]
+
+        with self.assertNumQueries(1):
+            response = self.client.post(self.url, {"windows": windows}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual([result['available'] for result in results], [True, False, True, False, False])
+        self.assertEqual([result['remaining'] for result in results],
+                         [100, 100, RESERVATION_NUM_OF_PARTICIPANTS_LIMIT, None, None])
+        self.assertEqual(results[1]['detail'], '예약 가능한 인원 수를 초과했습니다.')
+        self.assertEqual(results[3]['detail'], '예약은 오늘을 기준으로 3일 후부터 15일 후까지 가능합니다.')
+        self.assertEqual(results[4]['detail'], '올바른 시간을 입력해주세요.')
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_capacity_is_counted_per_hour(self):
+        """
+        시간이 겹치지 않는 예약은 함께 세지 않아, 확인 결과와 예약 생성 결과가 같은지 확인
+        """
+        self.create_reservation(
+            start_hour=9, end_hour=10, num_of_participants=RESERVATION_NUM_OF_PARTICIPANTS_LIMIT // 2, status=ReservationStatus.CONFIRMED)
+        self.create_reservation(
+            start_hour=11, end_hour=12, num_of_participants=RESERVATION_NUM_OF_PARTICIPANTS_LIMIT // 2, status=ReservationStatus.CONFIRMED)
+        window = self.window(9, 12, RESERVATION_NUM_OF_PARTICIPANTS_LIMIT // 2)
+
+        response = self.client.post(self.url, {"windows": [window]}, format="json")
+        self.assertTrue(response.data['results'][0]['available'])
+
+        response = self.client.post(reverse('reservations'), {"title": "테스트 시험", **window}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_too_many_windows(self):
+        """
+        한 번에 확인할 수 있는 시간 범위 수를 넘으면 실패하는지 확인
+        """
+        response = self.client.post(self.url, {"windows": [self.window(9, 10, 1)] * 101}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, {"windows": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ReservationSuggestionsTestCase(ReservationFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.customer)
+        self.url = reverse('reservation-suggestions')
+        # 9시부터 12시까지는 가득 차 있고, 12시부터 13시까지는 10명만 남아 있다.
+        for start_hour, end_hour, num_of_participants in [
+            (9, 12, RESERVATION_NUM_OF_PARTICIPANTS_LIMIT),
+            (12, 13, RESERVATION_NUM_OF_PARTICIPANTS_LIMIT - 10),
+        ]:
+            self.create_reservation(
+                start_hour=start_hour, end_hour=end_hour, num_of_participants=num_of_participants,
+                status=ReservationStatus.CONFIRMED)
+
+    def test_sliding_window_min(self):
+        """
+        sliding window 최솟값이 구간마다 직접 계산한 최솟값과 같은지 확인
+        """
+        values = [5, 3, 8, 8, 1, 9, 2, 7, 7]
+        for width in range(1, len(values) + 1):
+            self.assertEqual(
+                sliding_window_min(values, width),
+                [min(values[i:i + width]) for i in range(len(values) - width + 1)])
+
+    def test_suggest_nearest_windows(self):
+        """
+        원하는 일시에 가까운 예약 가능한 시간 범위를 한 번의 쿼리로 추천하는지 확인
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {
+                'num_of_participants': 20, 'hours': 2, 'limit': 3,
+                'date': self.date.isoformat(), 'start_time': '10:00',
+            })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(item['date'], item['start_time'], item['end_time']) for item in response.data],
+            [
+                (self.date.isoformat(), '13:00:00', '15:00:00'),
+                (self.date.isoformat(), '14:00:00', '16:00:00'),
+                (self.date.isoformat(), '15:00:00', '17:00:00'),
+            ])
+        self.assertEqual(response.data[0]['remaining'], RESERVATION_NUM_OF_PARTICIPANTS_LIMIT)
+
+        response = self.client.get(self.url, {
+            'num_of_participants': 10, 'hours': 1, 'limit': 1,
+            'date': self.date.isoformat(), 'start_time': '11:00',
+        })
+        self.assertEqual(response.data[0]['start_time'], '12:00:00')
+        self.assertEqual(response.data[0]['remaining'], 10)
+
+    def test_suggest_earliest_windows_without_preference(self):
+        """
+        원하는 일시가 없으면 가장 이른 시간 범위부터 추천하는지 확인
+        """
+        response = self.client.get(self.url, {'num_of_participants': 1, 'hours': 9, 'limit': 20})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['date'], (now().date() + timedelta(days=3)).isoformat())
+        self.assertEqual(response.data[0]['start_time'], '09:00:00')
+        self.assertNotIn(self.date.isoformat(), [item['date'] for item in response.data])
+        self.assertEqual(len(response.data), 12)
+
+        response = self.client.get(self.url, {'num_of_participants': 1, 'hours': 10})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ReservationPlanningTestCase(ReservationFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('reservation-plan')
+        self.client.force_authenticate(self.admin_customer)
+
+    def test_solve_keeps_each_hour_within_capacity(self):
+        """
+        계획한 예약이 시간마다 수용 인원을 넘지 않고, 목표에 따라 다른 예약을 고르는지 확인
+        """
+        limit = RESERVATION_NUM_OF_PARTICIPANTS_LIMIT
+        candidates = [
+            Candidate('large', self.date, 9, 11, limit - 5000),
+            Candidate('small-1', self.date, 10, 12, 10000),
+            Candidate('small-2', self.date, 10, 11, 10000),
+            Candidate('other', self.date, 11, 13, 30000),
+        ]
+        occupancy = {self.date: [0] * HOURS_PER_DAY}
+
+        plan = solve(candidates, occupancy, 'participants')
+        self.assertEqual(plan.confirm, ['large', 'other'])
+        self.assertEqual(plan.skip, ['small-1', 'small-2'])
+        self.assertEqual(plan.participants, limit - 5000 + 30000)
+
+        plan = solve(candidates, occupancy, 'reservations')
+        self.assertEqual(plan.confirm, ['small-1', 'small-2', 'other'])
+        self.assertEqual(plan.skip, ['large'])
+
+        # 이미 확정된 예약이 있는 시간에는 남은 인원만큼만 확정한다.
+        occupancy[self.date][11] = limit - 30000
+        plan = solve(candidates, occupancy, 'participants')
+        by_id = {candidate.id: candidate for candidate in candidates}
+        for hour in range(HOURS_PER_DAY):
+            planned = sum(
+                by_id[id].num_of_participants for id in plan.confirm
+                if by_id[id].start_hour <= hour < by_id[id].end_hour)
+            self.assertLessEqual(occupancy[self.date][hour] + planned, limit)
+        self.assertEqual(plan.confirm, ['large', 'other'])
+
+    def test_plan_does_not_change_reservations(self):
+        """
+        apply 없이 계획만 계산하면 예약 상태가 바뀌지 않는지 확인
+        """
+        self.create_reservation(start_hour=9, end_hour=10, num_of_participants=20000, status=ReservationStatus.CONFIRMED)
+        first = self.create_reservation(start_hour=9, end_hour=11, num_of_participants=20000)
+        second = self.create_reservation(start_hour=10, end_hour=12, num_of_participants=40000)
+
+        response = self.client.post(self.url, {
+            'date_from': self.date.isoformat(), 'date_to': self.date.isoformat(),
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['confirm'], [str(second.id)])
+        self.assertEqual(response.data['skip'], [str(first.id)])
+        self.assertIsNone(response.data['applied'])
+        self.assertEqual(Reservation.objects.filter(status=ReservationStatus.PENDING).count(), 2)
+
+        self.client.force_authenticate(self.customer)
+        response = self.client.post(self.url, {
+            'date_from': self.date.isoformat(), 'date_to': self.date.isoformat(),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_apply_plan_confirms_planned_reservations(self):
+        """
+        apply하면 계획한 예약만 확정되고, 시간마다 수용 인원을 넘지 않는지 확인
+        """
+        reservations = [
+            self.create_reservation(start_hour=9 + i % 3, end_hour=11 + i % 3, num_of_participants=10000 + 1000 * i)
+            for i in range(8)
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, {
+                'date_from': self.date.isoformat(), 'date_to': self.date.isoformat(), 'apply': True,
+            }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['applied'], {
+            'confirmed': len(response.data['confirm']), 'rejected': 0, 'conflicted': 0})
+        confirmed = set(
+            str(id) for id in Reservation.objects.filter(status=ReservationStatus.CONFIRMED).values_list('id', flat=True))
+        self.assertEqual(confirmed, set(response.data['confirm']))
+        self.assertEqual(len(confirmed) + len(response.data['skip']), len(reservations))
+        for hour in range(9, 18):
+            self.assertLessEqual(
+                Reservation.confirmed_num_of_participants_in_time_range(self.date, time(hour), time(hour + 1)),
+                RESERVATION_NUM_OF_PARTICIPANTS_LIMIT)
+
+        out = StringIO()
+        call_command('plan_confirmations', '--from', self.date.isoformat(), '--to', self.date.isoformat(), stdout=out)
+        self.assertIn(f"{len(response.data['skip'])}건 중 0건", out.getvalue())
+
+    def test_apply_plan_batches_id_lists(self):
+        """
+        확정할 예약이 많아도 예약과 hold를 id 목록을 나눠서 읽고 지우는지 확인
+        """
+        for _ in range(5):
+            reservation = self.create_reservation(num_of_participants=100)
+            ReservationHold.objects.create(
+                customer=self.customer, date=self.date, start_time=time(9), end_time=time(10),
+                num_of_participants=100, expires_at=now() + timedelta(minutes=10), reservation=reservation)
+        plan = plan_confirmations(self.date, self.date)
+
+        with patch('reservations.services.ID_BATCH_SIZE', 2), CaptureQueriesContext(connection) as queries:
+            result = apply_plan(plan)
+
+        self.assertEqual(len(result.confirmed), 5)
+        self.assertFalse(ReservationHold.objects.exists())
+        hold_queries = [
+            query['sql'] for query in queries if '"reservations_reservationhold"."reservation_id" IN' in query['sql']]
+        self.assertEqual(len([sql for sql in hold_queries if sql.startswith('SELECT')]), 3)
+        self.assertEqual(len([sql for sql in hold_queries if sql.startswith('DELETE')]), 3)
+
+
+class ReservationSimulationTestCase(ReservationFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('reservation-simulate')
+        self.client.force_authenticate(self.admin_customer)
+
+    def test_simulate_hourly_occupancy(self):
+        """
+        확정된 예약과 확정할 예약의 시간별 참가자 수를 두 번의 쿼리로 계산하고, 넘치는 시간을 표시하는지 확인
+        """
+        self.create_reservation(start_hour=9, end_hour=11, num_of_participants=30000, status=ReservationStatus.CONFIRMED)
+        proposed = [
+            self.create_reservation(start_hour=10, end_hour=12, num_of_participants=15000),
+            self.create_reservation(start_hour=10, end_hour=13, num_of_participants=10000),
+            self.create_reservation(
+                start_hour=9, end_hour=10, num_of_participants=1000, date=self.date + timedelta(days=1)),
+        ]
+        ignored = self.create_reservation(start_hour=9, end_hour=18, num_of_participants=40000)
+
+        with self.assertNumQueries(2):
+            response = self.client.post(
+                self.url, {'ids': [reservation.id for reservation in proposed]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['overflow'])
+        first, second = response.data['dates']
+        self.assertEqual(first['date'], self.date.isoformat())
+        self.assertTrue(first['overflow'])
+        hours = {hour['hour']: hour for hour in first['hours']}
+        self.assertEqual(hours[9], {'hour': 9, 'confirmed': 30000, 'proposed': 0, 'occupancy': 30000, 'overflow': False})
+        self.assertEqual(hours[10], {
+            'hour': 10, 'confirmed': 30000, 'proposed': 25000, 'occupancy': 55000, 'overflow': True})
+        self.assertEqual(hours[11]['occupancy'], 25000)
+        self.assertEqual(hours[12]['occupancy'], 10000)
+        self.assertEqual([hour['hour'] for hour in first['hours']], list(range(9, 18)))
+        self.assertFalse(second['overflow'])
+
+        # 날짜로 지정하면 기간 안의 확정 대기중 예약을 모두 더한다.
+        response = self.client.post(self.url, {
+            'date_from': self.date.isoformat(), 'date_to': self.date.isoformat(),
+        }, format='json')
+        self.assertEqual(len(response.data['dates']), 1)
+        self.assertEqual(response.data['dates'][0]['hours'][-1]['proposed'], ignored.num_of_participants)
+        self.assertEqual(Reservation.objects.filter(status=ReservationStatus.PENDING).count(), 4)
+
+    def test_simulate_requires_admin_and_selection(self):
+        """
+        어드민만 사용할 수 있고, 확정할 예약을 지정해야 하는지 확인
+        """
+        response = self.client.post(self.url, {'date_from': self.date.isoformat()}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, {}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(self.customer)
+        response = self.client.post(self.url, {'ids': [str(uuid.uuid4())]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ReservationHoldTestCase(ReservationFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('reservation-holds')
+        self.create_reservation(
+            self.other_customer, end_hour=11, num_of_participants=RESERVATION_NUM_OF_PARTICIPANTS_LIMIT - 10000,
+            status=ReservationStatus.CONFIRMED)
+
+    def window(self, num_of_participants, start_hour=10, end_hour=11):
+        return {
+            'date': self.date.isoformat(), 'start_time': f'{start_hour:02}:00', 'end_time': f'{end_hour:02}:00',
+            'num_of_participants': num_of_participants,
+        }
+
+    def test_hold_counts_against_capacity(self):
+        """
+        hold가 확정된 예약과 같이 수용 인원에 포함되고, 취소하면 돌려주는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        response = self.client.post(self.url, self.window(10000), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        hold_id = response.data['id']
+        self.assertIsNotNone(response.data['expires_at'])
+
+        self.client.force_authenticate(self.other_customer)
+        response = self.client.post(self.url, self.window(1), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(reverse('reservations'), {'title': "시험", **self.window(1)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(reverse('reservation-available-slots') + f'?date={self.date.isoformat()}')
+        self.assertEqual(response.data[1]['remaining'], 0)
+        # 다른 고객의 hold는 취소할 수 없다.
+        response = self.client.delete(reverse('reservation-hold-detail', args=[hold_id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(self.customer)
+        response = self.client.delete(reverse('reservation-hold-detail', args=[hold_id]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.client.force_authenticate(self.other_customer)
+        response = self.client.post(self.url, self.window(1), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_create_reservation_with_hold(self):
+        """
+        예약을 만들 때 자신의 hold를 한 번만 사용할 수 있는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        hold_id = self.client.post(self.url, self.window(10000), format='json').data['id']
+
+        self.client.force_authenticate(self.other_customer)
+        response = self.client.post(
+            reverse('reservations'), {'title': "시험", 'hold': hold_id, **self.window(10000)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(self.customer)
+        response = self.client.post(
+            reverse('reservations'), {'title': "시험", 'hold': hold_id, **self.window(10000, 10, 12)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(
+            reverse('reservations'), {'title': "시험", 'hold': hold_id, **self.window(10000)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(str(ReservationHold.objects.get(id=hold_id).reservation_id), response.data['id'])
+
+        response = self.client.post(
+            reverse('reservations'), {'title': "시험", 'hold': hold_id, **self.window(10000)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        # 사용한 hold는 취소할 수 없다.
+        response = self.client.delete(reverse('reservation-hold-detail', args=[hold_id]))
+        self.assertTrue(ReservationHold.objects.filter(id=hold_id).exists())
+
+    def test_used_hold_keeps_capacity_until_confirmed(self):
+        """
+        hold로 만든 예약은 확정될 때까지 hold의 인원을 잡아두고, 확정할 때 hold를 두 번 세지 않는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        hold_id = self.client.post(self.url, self.window(10000), format='json').data['id']
+        reservation_id = self.client.post(
+            reverse('reservations'), {'title': "시험", 'hold': hold_id, **self.window(10000)}, format='json').data['id']
+
+        # 확정 대기중인 예약이 hold의 인원을 계속 잡고 있다.
+        self.client.force_authenticate(self.other_customer)
+        response = self.client.post(self.url, self.window(1), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(reverse('reservation-available-slots') + f'?date={self.date.isoformat()}')
+        self.assertEqual(response.data[1]['remaining'], 0)
+
+        self.client.force_authenticate(self.admin_customer)
+        response = self.client.post(reverse('reservation-confirm', args=[reservation_id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(ReservationHold.objects.exists())
+        self.assertEqual(
+            Reservation.confirmed_num_of_participants_in_time_range(self.date, time(10), time(11)),
+            RESERVATION_NUM_OF_PARTICIPANTS_LIMIT)
+
+    def test_used_hold_is_released_with_reservation(self):
+        """
+        hold로 만든 예약을 삭제하면 hold의 인원을 돌려주는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        hold_id = self.client.post(self.url, self.window(10000), format='json').data['id']
+        reservation_id = self.client.post(
+            reverse('reservations'), {'title': "시험", 'hold': hold_id, **self.window(10000)}, format='json').data['id']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(reverse('reservation-detail', args=[reservation_id]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(ReservationHold.objects.exists())
+
+        self.client.force_authenticate(self.other_customer)
+        response = self.client.post(self.url, self.window(10000), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_expired_hold_changes_available_slots(self):
+        """
+        hold가 만료되면 캐시와 ETag가 바뀌어, 돌려준 인원이 예약 가능 시간에 반영되는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        self.client.post(self.url, self.window(10000), format='json')
+        url = reverse('reservation-available-slots') + f'?date={self.date.isoformat()}'
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertEqual(response.data[1]['remaining'], 0)
+
+        # hold가 만료된 뒤에 조회한다.
+        ReservationHold.objects.update(expires_at=now() - timedelta(seconds=1))
+        later = time_module.time() + settings.RESERVATION_HOLD_TTL_SECONDS + 1
+        with patch('time.time', return_value=later), \
+                patch('django.utils.timezone.now', return_value=datetime.datetime.fromtimestamp(later, tz=datetime.UTC)):
+            # hold를 반영한 캐시는 hold가 만료될 때까지만 남는다.
+            self.assertIsNone(cache.get(f"available_slots:{self.date}"))
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.get(url)
+            self.assertEqual(response.data[1]['remaining'], 10000)
+
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_expired_holds_are_not_counted(self):
+        """
+        만료된 hold는 수용 인원에 포함되지 않고, sweeper가 정리하는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        hold_id = self.client.post(self.url, self.window(10000), format='json').data['id']
+        ReservationHold.objects.filter(id=hold_id).update(expires_at=now() - timedelta(seconds=1))
+
+        self.assertEqual(
+            Reservation.confirmed_num_of_participants_in_time_range(self.date, time(10), time(11)),
+            RESERVATION_NUM_OF_PARTICIPANTS_LIMIT - 10000)
+        response = self.client.post(
+            reverse('reservations'), {'title': "시험", 'hold': hold_id, **self.window(10000)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        out = StringIO()
+        etag = available_slots_etag(self.date)
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('sweep_pending_reservations', stdout=out)
+        self.assertIn("만료된 hold 1건", out.getvalue())
+        self.assertFalse(ReservationHold.objects.exists())
+        self.assertNotEqual(available_slots_etag(self.date), etag)
+
+
+class ReservationSeriesTestCase(ReservationFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.start_date = now().date() + timedelta(days=3)
+        self.url = reverse('reservation-series')
+        self.client.force_authenticate(self.customer)
+
+    def series(self, **kwargs):
+        return {
+            'title': "주간 시험", 'start_date': self.start_date.isoformat(), 'start_time': '10:00',
+            'end_time': '12:00', 'num_of_participants': 10000, 'frequency': 'daily', 'interval': 2, 'count': 5,
+            **kwargs,
+        }
+
+    def test_create_series(self):
+        """
+        반복 예약을 수용 인원 조회 한 번과 bulk_create로 만드는지 확인
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, self.series(), format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [item['date'] for item in response.data],
+            [(self.start_date + timedelta(days=days)).isoformat() for days in (0, 2, 4, 6, 8)])
+        self.assertEqual(len({item['series_id'] for item in response.data}), 1)
+        self.assertEqual(
+            len([query for query in queries if query['sql'].startswith('SELECT')]), 1)
+        self.assertEqual(
+            len([query for query in queries if query['sql'].startswith('INSERT')]), 2)
+        self.assertEqual(OutboxEvent.objects.filter(event_type=OutboxEventType.CREATED).count(), 5)
+
+        # count와 until이 없으면 예약 가능 기간 끝까지 반복한다.
+        payload = self.series(frequency='weekly', interval=1)
+        del payload['count']
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(len(response.data), 2)
+
+    def test_create_series_validates_every_occurrence(self):
+        """
+        반복되는 날짜가 하나라도 예약 가능 기간을 벗어나거나 수용 인원을 넘으면 하나도 만들지 않는지 확인
+        """
+        response = self.client.post(self.url, self.series(count=8), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(
+            self.url, self.series(count=None, until=(self.start_date + timedelta(days=13)).isoformat()),
+            format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        full_date = self.start_date + timedelta(days=4)
+        self.create_reservation(
+            self.admin_customer, date=full_date, start_hour=11, end_hour=12,
+            num_of_participants=RESERVATION_NUM_OF_PARTICIPANTS_LIMIT - 5000, status=ReservationStatus.CONFIRMED)
+        response = self.client.post(self.url, self.series(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['dates'], [full_date])
+        self.assertFalse(Reservation.objects.filter(series_id__isnull=False).exists())
+
+    def test_confirm_and_cancel_series_as_a_unit(self):
+        """
+        반복 예약이 하나라도 확정될 수 없으면 하나도 확정되지 않고, 함께 확정/취소되는지 확인
+        """
+        series_id = self.client.post(self.url, self.series(count=3), format='json').data[0]['series_id']
+        blocking = self.create_reservation(
+            self.admin_customer, date=self.start_date + timedelta(days=2), start_hour=10, end_hour=11,
+            num_of_participants=RESERVATION_NUM_OF_PARTICIPANTS_LIMIT, status=ReservationStatus.CONFIRMED)
+
+        self.client.force_authenticate(self.admin_customer)
+        confirm_url = reverse('reservation-series-confirm', args=[series_id])
+        response = self.client.post(confirm_url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['dates'], [blocking.date])
+        self.assertFalse(Reservation.objects.filter(series_id=series_id, status=ReservationStatus.CONFIRMED).exists())
+        self.assertFalse(OutboxEvent.objects.filter(event_type=OutboxEventType.CONFIRMED).exists())
+
+        blocking.delete()
+        response = self.client.post(confirm_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            Reservation.objects.filter(series_id=series_id, status=ReservationStatus.CONFIRMED).count(), 3)
+
+        self.client.force_authenticate(self.customer)
+        cancel_url = reverse('reservation-series-cancel', args=[series_id])
+        response = self.client.post(cancel_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(self.admin_customer)
+        response = self.client.post(cancel_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            Reservation.objects.filter(series_id=series_id, status=ReservationStatus.CANCELLED).count(), 3)
+        self.assertEqual({item['version'] for item in response.data}, {3})
+
+        response = self.client.post(reverse('reservation-series-cancel', args=[uuid.uuid4()]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_confirm_series_clears_slots_cache_after_commit(self):
+        """
+        반복 예약 확정이 커밋된 뒤에만 예약 가능 시간 캐시를 비우고, 되돌린 확정은 캐시를 비우지 않는지 확인
+        """
+        series_id = self.client.post(self.url, self.series(count=2), format='json').data[0]['series_id']
+        blocking = self.create_reservation(
+            self.admin_customer, date=self.start_date + timedelta(days=2), start_hour=10, end_hour=11,
+            num_of_participants=RESERVATION_NUM_OF_PARTICIPANTS_LIMIT, status=ReservationStatus.CONFIRMED)
+        key = f"available_slots:{self.start_date}"
+        cache.set(key, [])
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            result = confirm_series(series_id)
+        self.assertEqual(result.confirmed, [])
+        self.assertEqual(callbacks, [])
+        self.assertIsNotNone(cache.get(key))
+
+        blocking.delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            result = confirm_series(series_id)
+            self.assertEqual(len(result.confirmed), 2)
+            self.assertIsNotNone(cache.get(key))
+        self.assertIsNone(cache.get(key))
+
+    def test_create_series_checks_capacity_after_locking_dates(self):
+        """
+        반복 예약이 날짜를 잠근 트랜잭션 안에서 수용 인원을 확인하는지 확인
+        """
+        depth = len(connection.atomic_blocks)
+        calls = []
+
+        def read_occupancy(dates):
+            calls.append(('read', len(connection.atomic_blocks) > depth))
+            return confirmed_hourly_occupancy(dates)
+
+        with (
+            patch('reservations.services.lock_dates',
+                  side_effect=lambda dates: calls.append(('lock', len(connection.atomic_blocks) > depth))),
+            patch('reservations.services.confirmed_hourly_occupancy', side_effect=read_occupancy),
+        ):
+            reservations = create_series(
+                self.customer, "주간 시험", [self.start_date], time(10), time(12), 10000)
+
+        self.assertEqual(len(reservations), 1)
+        self.assertEqual(calls, [('lock', True), ('read', True)])
+
+
+class ReservationBatchGetTestCase(ReservationFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('reservation-batch-get')
+        self.reservations = [
+            self.create_reservation(title=f"시험 {i}", start_hour=9 + i, end_hour=10 + i) for i in range(3)
+        ]
+        self.other_reservation = self.create_reservation(self.other_customer, title="다른 시험")
+
+    def test_batch_get_own_reservations_in_one_query(self):
+        """
+        자신의 예약을 요청한 순서대로 한 번의 쿼리로 조회하는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        ids = [str(reservation.id) for reservation in reversed(self.reservations)]
+
+        with self.assertNumQueries(1):
+            response = self.client.post(self.url, {'ids': ids + ids[:1]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['reservations']], ids)
+        self.assertEqual(response.data['reservations'][0]['customer'], str(self.customer))
+        self.assertEqual(response.data['missing'], [])
+        self.assertEqual(response.data['forbidden'], [])
+
+    def test_batch_get_reports_missing_and_forbidden(self):
+        """
+        존재하지 않는 예약과 다른 고객의 예약을 구분하여 알려주는지 확인
+        """
+        missing_id = str(uuid.uuid4())
+        ids = [str(self.reservations[0].id), str(self.other_reservation.id), missing_id]
+
+        self.client.force_authenticate(self.customer)
+        response = self.client.post(self.url, {'ids': ids}, format='json')
+        self.assertEqual([item['id'] for item in response.data['reservations']], ids[:1])
+        self.assertEqual(response.data['forbidden'], [ids[1]])
+        self.assertEqual(response.data['missing'], [missing_id])
+
+        self.client.force_authenticate(self.admin_customer)
+        response = self.client.post(self.url, {'ids': ids}, format='json')
+        self.assertEqual([item['id'] for item in response.data['reservations']], ids[:2])
+        self.assertEqual(response.data['forbidden'], [])
+
+        response = self.client.post(self.url, {'ids': [str(uuid.uuid4()) for _ in range(201)]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ReservationListFilterTestCase(ReservationFixtureMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('reservations')
+        self.reservations = {
+            name: self.create_reservation(
+                customer, title=title, date=self.date + timedelta(days=days), start_hour=start_hour,
+                end_hour=end_hour, status=status)
+            for name, title, customer, days, start_hour, end_hour, status in [
+                ('morning', "Python 코딩 테스트", self.customer, 0, 9, 11, ReservationStatus.PENDING),
+                ('afternoon', "Java 코딩 테스트", self.customer, 0, 14, 16, ReservationStatus.CONFIRMED),
+                ('later', "Python 면접", self.customer, 3, 10, 12, ReservationStatus.PENDING),
+                ('other', "SQL 코딩 테스트", self.other_customer, 0, 11, 13, ReservationStatus.PENDING),
+            ]
+        }
+
+    def list_names(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        names = {str(reservation.id): name for name, reservation in self.reservations.items()}
+        return {names[item['id']] for item in response.data['results']}
+
+    def test_filter_reservations(self):
+        """
+        날짜 범위, 상태, 시간 범위, 제목으로 예약 목록을 거르는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+        self.assertEqual(self.list_names(), {'morning', 'afternoon', 'later'})
+        self.assertEqual(self.list_names(date_from=self.date.isoformat(), date_to=self.date.isoformat()),
+                         {'morning', 'afternoon'})
+        self.assertEqual(self.list_names(status=ReservationStatus.PENDING), {'morning', 'later'})
+        self.assertEqual(self.list_names(start_time='10:00', end_time='12:00'), {'morning', 'later'})
+        self.assertEqual(self.list_names(end_time='10:00'), {'morning'})
+        self.assertEqual(self.list_names(title='Python'), {'morning', 'later'})
+        self.assertEqual(self.list_names(q='코딩 테'), {'morning', 'afternoon'})
+        self.assertEqual(self.list_names(q='python'), {'morning', 'later'})
+
+        self.assertEqual(self.client.get(self.url, {'q': 'py'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'status': 'DONE'}).status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'customer': self.other_customer.pk})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(self.admin_customer)
+        self.assertEqual(self.list_names(customer=self.other_customer.pk), {'other'})
+        self.assertEqual(
+            self.list_names(status=[ReservationStatus.PENDING, ReservationStatus.CONFIRMED], start_time='11:00',
+                            end_time='15:00'),
+            {'afternoon', 'later', 'other'})
+
+    def assert_index_scan(self, sql):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # 행이 적으면 인덱스가 있어도 seq scan을 고르므로, 사용할 수 있는 인덱스가 있는지만 확인한다.
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute(f'EXPLAIN {sql}')
+                plan = '\n'.join(row[0] for row in cursor.fetchall())
+                self.assertNotIn('Seq Scan on reservations_reservation', plan)
+            else:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plan = '\n'.join(row[-1] for row in cursor.fetchall())
+                # SCAN은 인덱스를 사용하더라도 인덱스 전체를 읽는다.
+                self.assertNotRegex(plan, r'SCAN reservations_reservation\b')
+
+    def test_filter_query_plans(self):
+        """
+        필터 조합마다 예약 테이블 전체를 읽지 않고 인덱스로 찾는지 확인
+        """
+        date_range = {'date_from': self.date.isoformat(), 'date_to': self.date.isoformat()}
+        cases = [
+            (self.customer, {}),
+            (self.customer, date_range),
+            (self.customer, {'status': ReservationStatus.PENDING}),
+            (self.customer, {'start_time': '10:00', 'end_time': '12:00'}),
+            (self.customer, {'title': 'Python'}),
+            (self.customer, {'q': '코딩 테스트'}),
+            (self.admin_customer, date_range),
+            (self.admin_customer, {**date_range, 'start_time': '10:00', 'end_time': '12:00'}),
+            (self.admin_customer, {'status': ReservationStatus.PENDING}),
+            (self.admin_customer, {**date_range, 'status': ReservationStatus.PENDING}),
+            (self.admin_customer, {'customer': self.customer.pk, 'q': '코딩 테스트'}),
+        ]
+        if connection.vendor == 'postgresql':
+            # 제목만으로 거르는 경우는 PostgreSQL의 pattern/trigram 인덱스를 사용한다.
+            cases += [
+                (self.admin_customer, {'title': 'Python'}),
+                (self.admin_customer, {'q': '코딩 테스트'}),
+            ]
+
+        for customer, params in cases:
+            with self.subTest(user=customer.company_name, params=params):
+                self.client.force_authenticate(customer)
+                with CaptureQueriesContext(connection) as queries:
+                    self.client.get(self.url, params)
+                statements = [
+                    query['sql'] for query in queries
+                    if query['sql'].startswith('SELECT') and 'reservations_reservation' in query['sql']
+                ]
+                self.assertEqual(len(statements), 2)
+                for sql in statements:
+                    self.assert_index_scan(sql)
+
+    def test_sparse_fieldsets(self):
+        """
+        fields로 고른 필드만 응답하고, 필요한 컬럼만 읽으며 고객을 함께 읽지 않는지 확인
+        """
+        self.client.force_authenticate(self.customer)
+
+        def list_with_sql(fields):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.url, {'fields': fields})
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+            sql = [query['sql'] for query in queries if 'ORDER BY' in query['sql']]
+            self.assertEqual(len(sql), 1)
+            return response.data['results'], sql[0]
+
+        results, sql = list_with_sql('id,date,start_time,end_time,status')
+        self.assertEqual(len(results), 3)
+        for item in results:
+            self.assertEqual(list(item), ['id', 'date', 'start_time', 'end_time', 'status'])
+        self.assertNotIn('customers_customer', sql)
+        for column in ('title', 'num_of_participants', 'created_at', 'version'):
+            self.assertNotIn(f'"reservations_reservation"."{column}"', sql)
+
+        results, sql = list_with_sql('status_display, customer,id,id')
+        self.assertEqual(list(results[0]), ['id', 'status_display', 'customer'])
+        self.assertEqual(results[0]['customer'], 'programmers')
+        self.assertIn('"customers_customer"."company_name"', sql)
+        self.assertNotIn('"customers_customer"."password"', sql)
+
+        for fields in ('id,password', 'hold', ','):
+            with self.subTest(fields=fields):
+                response = self.client.get(self.url, {'fields': fields})
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,11 +1,27 @@
 from django.urls import path
 
-from reservations.views import ReservationAvailableSlotsView, ReservationConfirmView, ReservationView
+from reservations.views import (
+    ReservationAvailableSlotsStreamView, ReservationAvailableSlotsView, ReservationBatchGetView, ReservationChangesView,
+    ReservationCheckView, ReservationConfirmView, ReservationHoldViewSet, ReservationPlanView,
+    ReservationSeriesCancelView, ReservationSeriesConfirmView, ReservationSeriesView, ReservationSimulationView,
+    ReservationSuggestionsView, ReservationView,
+)
 
 
 urlpatterns = [
     path('', ReservationView.as_view(
         {'get': 'list', 'post': 'create'}), name='reservations'),
+    path('batch-get/', ReservationBatchGetView.as_view(), name='reservation-batch-get'),
+    path('changes/', ReservationChangesView.as_view(), name='reservation-changes'),
+    path('check/', ReservationCheckView.as_view(), name='reservation-check'),
+    path('suggestions/', ReservationSuggestionsView.as_view(), name='reservation-suggestions'),
+    path('plan/', ReservationPlanView.as_view(), name='reservation-plan'),
+    path('simulate/', ReservationSimulationView.as_view(), name='reservation-simulate'),
+    path('series/', ReservationSeriesView.as_view(), name='reservation-series'),
+    path('series/<uuid:series_id>/confirm/', ReservationSeriesConfirmView.as_view(), name='reservation-series-confirm'),
+    path('series/<uuid:series_id>/cancel/', ReservationSeriesCancelView.as_view(), name='reservation-series-cancel'),
+    path('holds/', ReservationHoldViewSet.as_view({'post': 'create'}), name='reservation-holds'),
+    path('holds/<uuid:pk>/', ReservationHoldViewSet.as_view({'delete': 'destroy'}), name='reservation-hold-detail'),
     path('<uuid:pk>/',
          ReservationView.as_view(
              {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}),
@@ -14,4 +30,6 @@ urlpatterns = [
          ReservationConfirmView.as_view(), name='reservation-confirm'),
     path('available-slots/',
          ReservationAvailableSlotsView.as_view(), name='reservation-available-slots'),
+    path('available-slots/stream/',
+         ReservationAvailableSlotsStreamView.as_view(), name='reservation-available-slots-stream'),
 ]
@@ -1,8 +1,25 @@
 
 import datetime
+import itertools
+import logging
+import math
 from typing import TypedDict
 
-from reservations.models import RESERVATION_NUM_OF_PARTICIPANTS_LIMIT, Reservation
+from django.core.cache import cache
+from django.utils import timezone
+
+from examscheduler.routers import read_from_primary
+from reservations.etags import expire_available_slots_at
+from reservations.models import (
+    RESERVATION_CLOSING_HOUR, RESERVATION_NUM_OF_PARTICIPANTS_LIMIT, RESERVATION_OPENING_HOUR,
+    RESERVATION_WINDOW_END_DAYS, RESERVATION_WINDOW_START_DAYS, Reservation, ReservationHold, ReservationStatus,
+)
+from reservations.serializers import ReservationSlotSerializer
+
+
+logger = logging.getLogger(__name__)
+
+AVAILABLE_SLOTS_CACHE_TIMEOUT = 60 * 60
 
 
 class Slot(TypedDict):
@@ -21,7 +38,7 @@ def get_available_slots() -> list[Slot]:
         list[Slot]: 초기 슬롯 리스트
     """
     available_slots = []
-    for i in range(9, 18):
+    for i in range(RESERVATION_OPENING_HOUR, RESERVATION_CLOSING_HOUR):
         available_slots.append({
             'start_time': datetime.time(i, 0),
             'end_time': datetime.time(i+1, 0),
@@ -42,3 +59,109 @@ def is_slot_in_reservation(slot: Slot, reservation: Reservation) -> bool:
     """
     return reservation.start_time <= slot['start_time'] < reservation.end_time or \
         reservation.start_time < slot['end_time'] <= reservation.end_time
+
+
+def bookable_dates(today: datetime.date | None = None) -> list[datetime.date]:
+    """오늘을 기준으로 예약 가능한 날짜들을 반환합니다.
+
+    Args:
+        today (datetime.date, optional): 기준 날짜. 기본값은 오늘입니다.
+
+    Returns:
+        list[datetime.date]: 3일 후부터 15일 후까지의 날짜
+    """
+    today = today or datetime.datetime.now().date()
+    return [
+        today + datetime.timedelta(days=days)
+        for days in range(RESERVATION_WINDOW_START_DAYS, RESERVATION_WINDOW_END_DAYS + 1)
+    ]
+
+
+def build_available_slots(reservations) -> list[dict]:
+    """확정된 예약들을 반영한 예약 가능 시간을 직렬화하여 반환합니다.
+
+    Args:
+        reservations (Iterable[Reservation | ReservationHold]): 같은 날짜의 확정된 예약과 hold
+
+    Returns:
+        list[dict]: 직렬화된 슬롯 리스트
+    """
+    slots = get_available_slots()
+    for reservation in reservations:
+        for slot in slots:
+            if is_slot_in_reservation(slot, reservation):
+                slot['remaining'] = max(
+                    0, slot['remaining'] - reservation.num_of_participants)
+
+    return ReservationSlotSerializer(slots, many=True).data
+
+
+def compute_available_slots(date: datetime.date) -> list[dict]:
+    """확정된 예약과 만료되지 않은 hold를 반영하여 날짜의 예약 가능 시간을 계산합니다.
+
+    Args:
+        date (datetime.date): 조회할 날짜
+
+    Returns:
+        list[dict]: 직렬화된 슬롯 리스트
+    """
+    return compute_available_slots_until(date)[0]
+
+
+def compute_available_slots_until(date: datetime.date) -> tuple[list[dict], datetime.datetime | None]:
+    """날짜의 예약 가능 시간과, 반영한 hold 중 가장 먼저 만료되는 시각을 계산합니다.
+
+    hold가 만료되면 예약 가능 시간이 바뀌므로, 계산한 값은 반환한 시각까지만 유효합니다.
+
+    Returns:
+        tuple[list[dict], datetime.datetime | None]: 직렬화된 슬롯 리스트와 hold 만료 시각. hold가 없으면 None입니다.
+    """
+    holds = list(ReservationHold.objects.active().filter(date=date))
+    slots = build_available_slots(itertools.chain(
+        Reservation.objects.filter(date=date, status=ReservationStatus.CONFIRMED),
+        holds,
+    ))
+    return slots, min((hold.expires_at for hold in holds), default=None)
+
+
+def available_slots_cache_timeout(valid_until: datetime.datetime | None) -> int:
+    """예약 가능 시간 캐시의 유효 시간(초)을 반환합니다.
+
+    hold는 만료될 때 캐시를 비우지 않으므로, hold를 반영한 값은 hold가 만료될 때까지만 캐시합니다.
+
+    Args:
+        valid_until (datetime.datetime | None): 반영한 hold 중 가장 먼저 만료되는 시각
+    """
+    if valid_until is None:
+        return AVAILABLE_SLOTS_CACHE_TIMEOUT
+    return max(1, min(AVAILABLE_SLOTS_CACHE_TIMEOUT, math.ceil((valid_until - timezone.now()).total_seconds())))
+
+
+def get_cached_available_slots(date: datetime.date) -> list[dict]:
+    """캐시된 예약 가능 시간을 반환하거나, 새로 계산하여 캐시한 뒤 반환합니다.
+
+    캐시는 확정된 예약이 생성/수정/삭제되거나 hold를 잡고 돌려줄 때마다 비워지며,
+    hold를 반영한 값은 hold가 만료될 때까지만 캐시합니다.
+    캐시한 값은 모든 고객이 읽으므로, replica에서 조회하는 요청이더라도 primary에서 계산합니다.
+    (replica 지연으로 캐시를 비운 직후 쓰기 이전의 예약 가능 시간을 캐시하지 않습니다.)
+
+    Args:
+        date (datetime.date): 조회할 날짜
+
+    Returns:
+        list[dict]: 직렬화된 슬롯 리스트
+    """
+    cache_key = f"available_slots:{date}"
+    cached_slots = cache.get(cache_key)
+
+    if cached_slots:
+        logger.debug("returning cached slots for date %s", date,
+                     extra={'event': 'cache_hit'})
+        return cached_slots
+
+    with read_from_primary():
+        slots, valid_until = compute_available_slots_until(date)
+    cache.set(cache_key, slots, timeout=available_slots_cache_timeout(valid_until))
+    if valid_until is not None:
+        expire_available_slots_at({date: valid_until})
+    return slots
@@ -1,72 +1,242 @@
+import asyncio
 import datetime
+import json
 import logging
 from uuid import UUID
 
-from django.core.cache import cache
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
 
-from rest_framework import generics, permissions, viewsets, status
-from rest_framework.exceptions import ValidationError
+from rest_framework import generics, mixins, permissions, viewsets, status
+from rest_framework.exceptions import AuthenticationFailed, PermissionDenied, ValidationError
 from rest_framework.request import Request
 from rest_framework.response import Response
 
 from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiParameter
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework.utils.encoders import JSONEncoder
 
 from customers.models import Customer
 from customers.permissions import IsOwnerOrAdmin
-from reservations.models import RESERVATION_NUM_OF_PARTICIPANTS_LIMIT, Reservation, ReservationStatus
-from reservations.serializers import ReservationConfirmSerializer, ReservationSerializer, ReservationSlotSerializer, is_date_within_three_to_fifteen_days_from_today
-from reservations.utils import get_available_slots, is_slot_in_reservation
+from examscheduler.conditional import (
+    IF_MATCH_PARAMETER, IF_NONE_MATCH_PARAMETER, cache_headers, if_match_failed, if_none_match_hit, make_etag, not_modified,
+    precondition_failed,
+)
+from examscheduler.idempotency import IDEMPOTENCY_KEY_PARAMETER, idempotent
+from examscheduler.routers import ReplicaReadMixin, replica_reads
+from reservations.broadcast import get_broadcaster
+from reservations.capacity import CAPACITY_EXCEEDED_MESSAGE, check_windows, simulate_confirmations, suggest_windows
+from reservations.changes import Cursor, ExpiredCursor, InvalidCursor, fetch_changes
+from reservations.etags import available_slots_etag, reservation_list_etag
+from reservations.models import (
+    RESERVATION_NUM_OF_PARTICIPANTS_LIMIT, RESERVATION_OPENING_HOUR, OutboxEventType, Reservation, ReservationHold,
+    ReservationStatus, ReservationVersionConflict,
+)
+from reservations.outbox import record_event
+from reservations.planning import apply_plan, plan_confirmations
+from reservations.services import (
+    CapacityExceeded, SeriesAlreadyConfirmed, cancel_series, clear_available_slots_cache, confirm_reservations,
+    confirm_series, create_series, notify_expired_holds, release_hold, release_reservation_holds, take_hold,
+)
+from reservations.serializers import (
+    BATCH_GET_MAX_IDS, CHECK_MAX_WINDOWS, SIMULATION_MAX_IDS, SPARSE_FIELD_COLUMNS, SUGGESTIONS_DEFAULT_LIMIT,
+    SUGGESTIONS_MAX_LIMIT, TITLE_SEARCH_MIN_LENGTH,
+    ConfirmationPlanRequestSerializer, ConfirmationPlanSerializer, ReservationBatchGetResultSerializer,
+    ReservationBatchGetSerializer, ReservationChangesSerializer, ReservationListFilterSerializer,
+    ReservationCheckResultsSerializer, ReservationCheckSerializer, ReservationConfirmSerializer, ReservationHoldSerializer,
+    ReservationSerializer, ReservationSeriesSerializer,
+    ReservationSimulationResultSerializer, ReservationSimulationSerializer, ReservationSlotSerializer,
+    ReservationSuggestionQuerySerializer, ReservationSuggestionSerializer,
+    is_date_within_three_to_fifteen_days_from_today,
+)
+from reservations.utils import get_cached_available_slots
 
 logger = logging.getLogger(__name__)
 
+CHANGES_DEFAULT_LIMIT = 100
+CHANGES_MAX_LIMIT = 500
+
 
 @extend_schema_view(
     list=extend_schema(
         summary="예약 목록 조회",
         description="페이지네이션 처리된 예약 목록을 조회합니다. </br> \
-            어드민은 모든 예약을 볼 수 있고, 고객은 자신의 예약만 볼 수 있습니다."),
+            어드민은 모든 예약을 볼 수 있고, 고객은 자신의 예약만 볼 수 있습니다. </br> \
+            날짜 범위, 상태, 시간 범위, 제목으로 거를 수 있으며, 어드민은 고객으로도 거를 수 있습니다. </br> \
+            fields를 지정하면 그 필드만 응답하고, 필요한 컬럼만 읽습니다. (customer가 없으면 고객을 함께 읽지 않습니다.) </br> \
+            응답의 ETag를 If-None-Match로 보내면, 그 뒤로 예약 목록이 바뀌지 않은 경우 본문 없이 304를 반환합니다.",
+        parameters=[
+            IF_NONE_MATCH_PARAMETER,
+            OpenApiParameter(name='date_from', type=str, location=OpenApiParameter.QUERY,
+                             description='이 날짜 이후의 예약 (포함, 예: YYYY-MM-DD)'),
+            OpenApiParameter(name='date_to', type=str, location=OpenApiParameter.QUERY,
+                             description='이 날짜 이전의 예약 (포함, 예: YYYY-MM-DD)'),
+            OpenApiParameter(name='status', type=str, location=OpenApiParameter.QUERY, many=True,
+                             enum=ReservationStatus.values, description='예약 상태. 여러 번 지정할 수 있습니다.'),
+            OpenApiParameter(name='start_time', type=str, location=OpenApiParameter.QUERY,
+                             description='이 시간 이후에 끝나는 예약 (예: HH:MM)'),
+            OpenApiParameter(name='end_time', type=str, location=OpenApiParameter.QUERY,
+                             description='이 시간 이전에 시작하는 예약 (예: HH:MM). start_time과 함께 지정하면 시간 범위가 겹치는 예약입니다.'),
+            OpenApiParameter(name='customer', type=int, location=OpenApiParameter.QUERY,
+                             description='고객 ID (어드민만 사용할 수 있습니다.)'),
+            OpenApiParameter(name='title', type=str, location=OpenApiParameter.QUERY,
+                             description='제목이 이 값으로 시작하는 예약 (대소문자 구분)'),
+            OpenApiParameter(name='q', type=str, location=OpenApiParameter.QUERY,
+                             description=f'제목에 이 값이 들어 있는 예약 (대소문자 구분 없음, {TITLE_SEARCH_MIN_LENGTH}글자 이상)'),
+            OpenApiParameter(name='fields', type=str, location=OpenApiParameter.QUERY,
+                             description=f'응답할 필드를 쉼표로 구분하여 지정합니다. (예: id,date,start_time,end_time,status) '
+                                         f'사용할 수 있는 필드: {", ".join(SPARSE_FIELD_COLUMNS)}'),
+        ]),
     retrieve=extend_schema(
         summary="단일 예약 조회",
         description="예약 ID로 예약 정보를 조회합니다. </br> \
-            어드민은 모든 예약을 볼 수 있고, 고객은 자신의 예약만 볼 수 있습니다."),
+            어드민은 모든 예약을 볼 수 있고, 고객은 자신의 예약만 볼 수 있습니다. </br> \
+            응답의 ETag를 수정/삭제 요청의 If-Match로 전달하면, 그 사이에 다른 요청이 변경한 예약을 덮어쓰지 않습니다. </br> \
+            ETag를 If-None-Match로 보내면, 예약이 바뀌지 않은 경우 본문 없이 304를 반환합니다.",
+        parameters=[IF_NONE_MATCH_PARAMETER]),
     create=extend_schema(
         summary="예약 생성",
         description=f"새로운 예약을 생성합니다. </br> \
             예약은 오늘을 기준으로 3일 후부터 15일 후까지 가능합니다. </br> \
             예약은 1시간 단위이며, 그렙의 대응 가능 시간인 9시부터 18시까지 예약이 가능합니다. </br> \
             동 시간에 {RESERVATION_NUM_OF_PARTICIPANTS_LIMIT}명이 수용 가능하므로, \
-                예약 가능한 인원 수를 초과하면 예약할 수 없습니다."),
+                예약 가능한 인원 수를 초과하면 예약할 수 없습니다. </br> \
+            같은 시간으로 잡아둔 hold를 전달하면 hold를 사용하여 예약합니다.",
+        parameters=[IDEMPOTENCY_KEY_PARAMETER]),
     update=extend_schema(
         summary="예약 수정",
         description="예약 정보를 수정합니다. </br> \
             어드민은 모든 예약을 수정할 수 있고, 고객은 자신의 예약만 수정할 수 있습니다. </br> \
-            고객은 확정된 예약을 수정할 수 없습니다."),
+            고객은 확정된 예약을 수정할 수 없습니다. </br> \
+            If-Match가 현재 예약의 ETag와 다르거나 수정 중에 다른 요청이 먼저 변경하면 412를 반환합니다.",
+        parameters=[IF_MATCH_PARAMETER]),
     partial_update=extend_schema(
         summary="예약 일부 수정",
         description="예약 정보를 일부 수정합니다. </br> \
             어드민은 모든 예약을 수정할 수 있고, 고객은 자신의 예약만 수정할 수 있습니다. </br> \
-            고객은 확정된 예약을 수정할 수 없습니다."),
+            고객은 확정된 예약을 수정할 수 없습니다. </br> \
+            If-Match가 현재 예약의 ETag와 다르거나 수정 중에 다른 요청이 먼저 변경하면 412를 반환합니다.",
+        parameters=[IF_MATCH_PARAMETER]),
     destroy=extend_schema(
         summary="예약 삭제",
         description="예약 정보를 삭제합니다. </br> \
             어드민은 모든 예약을 삭제할 수 있고, 고객은 자신의 예약만 삭제할 수 있습니다. </br> \
-            고객은 확정된 예약을 삭제할 수 없습니다."),
+            고객은 확정된 예약을 삭제할 수 없습니다. </br> \
+            If-Match가 현재 예약의 ETag와 다르거나 삭제 중에 다른 요청이 먼저 변경하면 412를 반환합니다.",
+        parameters=[IF_MATCH_PARAMETER]),
 )
-class ReservationView(viewsets.ModelViewSet):
+class ReservationView(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     예약 CRUD view
     """
-    queryset = Reservation.objects.all().order_by('-date', 'start_time')
+    queryset = Reservation.objects.select_related('customer').order_by('-date', 'start_time')
     serializer_class = ReservationSerializer
     permission_classes = [IsOwnerOrAdmin]
+    replica_read_actions = ('list', 'retrieve')
+    # 목록의 `?fields=`로 고른 필드. 고르지 않았으면 None이다.
+    sparse_fields = None
 
     def get_queryset(self):
         if self.request.user.is_admin:
             return self.queryset
         return self.queryset.filter(customer=self.request.user)
 
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action != 'list':
+            return queryset
+
+        serializer = ReservationListFilterSerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        filters = serializer.validated_data
+
+        # 필터마다 사용하는 인덱스는 README의 "예약 목록 필터"를 참고한다.
+        if 'customer' in filters:
+            if not self.request.user.is_admin:
+                raise PermissionDenied('customer는 어드민만 사용할 수 있습니다.')
+            queryset = queryset.filter(customer_id=filters['customer'])
+        if 'date_from' in filters:
+            queryset = queryset.filter(date__gte=filters['date_from'])
+        if 'date_to' in filters:
+            queryset = queryset.filter(date__lte=filters['date_to'])
+        if filters.get('status'):
+            queryset = queryset.filter(status__in=filters['status'])
+        if 'start_time' in filters:
+            queryset = queryset.filter(end_time__gt=filters['start_time'])
+        if 'end_time' in filters:
+            queryset = queryset.filter(start_time__lt=filters['end_time'])
+        if 'title' in filters:
+            queryset = queryset.filter(title__startswith=filters['title'])
+        if 'q' in filters:
+            queryset = queryset.filter(title__icontains=filters['q'])
+
+        if 'fields' in filters:
+            self.sparse_fields = filters['fields']
+            queryset = queryset.only(*{
+                column for name in self.sparse_fields for column in SPARSE_FIELD_COLUMNS[name]})
+            if 'customer' not in self.sparse_fields:
+                queryset = queryset.select_related(None)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.sparse_fields is not None:
+            kwargs.setdefault('fields', self.sparse_fields)
+        return super().get_serializer(*args, **kwargs)
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
     def perform_create(self, serializer):
-        serializer.save(customer=self.request.user)
+        with transaction.atomic():
+            # 사용한 hold는 예약에 연결되어 계속 수용 인원을 잡아두므로, 예약 가능 시간은 바뀌지 않는다.
+            reservation = serializer.save(customer=self.request.user)
+            record_event(OutboxEventType.CREATED, reservation)
+
+    def perform_update(self, serializer):
+        # 시간이나 인원이 바뀐 예약은 만들 때 사용한 hold와 더 이상 같지 않으므로 hold를 돌려준다.
+        occupancy_changed = serializer.occupancy_changed(serializer.validated_data)
+        with transaction.atomic():
+            # 예약을 읽은 뒤 다른 요청이 변경했다면 덮어쓰지 않는다.
+            reservation = serializer.save(expected_version=serializer.instance.version)
+            record_event(OutboxEventType.UPDATED, reservation)
+            if occupancy_changed:
+                release_reservation_holds(reservation.id)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            record_event(OutboxEventType.DELETED, instance)
+            release_reservation_holds(instance.id)
+            instance.delete(expected_version=instance.version)
+
+    def list(self, request, *args, **kwargs):
+        # 목록을 읽기 전에 ETag를 정해야, 읽는 동안 바뀐 목록에 이전 ETag가 붙지 않는다.
+        etag = reservation_list_etag(request.user)
+        if if_none_match_hit(request, etag):
+            return not_modified(etag, private=True, no_cache=True)
+
+        response = super().list(request, *args, **kwargs)
+        # replica는 카운터보다 늦을 수 있으므로 replica에서 읽은 목록에는 ETag를 붙이지 않는다.
+        return cache_headers(response, None if replica_reads.get() else etag, private=True, no_cache=True)
+
+    def retrieve(self, request, *args, **kwargs):
+        if 'If-None-Match' in request.headers:
+            # 예약 전체를 읽고 직렬화하기 전에 version만 읽어 비교한다.
+            version = (
+                self.get_queryset()
+                .filter(pk=self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+                .values_list('version', flat=True)
+                .first()
+            )
+            if version is not None and if_none_match_hit(request, make_etag(version)):
+                return not_modified(make_etag(version), private=True, no_cache=True)
+
+        reservation = self.get_object()
+        serializer = self.get_serializer(reservation)
+        return cache_headers(Response(serializer.data), make_etag(reservation.version), private=True, no_cache=True)
 
     @staticmethod
     def validate_modification(reservation: Reservation, customer: Customer):
@@ -77,6 +247,7 @@ class ReservationView(viewsets.ModelViewSet):
             raise ValidationError('확정된 예약은 수정/삭제할 수 없습니다.')
 
     def update(self, request, *args, **kwargs):
+        partial = kwargs.pop('partial', False)
         reservation = self.get_object()
         try:
             self.validate_modification(
@@ -84,29 +255,27 @@ class ReservationView(viewsets.ModelViewSet):
             )
         except ValidationError as err:
             return Response({'detail': err.get_full_details()}, status=403)
-
-        if reservation.status == ReservationStatus.CONFIRMED:
-            logger.debug(
-                f"clearing cache for date {reservation.date}, {request.data.get('date')}")
-            cache.delete(f"available_slots:{reservation.date}")
-            cache.delete(f"available_slots:{request.data.get('date')}")
-        return super().update(request, *args, **kwargs)
-
-    def partial_update(self, request, *args, **kwargs):
-        reservation = self.get_object()
+        if if_match_failed(request, reservation.version):
+            return precondition_failed()
+
+        serializer = self.get_serializer(reservation, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+
+        # 제목만 바뀌는 등 수용 인원에 영향이 없으면 예약 가능 시간 캐시를 그대로 둔다.
+        dates = []
+        if (
+            reservation.status == ReservationStatus.CONFIRMED and
+            serializer.occupancy_changed(serializer.validated_data)
+        ):
+            dates = sorted({reservation.date, serializer.validated_data.get('date', reservation.date)})
         try:
-            self.validate_modification(
-                reservation=reservation, customer=request.user
-            )
-        except ValidationError as err:
-            return Response({'detail': err.get_full_details()}, status=403)
+            self.perform_update(serializer)
+        except ReservationVersionConflict:
+            return precondition_failed()
 
-        if reservation.status == ReservationStatus.CONFIRMED:
-            logger.debug(
-                f"clearing cache for date {reservation.date}, {request.data.get('date')}")
-            cache.delete(f"available_slots:{reservation.date}")
-            cache.delete(f"available_slots:{request.data.get('date')}")
-        return super().update(request, *args, **kwargs)
+        # 수정이 커밋된 뒤 캐시를 비운다. 실패한 수정은 캐시를 비우지 않는다.
+        clear_available_slots_cache(*dates)
+        return Response(serializer.data, headers={'ETag': make_etag(reservation.version)})
 
     def destroy(self, request, *args, **kwargs):
         reservation = self.get_object()
@@ -116,21 +285,30 @@ class ReservationView(viewsets.ModelViewSet):
             )
         except ValidationError as err:
             return Response({'detail': err.get_full_details()}, status=403)
+        if if_match_failed(request, reservation.version):
+            return precondition_failed()
+
+        try:
+            self.perform_destroy(reservation)
+        except ReservationVersionConflict:
+            return precondition_failed()
 
         if reservation.status == ReservationStatus.CONFIRMED:
-            logger.debug(f"clearing cache for date {reservation.date}")
-            cache.delete(f"available_slots:{reservation.date}")
-        return super().destroy(request, *args, **kwargs)
+            clear_available_slots_cache(reservation.date)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 @extend_schema_view(
     post=extend_schema(
         summary="예약 확정",
-        description="예약을 확정합니다. 어드민만 사용할 수 있습니다.",
+        description="예약을 확정합니다. 어드민만 사용할 수 있습니다. </br> \
+            이미 확정된 예약과 함께 수용 인원을 초과하면 확정할 수 없습니다. </br> \
+            If-Match가 현재 예약의 ETag와 다르거나 확정 중에 다른 요청이 먼저 변경하면 412를 반환합니다.",
         request=None,
+        parameters=[IDEMPOTENCY_KEY_PARAMETER, IF_MATCH_PARAMETER],
     )
 )
-class ReservationConfirmView(generics.GenericAPIView):
+class ReservationConfirmView(ReplicaReadMixin, generics.GenericAPIView):
     """
     예약 확정 view
     """
@@ -138,35 +316,425 @@ class ReservationConfirmView(generics.GenericAPIView):
     permission_classes = [permissions.IsAdminUser]
     serializer_class = ReservationConfirmSerializer
 
+    @idempotent
     def post(self, request: Request, pk: UUID) -> Response:
         reservation = self.get_object()
-        reservation.status = ReservationStatus.CONFIRMED
-        reservation.save(update_fields=['status'])
+        if if_match_failed(request, reservation.version):
+            return precondition_failed()
+
+        result = confirm_reservations([reservation])
+        if result.conflicted:
+            return precondition_failed()
+        if result.rejected:
+            return Response({'detail': result.rejected[0][1]}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(self.get_serializer(reservation).data, status=status.HTTP_200_OK,
+                        headers={'ETag': make_etag(reservation.version)})
+
+
+@extend_schema_view(
+    post=extend_schema(
+        summary="예약 가능 여부 확인",
+        description=f"예약을 만들지 않고 여러 시간 범위의 예약 가능 여부를 한 번에 확인합니다. </br> \
+            예약 생성과 같은 규칙(예약 가능 기간, 9시부터 18시까지, 수용 인원)으로 확인하며, \
+                시간 범위마다 더 예약할 수 있는 인원 수(remaining)를 반환합니다. </br> \
+            한 번에 최대 {CHECK_MAX_WINDOWS}개의 시간 범위를 확인할 수 있습니다.",
+        request=ReservationCheckSerializer,
+        responses={200: ReservationCheckResultsSerializer},
+    )
+)
+class ReservationCheckView(generics.GenericAPIView):
+    """
+    예약 가능 여부 확인 view
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = ReservationCheckSerializer
+    throttle_scope = 'slots'
+
+    def post(self, request: Request) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = check_windows(serializer.validated_data['windows'])
+        return Response(ReservationCheckResultsSerializer({'results': results}).data, status=200)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="예약 가능한 시간 범위 추천",
+        description="예약 가능 기간(3일 후부터 15일 후까지) 전체에서 참가자 수만큼 예약할 수 있는 시간 범위를 추천합니다. </br> \
+            date(와 start_time)를 지정하면 그 일시에 가까운 순서로, 없으면 이른 순서로 최대 limit개를 반환합니다. </br> \
+            예약이 수용 인원 초과로 실패했을 때 다른 시간을 찾는 데 사용합니다.",
+        parameters=[
+            OpenApiParameter(name='num_of_participants', type=int, location=OpenApiParameter.QUERY, required=True,
+                             description='참가자 수'),
+            OpenApiParameter(name='hours', type=int, location=OpenApiParameter.QUERY,
+                             description='예약 시간 (시간 단위, 기본값 1)'),
+            OpenApiParameter(name='limit', type=int, location=OpenApiParameter.QUERY,
+                             description=f'추천할 최대 시간 범위 수 (기본값 {SUGGESTIONS_DEFAULT_LIMIT}, '
+                                         f'최대 {SUGGESTIONS_MAX_LIMIT})'),
+            OpenApiParameter(name='date', type=str, location=OpenApiParameter.QUERY,
+                             description='원하는 날짜 (예: YYYY-MM-DD)'),
+            OpenApiParameter(name='start_time', type=str, location=OpenApiParameter.QUERY,
+                             description='원하는 시작 시간 (예: HH:MM). date와 함께 지정합니다.'),
+        ],
+        responses={200: ReservationSuggestionSerializer(many=True)},
+    )
+)
+class ReservationSuggestionsView(generics.GenericAPIView):
+    """
+    예약 가능한 시간 범위 추천 view
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = ReservationSuggestionSerializer
+    pagination_class = None
+    throttle_scope = 'slots'
+
+    def get(self, request: Request) -> Response:
+        query = ReservationSuggestionQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        preferred = None
+        if 'date' in params:
+            preferred = datetime.datetime.combine(
+                params['date'], params.get('start_time', datetime.time(RESERVATION_OPENING_HOUR)))
+        suggestions = suggest_windows(params['num_of_participants'], params['hours'], params['limit'], preferred)
+        return Response(self.get_serializer(suggestions, many=True).data, status=200)
+
+
+@extend_schema_view(
+    post=extend_schema(
+        summary="예약 일괄 조회",
+        description=f"여러 예약을 ID로 한 번에 조회합니다. (최대 {BATCH_GET_MAX_IDS}개) </br> \
+            어드민은 모든 예약을 볼 수 있고, 고객은 자신의 예약만 볼 수 있습니다. </br> \
+            조회할 수 없는 ID는 존재하지 않으면 missing에, 다른 고객의 예약이면 forbidden에 담습니다. \
+                중복된 ID는 한 번만 반환합니다.",
+        request=ReservationBatchGetSerializer,
+        responses={200: ReservationBatchGetResultSerializer},
+    )
+)
+class ReservationBatchGetView(generics.GenericAPIView):
+    """
+    예약 일괄 조회 view
+    """
+    queryset = Reservation.objects.select_related('customer')
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = ReservationBatchGetSerializer
+
+    def post(self, request: Request) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data['ids']))
+
+        # 고객의 예약만 읽도록 SQL에서 거르므로, 예약마다 권한을 확인하지 않는다.
+        reservations = self.queryset.filter(id__in=ids)
+        if not request.user.is_admin:
+            reservations = reservations.filter(customer=request.user)
+        found = {reservation.id: reservation for reservation in reservations}
+
+        missing, forbidden = [], []
+        unfound = [id for id in ids if id not in found]
+        if unfound:
+            # 모두 조회된 경우에는 다시 읽지 않는다.
+            existing = set(Reservation.objects.filter(id__in=unfound).values_list('id', flat=True))
+            for id in unfound:
+                (forbidden if id in existing else missing).append(id)
+
+        return Response(ReservationBatchGetResultSerializer({
+            'reservations': [found[id] for id in ids if id in found],
+            'missing': missing,
+            'forbidden': forbidden,
+        }).data, status=status.HTTP_200_OK)
+
+
+@extend_schema_view(
+    post=extend_schema(
+        summary="반복 예약 생성",
+        description="매일 또는 매주 반복되는 예약을 한 번에 생성합니다. </br> \
+            반복되는 날짜는 모두 예약 가능 기간(3일 후부터 15일 후까지) 안에 있어야 합니다. \
+                count와 until이 없으면 예약 가능 기간 끝까지 반복합니다. </br> \
+            모든 날짜의 수용 인원을 한 번에 확인하며, 하나라도 수용 인원을 넘으면 하나도 만들지 않고 \
+                수용 인원을 넘는 날짜(dates)와 함께 400을 반환합니다. </br> \
+            만든 예약은 같은 series_id를 가지며, 함께 확정하거나 취소할 수 있습니다.",
+        request=ReservationSeriesSerializer,
+        responses={201: ReservationSerializer(many=True)},
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
+    )
+)
+class ReservationSeriesView(generics.GenericAPIView):
+    """
+    반복 예약 생성 view
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = ReservationSeriesSerializer
+
+    @idempotent
+    def post(self, request: Request) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        try:
+            reservations = create_series(
+                request.user, params['title'], params['dates'], params['start_time'], params['end_time'],
+                params['num_of_participants'])
+        except CapacityExceeded as err:
+            return Response({'detail': CAPACITY_EXCEEDED_MESSAGE, 'dates': list(err.args)},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return Response(ReservationSerializer(reservations, many=True).data, status=status.HTTP_201_CREATED)
+
+
+@extend_schema_view(
+    post=extend_schema(
+        summary="반복 예약 확정",
+        description="반복 예약을 모두 확정합니다. 어드민만 사용할 수 있습니다. </br> \
+            하나라도 수용 인원을 넘거나 확정하는 중에 다른 요청이 변경하면 하나도 확정하지 않고, \
+                각각 400과 412를 반환합니다.",
+        request=None,
+        responses={200: ReservationSerializer(many=True)},
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
+    )
+)
+class ReservationSeriesConfirmView(generics.GenericAPIView):
+    """
+    반복 예약 확정 view
+    """
+    permission_classes = [permissions.IsAdminUser]
+    serializer_class = ReservationSerializer
+
+    @idempotent
+    def post(self, request: Request, series_id: UUID) -> Response:
+        result = confirm_series(series_id)
+        if not (result.confirmed or result.rejected or result.conflicted):
+            return Response({'detail': '반복 예약을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+        if result.conflicted:
+            return precondition_failed()
+        if result.rejected:
+            return Response({
+                'detail': CAPACITY_EXCEEDED_MESSAGE,
+                'dates': sorted({reservation.date for reservation, _ in result.rejected}),
+            }, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(result.confirmed, many=True).data, status=status.HTTP_200_OK)
+
 
-        logger.debug(f"clearing cache for date {reservation.date}")
-        cache.delete(f"available_slots:{reservation.date}")
-        return Response(self.get_serializer(reservation).data, status=status.HTTP_200_OK)
+@extend_schema_view(
+    post=extend_schema(
+        summary="반복 예약 취소",
+        description="반복 예약 중 취소되지 않은 예약을 모두 취소합니다. </br> \
+            어드민은 모든 반복 예약을 취소할 수 있고, 고객은 자신의 반복 예약만 취소할 수 있습니다. </br> \
+            고객은 확정된 예약이 있는 반복 예약을 취소할 수 없습니다.",
+        request=None,
+        responses={200: ReservationSerializer(many=True)},
+    )
+)
+class ReservationSeriesCancelView(generics.GenericAPIView):
+    """
+    반복 예약 취소 view
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = ReservationSerializer
+
+    def post(self, request: Request, series_id: UUID) -> Response:
+        reservations = Reservation.objects.filter(series_id=series_id)
+        if not request.user.is_admin:
+            reservations = reservations.filter(customer=request.user)
+        if not reservations.exists():
+            return Response({'detail': '반복 예약을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            cancelled = cancel_series(series_id, allow_confirmed=request.user.is_admin)
+        except SeriesAlreadyConfirmed:
+            return Response({'detail': '확정된 예약은 수정/삭제할 수 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
+        return Response(self.get_serializer(cancelled, many=True).data, status=status.HTTP_200_OK)
+
+
+@extend_schema_view(
+    create=extend_schema(
+        summary="수용 인원 hold",
+        description="예약을 만드는 동안 시간 범위의 수용 인원을 잡아둡니다. </br> \
+            hold는 RESERVATION_HOLD_TTL_SECONDS(기본값 10분) 동안 확정된 예약과 같이 수용 인원에 포함되며, \
+                그 동안 다른 고객은 잡아둔 인원을 예약하거나 확정할 수 없습니다. </br> \
+            예약 생성 요청에 hold ID를 전달하면 hold를 사용하여 예약합니다. \
+                확정된 예약과 다른 hold와 함께 수용 인원을 넘으면 400을 반환합니다.",
+        parameters=[IDEMPOTENCY_KEY_PARAMETER]),
+    destroy=extend_schema(
+        summary="수용 인원 hold 취소",
+        description="잡아둔 hold를 취소하여 수용 인원을 돌려줍니다. 자신의 hold만 취소할 수 있습니다."),
+)
+class ReservationHoldViewSet(mixins.CreateModelMixin, mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    """
+    수용 인원 hold view
+    """
+    queryset = ReservationHold.objects.all()
+    serializer_class = ReservationHoldSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return self.queryset.filter(customer=self.request.user)
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        try:
+            serializer.instance = take_hold(customer=self.request.user, **serializer.validated_data)
+        except CapacityExceeded:
+            raise ValidationError(CAPACITY_EXCEEDED_MESSAGE)
+
+    def perform_destroy(self, instance):
+        release_hold(instance)
+
+
+@extend_schema_view(
+    post=extend_schema(
+        summary="예약 확정 시뮬레이션",
+        description=f"예약들을 확정한다고 가정했을 때 날짜별/시간별 참가자 수와 수용 인원 초과 여부를 반환합니다. \
+            어드민만 사용할 수 있으며, 예약은 바꾸지 않습니다. </br> \
+            확정할 예약은 ids(최대 {SIMULATION_MAX_IDS}개) 또는 date_from/date_to로 지정하며, 둘 다 지정하면 모두 만족하는 예약입니다. \
+                그 중 확정 대기중인 예약만 더합니다. </br> \
+            occupancy는 이미 확정된 참가자 수(confirmed)와 확정할 참가자 수(proposed)의 합입니다.",
+        request=ReservationSimulationSerializer,
+        responses={200: ReservationSimulationResultSerializer},
+    )
+)
+class ReservationSimulationView(generics.GenericAPIView):
+    """
+    예약 확정 시뮬레이션 view
+    """
+    permission_classes = [permissions.IsAdminUser]
+    serializer_class = ReservationSimulationSerializer
+
+    def post(self, request: Request) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        reservations = Reservation.objects.all()
+        if 'ids' in params:
+            reservations = reservations.filter(id__in=params['ids'])
+        if 'date_from' in params:
+            reservations = reservations.filter(date__gte=params['date_from'], date__lte=params['date_to'])
+
+        dates = simulate_confirmations(reservations)
+        return Response(ReservationSimulationResultSerializer({
+            'overflow': any(date['overflow'] for date in dates),
+            'dates': dates,
+        }).data, status=200)
+
+
+@extend_schema_view(
+    post=extend_schema(
+        summary="예약 확정 계획",
+        description="기간 안의 확정 대기중 예약 중 수용 인원을 넘지 않고 확정할 예약을 계산합니다. \
+            어드민만 사용할 수 있습니다. </br> \
+            objective가 participants면 확정되는 참가자 수를, reservations면 확정되는 예약 수를 늘리도록 고릅니다. </br> \
+            apply가 true면 계획한 예약을 예약 확정과 같은 경로로 한 트랜잭션에서 확정합니다. \
+                계획한 뒤 바뀐 예약은 확정되지 않을 수 있습니다.",
+        request=ConfirmationPlanRequestSerializer,
+        responses={200: ConfirmationPlanSerializer},
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
+    )
+)
+class ReservationPlanView(generics.GenericAPIView):
+    """
+    예약 확정 계획 view
+    """
+    permission_classes = [permissions.IsAdminUser]
+    serializer_class = ConfirmationPlanRequestSerializer
+
+    @idempotent
+    def post(self, request: Request) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        plan = plan_confirmations(params['date_from'], params['date_to'], params['objective'])
+        applied = None
+        if params['apply']:
+            result = apply_plan(plan)
+            applied = {
+                'confirmed': len(result.confirmed),
+                'rejected': len(result.rejected),
+                'conflicted': len(result.conflicted),
+            }
+        return Response(ConfirmationPlanSerializer({**vars(plan), 'applied': applied}).data, status=200)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="예약 변경 피드",
+        description="cursor 이후에 생성/수정/삭제된 예약을 변경 순서대로 조회합니다. </br> \
+            응답의 next_cursor를 다음 요청의 since로 전달하면 그 이후의 변경만 받을 수 있습니다. </br> \
+            어드민은 모든 예약의 변경을, 고객은 자신의 예약의 변경만 받습니다. </br> \
+            삭제 기록의 보관 기간보다 오래된 cursor는 410을 반환하며, 이때는 목록을 처음부터 다시 받아야 합니다.",
+        parameters=[
+            OpenApiParameter(name='since', type=str, location=OpenApiParameter.QUERY,
+                             description='이전 응답의 next_cursor. 없으면 처음부터 조회합니다.'),
+            OpenApiParameter(name='limit', type=int, location=OpenApiParameter.QUERY,
+                             description=f'한 번에 받을 최대 변경 수 (기본값 {CHANGES_DEFAULT_LIMIT}, '
+                                         f'최대 {CHANGES_MAX_LIMIT})'),
+        ],
+        responses={200: ReservationChangesSerializer},
+    )
+)
+class ReservationChangesView(generics.GenericAPIView):
+    """
+    예약 변경 피드 view
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = ReservationChangesSerializer
+    pagination_class = None
+
+    def get(self, request: Request) -> Response:
+        since = request.query_params.get('since')
+        try:
+            cursor = Cursor.decode(since) if since else None
+        except InvalidCursor:
+            return Response({'detail': '올바르지 않은 cursor입니다.'}, status=400)
+
+        try:
+            limit = min(int(request.query_params.get('limit', CHANGES_DEFAULT_LIMIT)), CHANGES_MAX_LIMIT)
+        except ValueError:
+            return Response({'detail': 'limit은 숫자여야 합니다.'}, status=400)
+        if limit < 1:
+            return Response({'detail': 'limit은 1 이상이어야 합니다.'}, status=400)
+
+        try:
+            changes, has_more = fetch_changes(request.user, cursor, limit)
+        except ExpiredCursor:
+            return Response({'detail': '만료된 cursor입니다. 목록을 처음부터 다시 조회해야 합니다.'}, status=410)
+
+        next_cursor = changes[-1].cursor if changes else cursor
+        return Response(self.get_serializer({
+            'changes': changes,
+            'next_cursor': next_cursor.encode() if next_cursor else None,
+            'has_more': has_more,
+        }).data, status=200)
 
 
 @extend_schema_view(
     get=extend_schema(
         summary="예약 가능 시간 조회",
         description="특정 날짜의 예약 가능한 시간 및 인원을 조회합니다. </br> \
-            날짜는 오늘을 기준으로 3일 후부터 15일 후까지 가능합니다.",
+            날짜는 오늘을 기준으로 3일 후부터 15일 후까지 가능합니다. </br> \
+            응답의 ETag를 If-None-Match로 보내면, 그 뒤로 예약 가능 시간이 바뀌지 않은 경우 본문 없이 304를 반환합니다.",
         parameters=[
             OpenApiParameter(name='date', type=str, location=OpenApiParameter.QUERY,
-                             description='날짜 (예: ?date=YYYY-MM-DD)')
+                             description='날짜 (예: ?date=YYYY-MM-DD)'),
+            IF_NONE_MATCH_PARAMETER,
         ],
         responses={200: ReservationSlotSerializer(many=True)}
     )
 )
-class ReservationAvailableSlotsView(generics.GenericAPIView):
+class ReservationAvailableSlotsView(ReplicaReadMixin, generics.GenericAPIView):
     """
     예약 가능 시간 조회 view
     """
     queryset = Reservation.objects.all()
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = None
+    replica_read_actions = ('get',)
+    throttle_scope = 'slots'
 
     @staticmethod
     def validate_date_param(date_str: str) -> datetime.date:
@@ -190,11 +758,11 @@ class ReservationAvailableSlotsView(generics.GenericAPIView):
         """예약 가능 시간 조회
 
         캐시된 예약 가능 시간을 반환하거나, 새로 계산하여 반환합니다.
-        캐시는 확정된 예약이 생성/수정/삭제될 때마다 갱신됩니다.
+        캐시는 확정된 예약이 생성/수정/삭제될 때마다 갱신되며, hold를 반영한 값은 hold가 만료될 때까지만 캐시합니다.
 
         See Also:
-            - reservations.utils.get_available_slots
-            - reservations.utils.is_slot_in_reservation
+            - reservations.utils.get_cached_available_slots
+            - reservations.utils.compute_available_slots
             - reservations.models.Reservation.clear_reservation_cache_on_save
         """
         try:
@@ -202,25 +770,69 @@ class ReservationAvailableSlotsView(generics.GenericAPIView):
         except ValidationError as err:
             return Response({'detail': err.get_full_details()}, status=400)
 
-        cache_key = f"available_slots:{date}"
-        cached_slots = cache.get(cache_key)
+        cache_control = {'public': True, 'max_age': 0, 's_maxage': settings.AVAILABLE_SLOTS_SHARED_MAX_AGE}
+        # 반영한 hold가 만료되었으면 ETag를 바꾼 뒤 비교한다.
+        notify_expired_holds(date)
+        etag = available_slots_etag(date)
+        if if_none_match_hit(request, etag):
+            return not_modified(etag, **cache_control)
+
+        response = Response(get_cached_available_slots(date), status=200)
+        return cache_headers(response, None if replica_reads.get() else etag, **cache_control)
+
 
-        if cached_slots:
-            logger.debug(f"retuning cached slots for date {date}")
-            return Response(cached_slots, status=200)
+class ReservationAvailableSlotsStreamView(View):
+    """
+    예약 가능 시간 변경 구독 view (Server-Sent Events)
+
+    연결 직후 현재 예약 가능 시간을 보내고, 이후 해당 날짜의 확정된 예약이 확정/수정/삭제되거나 hold가 잡히고
+    돌려지거나 만료될 때마다 새 예약 가능 시간을 `slots` 이벤트로 보냅니다. 변경이 없으면 SLOT_STREAM_HEARTBEAT_SECONDS마다
+    주석 한 줄을 보내 연결을 유지합니다. 연결을 오래 유지하므로 ASGI 서버에서 실행해야 합니다.
+    """
+
+    @staticmethod
+    def authenticate(request):
+        result = JWTAuthentication().authenticate(request)
+        return result[0] if result else None
 
-        slots = get_available_slots()
-        reservations = Reservation.objects.filter(
-            date=date, status=ReservationStatus.CONFIRMED)
+    async def get(self, request):
+        try:
+            user = await sync_to_async(self.authenticate)(request)
+        except AuthenticationFailed as err:
+            return JsonResponse({'detail': err.detail}, status=401)
+        if user is None:
+            return JsonResponse({'detail': '인증 자격 증명이 제공되지 않았습니다.'}, status=401)
 
-        for reservation in reservations:
-            for slot in slots:
-                if is_slot_in_reservation(slot, reservation):
-                    slot['remaining'] = max(
-                        0, slot['remaining'] - reservation.num_of_participants)
+        try:
+            date = ReservationAvailableSlotsView.validate_date_param(request.GET.get('date'))
+        except ValidationError as err:
+            return JsonResponse({'detail': err.get_full_details()}, status=400)
 
-        serialized_slots = ReservationSlotSerializer(slots, many=True).data
+        return StreamingHttpResponse(
+            self.stream(date),
+            content_type='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+        )
 
-        cache.set(cache_key, serialized_slots, timeout=60*60)
+    @staticmethod
+    def format_event(slots: list[dict]) -> str:
+        return f"event: slots\ndata: {json.dumps(slots, cls=JSONEncoder)}\n\n"
 
-        return Response(serialized_slots, status=200)
+    async def stream(self, date: datetime.date):
+        broadcaster = get_broadcaster()
+        # 처음 슬롯을 읽는 동안 발생한 변경을 놓치지 않도록 먼저 구독한다.
+        queue = broadcaster.subscribe(date)
+        try:
+            yield self.format_event(await sync_to_async(get_cached_available_slots)(date))
+            while True:
+                try:
+                    slots = await asyncio.wait_for(
+                        queue.get(), timeout=settings.SLOT_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # 변경이 없는 동안 hold가 만료되었으면 알리고, 새 예약 가능 시간은 다음 이벤트로 보낸다.
+                    await sync_to_async(notify_expired_holds)(date)
+                    yield ": heartbeat\n\n"
+                    continue
+                yield self.format_event(slots)
+        finally:
+            broadcaster.unsubscribe(date, queue)
@@ -0,0 +1,129 @@
+import datetime
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import DateTimeField, Min, Sum, Value
+
+from examscheduler import metrics
+from reservations.etags import available_slots_versions, expire_available_slots_at
+from reservations.models import Reservation, ReservationHold, ReservationStatus
+from reservations.utils import (
+    AVAILABLE_SLOTS_CACHE_TIMEOUT, available_slots_cache_timeout, bookable_dates, build_available_slots,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def warm_available_slots(today: datetime.date | None = None) -> int:
+    """예약 가능한 모든 날짜의 예약 가능 시간을 계산하여 캐시에 저장합니다.
+
+    자정에 예약 가능 기간이 하루 밀려도 새로 열린 날짜의 캐시가 비어 있지 않도록,
+    내일을 기준으로 새로 열릴 날짜까지 함께 저장합니다.
+    확정된 예약과 만료되지 않은 hold는 날짜/시간별로 묶은 한 번의 쿼리로 읽고, 캐시에는 한 번에 저장합니다.
+    읽는 동안 예약 가능 시간이 바뀐 날짜(ETag 카운터가 바뀐 날짜)는 이전 값을 덮어쓰지 않도록 저장하지 않습니다.
+    hold가 있는 날짜는 hold가 처음 만료될 때까지만 캐시합니다.
+
+    Args:
+        today (datetime.date, optional): 기준 날짜. 기본값은 오늘입니다.
+
+    Returns:
+        int: 캐시에 저장한 날짜 수
+    """
+    today = today or datetime.datetime.now().date()
+    dates = sorted(set(bookable_dates(today)) | set(bookable_dates(today + datetime.timedelta(days=1))))
+
+    with metrics.timed('available_slots_warm', dates=len(dates)) as values:
+        versions = available_slots_versions(dates)
+        reservations_by_date = defaultdict(list)
+        valid_until = {}
+        rows = (
+            Reservation.objects
+            .filter(date__in=dates, status=ReservationStatus.CONFIRMED)
+            .values('date', 'start_time', 'end_time')
+            .annotate(
+                num_of_participants=Sum('num_of_participants'),
+                valid_until=Value(None, output_field=DateTimeField()))
+            .order_by()
+            .union(
+                ReservationHold.objects.active()
+                .filter(date__in=dates)
+                .values('date', 'start_time', 'end_time')
+                .annotate(num_of_participants=Sum('num_of_participants'), valid_until=Min('expires_at'))
+                .order_by(),
+                all=True)
+        )
+        for row in rows:
+            date, expires_at = row.pop('date'), row.pop('valid_until')
+            if expires_at is not None:
+                valid_until[date] = min(expires_at, valid_until.get(date, expires_at))
+            reservations_by_date[date].append(Reservation(**row))
+
+        slots = {date: build_available_slots(reservations_by_date[date]) for date in dates}
+
+        # 읽은 뒤 커밋된 변경의 캐시 삭제를 덮어쓰지 않는다. 그 날짜는 다음 조회에서 다시 계산된다.
+        changed = {date for date, version in available_slots_versions(dates).items() if version != versions[date]}
+        cache.set_many({
+            f"available_slots:{date}": slots[date] for date in dates if date not in changed and date not in valid_until
+        }, timeout=AVAILABLE_SLOTS_CACHE_TIMEOUT)
+        held = {date: expires_at for date, expires_at in valid_until.items() if date not in changed}
+        for date, expires_at in held.items():
+            cache.set(f"available_slots:{date}", slots[date], timeout=available_slots_cache_timeout(expires_at))
+        expire_available_slots_at(held)
+        values['skipped'] = len(changed)
+
+    return len(dates) - len(changed)
+
+
+def seconds_until_next_warm(interval: int, now: datetime.datetime | None = None) -> float:
+    """다음 캐시 저장까지 기다릴 시간(초)을 반환합니다.
+
+    `interval`초가 지나기 전에 자정이 오면, 예약 가능 기간이 바뀐 직후에 다시 저장하도록 자정까지만 기다립니다.
+    """
+    now = now or datetime.datetime.now()
+    midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time())
+    return min(interval, (midnight - now).total_seconds() + 1)
+
+
+def run_warm_scheduler(interval: int, stop_event: threading.Event):
+    """`stop_event`가 설정될 때까지 예약 가능 시간 캐시를 주기적으로 저장합니다."""
+    while not stop_event.is_set():
+        try:
+            warm_available_slots()
+        except Exception:
+            logger.exception("failed to warm available slots")
+        finally:
+            close_old_connections()
+        stop_event.wait(seconds_until_next_warm(interval))
+
+
+def start_warm_scheduler(interval: int) -> threading.Event:
+    """예약 가능 시간 캐시를 주기적으로 저장하는 daemon thread를 시작합니다.
+
+    Returns:
+        threading.Event: 설정하면 scheduler가 종료됩니다.
+    """
+    stop_event = threading.Event()
+    threading.Thread(
+        target=run_warm_scheduler, args=(interval, stop_event),
+        name='available-slots-warmer', daemon=True,
+    ).start()
+    return stop_event
+
+
+def start_configured_warm_scheduler() -> threading.Event | None:
+    """`AVAILABLE_SLOTS_WARM_INTERVAL`을 지정했으면 웹 서버 프로세스 안에서 scheduler를 시작합니다.
+
+    앱을 불러오는 모든 프로세스(migrate, shell, test, 관리 명령, runserver의 autoreloader 등)에서
+    DB를 읽는 thread가 시작되지 않도록, WSGI/ASGI 진입점에서만 호출합니다.
+
+    Returns:
+        threading.Event | None: 설정하면 scheduler가 종료됩니다. 간격을 지정하지 않았으면 None
+    """
+    if settings.AVAILABLE_SLOTS_WARM_INTERVAL <= 0:
+        return None
+    return start_warm_scheduler(settings.AVAILABLE_SLOTS_WARM_INTERVAL)